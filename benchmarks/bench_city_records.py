@@ -0,0 +1,99 @@
+"""
+Benchmark: memoria y serialización del dataset completo según su representación
+
+Compara la lista de modelos de pydantic `City` que antes se mantenía en
+caché (y se revalidaba en cada respuesta con `response_model=List[City]`)
+con lo que se mantiene ahora: la tabla columnar con su índice de IDs y el
+JSON precalculado de cada fila (`CityService.get_row_json`). También se
+mide crear `CityRecord` para todas las filas, que es lo que hacen los
+servicios solo con las filas de cada resultado.
+
+    memoria         bytes asignados (tracemalloc) por la representación
+    JSON            tiempo de serializar todas las ciudades (esquema de City)
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_city_records [--repeat 10]
+"""
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from graphmap.domain.model.entities.city import City
+from graphmap.domain.model.entities.city_table import CityTable
+from graphmap.domain.services.city_service import CityService
+from graphmap.infrastructure.http.static_payload import dumps_json
+
+
+def _allocated(build: Callable[[], object]) -> int:
+    """Bytes que quedan asignados tras construir un objeto"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def _median_ms(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    city_service = CityService()
+    table = city_service.load_city_table()
+    cities = table.to_cities()
+    row_json = city_service.get_row_json()
+    adapter = TypeAdapter(List[City])
+    rows = range(len(table))
+
+    def legacy() -> bytes:
+        # response_model=List[City]: validación y serialización de cada modelo
+        return adapter.dump_json(adapter.validate_python(cities))
+
+    def records() -> bytes:
+        return dumps_json([record.to_dict() for record in table.records()])
+
+    def compact() -> bytes:
+        return b"[" + b",".join([row_json[row] for row in rows]) + b"]"
+
+    assert legacy() == records() == compact(), "Las representaciones producen JSON distinto"
+
+    def table_with_index() -> CityTable:
+        # Copia de la lista de strings: los arrays son memory-mapped (fuera del heap)
+        fresh = CityTable(table.ids, table.lat, table.lng, table.population, table.string_codes,
+                          [string.encode().decode() for string in table.strings])
+        fresh.row_index
+        return fresh
+
+    def build_row_json() -> List[bytes]:
+        return [dumps_json(row) for row in table.to_dicts()]
+
+    print(f"{len(table)} ciudades")
+    print(f"{'representación':<40}{'memoria (KB)':>14}{'JSON (ms)':>12}")
+    print(f"{'List[City] en caché (antes)':<40}{_allocated(table.to_cities) / 1024:>14.0f}"
+          f"{_median_ms(legacy, args.repeat):>12.2f}")
+    print(f"{'CityTable + índice de IDs':<40}{_allocated(table_with_index) / 1024:>14.0f}{'-':>12}")
+    print(f"{'JSON por fila en caché (ahora)':<40}{_allocated(build_row_json) / 1024:>14.0f}"
+          f"{_median_ms(compact, args.repeat):>12.2f}")
+    print(f"{'CityRecord para todas las filas':<40}{_allocated(table.records) / 1024:>14.0f}"
+          f"{_median_ms(records, args.repeat):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: búsqueda de ciudades por nombre, escaneo lineal contra índice
+
+Compara el escaneo anterior (lower() de cada City en cada consulta) con
+`CitySearchIndex` para búsqueda por subcadena y autocompletado. Para ver
+cómo escala, repite el dataset con sufijos en los nombres (x1, x4, x16).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_city_search [--repeat N]
+"""
+import argparse
+import statistics
+import time
+
+from graphmap.domain.model.entities.city_search_index import CitySearchIndex
+from graphmap.domain.services.city_service import CityService
+
+SEARCH_QUERIES = ["san", "york", "ville", "springfield", "los angeles", "ort"]
+AUTOCOMPLETE_QUERIES = ["s", "sa", "san", "spri", "new y", "los a"]
+SCALES = (1, 4, 16)
+
+
+def _per_query_us(fn, queries, repeat):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(query)
+        samples.append((time.perf_counter() - start) / repeat * 1e6)
+    return statistics.mean(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    table = CityService().load_city_table()
+    names, ascii_names = table.column("city"), table.column("city_ascii")
+    population = table.population.tolist()
+
+    print(f"{'ciudades':>9}{'build (ms)':>12}{'lineal (us)':>13}{'search (us)':>13}{'autocomp. (us)':>16}")
+    for scale in SCALES:
+        # Copias con sufijo: mismos prefijos, más filas por prefijo
+        scaled_names = [f"{name} {copy}" if copy else name for copy in range(scale) for name in names]
+        scaled_ascii = [f"{name} {copy}" if copy else name for copy in range(scale) for name in ascii_names]
+        scaled_population = population * scale
+
+        start = time.perf_counter()
+        index = CitySearchIndex(scaled_names, scaled_ascii, scaled_population)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def linear(query):
+            query_lower = query.lower()
+            return [i for i, (name, ascii_name) in enumerate(zip(scaled_names, scaled_ascii))
+                    if query_lower in name.lower() or query_lower in ascii_name.lower()]
+
+        linear_us = _per_query_us(linear, SEARCH_QUERIES, max(1, args.repeat // 10))
+        search_us = _per_query_us(lambda q: index.search(q, limit=20), SEARCH_QUERIES, args.repeat)
+        autocomplete_us = _per_query_us(lambda q: index.autocomplete(q, limit=10), AUTOCOMPLETE_QUERIES, args.repeat)
+
+        print(f"{len(scaled_names):>9}{build_ms:>12.0f}{linear_us:>13.0f}{search_us:>13.0f}{autocomplete_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: ráfaga de requests concurrentes contra un proceso recién iniciado
+
+Cada modo corre en un subproceso nuevo (cachés vacías). Se lanzan
+--clients hilos a la vez contra /cities/, /graph/edges, /cities/{query},
+/graph/shortest-path y /tiles (este último se ejecuta en el thread pool,
+donde varios requests pueden construir la misma caché en paralelo), y se
+informa la latencia (p50, p99, máx.) y cuántas veces se construyó cada
+caché (trabajo duplicado si es > 1).
+
+Modos:
+    off         sin precarga: el primer request carga todo
+    background  precarga en un hilo al arrancar; la ráfaga llega enseguida
+    blocking    precarga completa antes de aceptar requests
+
+Con --no-artifacts se usa un directorio de artefactos vacío (se lee el Excel
+y se ejecuta Delaunay, el peor caso).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_cold_start_burst [--clients 16] [--no-artifacts]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MODES = ("off", "background", "blocking")
+PATHS = [
+    "/cities/",
+    "/graph/edges",
+    "/cities/san",
+    "/graph/shortest-path?start_id=1840034016&goal_id=1840020491",
+    "/tiles/6/18/24.mvt",
+    "/tiles/5/9/12.mvt",
+    "/tiles/4/4/6.mvt",
+]
+
+
+def _child(clients: int) -> None:
+    """Corre dentro del subproceso: cuenta construcciones y mide la ráfaga"""
+    from fastapi.testclient import TestClient
+
+    from graphmap.domain.model.entities.city_search_index import CitySearchIndex
+    from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+    from graphmap.infrastructure.persistence.artifact_store import ArtifactStore
+
+    counts = {"cities": 0, "graph": 0, "edges": 0, "search_index": 0}
+    counts_lock = threading.Lock()
+
+    def counted(name, fn):
+        def wrapper(*args, **kwargs):
+            with counts_lock:
+                counts[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    CSRCityGraph.get_edges = counted("edges", CSRCityGraph.get_edges)
+    CitySearchIndex.from_table = classmethod(counted("search_index", CitySearchIndex.from_table.__func__))
+
+    load_or_build = ArtifactStore.load_or_build
+
+    def counted_load_or_build(store, name, *args, **kwargs):
+        kind = "cities" if name.startswith("cities-") else "graph" if name.endswith("km") else None
+        if kind is not None:
+            with counts_lock:
+                counts[kind] += 1
+        return load_or_build(store, name, *args, **kwargs)
+
+    ArtifactStore.load_or_build = counted_load_or_build
+
+    from main import app
+
+    start = time.perf_counter()
+    with TestClient(app) as client:
+        startup = time.perf_counter() - start
+        barrier = threading.Barrier(clients)
+        latencies = []
+
+        def worker(index: int) -> None:
+            path = PATHS[index % len(PATHS)]
+            barrier.wait()
+            begin = time.perf_counter()
+            client.get(path)
+            latencies.append(time.perf_counter() - begin)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    latencies.sort()
+    print(json.dumps({
+        "startup": startup,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "max": latencies[-1],
+        "counts": counts,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--no-artifacts", action="store_true")
+    parser.add_argument("--modes", nargs="+", default=list(MODES))
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.clients)
+        return
+
+    print(f"{'modo':<12}{'arranque (s)':>14}{'p50 (s)':>10}{'p99 (s)':>10}{'máx. (s)':>10}  construcciones")
+    for mode in args.modes:
+        env = dict(os.environ, WARMUP_MODE=mode, PYTHONPATH=os.getcwd())
+        with tempfile.TemporaryDirectory() as artifacts_dir:
+            if args.no_artifacts:
+                env["ARTIFACTS_DIR"] = artifacts_dir
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_cold_start_burst", "--child", "--clients", str(args.clients)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        counts = ", ".join(f"{name}={count}" for name, count in result["counts"].items())
+        print(f"{mode:<12}{result['startup']:>14.2f}{result['p50']:>10.2f}{result['p99']:>10.2f}"
+              f"{result['max']:>10.2f}  {counts}")
+
+
+if __name__ == "__main__":
+    main()
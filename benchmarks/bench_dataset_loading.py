@@ -0,0 +1,68 @@
+"""
+Benchmark: carga del dataset desde Excel vs snapshot binario
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_dataset_loading [--repeat N]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from graphmap.domain.services.city_service import CityService
+from graphmap.infrastructure.cache.dataset_snapshot import PublishedDataset
+
+
+def _reset_cache() -> None:
+    PublishedDataset.reset()
+
+
+def _load_cities(artifacts_dir: str) -> list:
+    # Todas las filas como entidades City (lo que hacía la carga antes de la tabla columnar)
+    return CityService(artifacts_dir=artifacts_dir).load_city_table().to_cities()
+
+
+def _time_load(artifacts_dir: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        _reset_cache()
+        start = time.perf_counter()
+        _load_cities(artifacts_dir)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as empty_dir, tempfile.TemporaryDirectory() as snapshot_dir:
+        # Compilar el snapshot una vez
+        _time_load(snapshot_dir, 1)
+
+        excel = []
+        for _ in range(args.repeat):
+            # Directorio sin snapshot: fuerza el parseo del Excel en cada carga
+            with tempfile.TemporaryDirectory() as fresh_dir:
+                excel.extend(_time_load(fresh_dir, 1))
+        snapshot = _time_load(snapshot_dir, args.repeat)
+        table_only = []
+        for _ in range(args.repeat):
+            _reset_cache()
+            start = time.perf_counter()
+            CityService(artifacts_dir=snapshot_dir).load_city_table()
+            table_only.append((time.perf_counter() - start) * 1000)
+
+    print(f"{'ruta':<28}{'mediana (ms)':>14}{'min (ms)':>12}")
+    for name, timings in (
+        ("excel (openpyxl)", excel),
+        ("snapshot -> List[City]", snapshot),
+        ("snapshot -> CityTable", table_only),
+    ):
+        print(f"{name:<28}{statistics.median(timings):>14.2f}{min(timings):>12.2f}")
+    _reset_cache()
+
+
+if __name__ == "__main__":
+    main()
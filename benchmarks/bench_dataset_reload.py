@@ -0,0 +1,171 @@
+"""
+Benchmark: recarga del dataset en caliente bajo carga y parche local de Delaunay
+
+1. Recarga bajo carga: arranca la app sobre una copia del Excel, mueve
+   --changes ciudades en la copia y llama a POST /admin/reload mientras
+   --clients hilos consultan la API. Informa la duración de la recarga, la
+   latencia antes y durante (p50, p99), los errores y si alguna respuesta
+   de /graph/summary no corresponde ni a la versión anterior ni a la nueva.
+
+2. Parche vs. triangulación completa: sobre datasets sintéticos (el
+   dataset real replicado --scale veces con ruido), compara
+   GraphBuilder.patch_delaunay_graph con build_delaunay_graph_from_arrays
+   al mover --changes ciudades, y verifica que el grafo sea idéntico.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_dataset_reload [--clients 4] [--changes 10] [--scale 1 4 40]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+ADMIN_TOKEN = "bench"
+PATHS = [
+    "/cities/san",
+    "/graph/shortest-path?start_id=1840034016&goal_id=1840020491",
+    "/tiles/5/9/12.mvt",
+    "/graph/summary",
+]
+
+
+def _percentiles(latencies: List[float]) -> str:
+    if not latencies:
+        return "-"
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f"p50 {statistics.median(latencies) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms ({len(latencies)} requests)"
+
+
+def _move_cities(excel_path: str, changes: int) -> None:
+    """Desplaza la latitud de las primeras `changes` ciudades del Excel"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path)
+    worksheet = workbook.active
+    headers = [cell.value for cell in worksheet[1]]
+    column = headers.index("lat") + 1
+    for row in range(2, 2 + changes):
+        worksheet.cell(row, column).value = worksheet.cell(row, column).value + 0.05
+    workbook.save(excel_path)
+
+
+def _reload_under_load(clients: int, changes: int) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        excel_path = os.path.join(workdir, "dataset.xlsx")
+        shutil.copy("dataset.xlsx", excel_path)
+        # Config lee el entorno al importarse
+        os.environ.update(DATASET_PATH=excel_path, ARTIFACTS_DIR=os.path.join(workdir, "artifacts"),
+                          ADMIN_TOKEN=ADMIN_TOKEN, WARMUP_MODE="blocking")
+        from fastapi.testclient import TestClient
+        from main import app
+
+        headers = {"X-Admin-Token": ADMIN_TOKEN}
+        with TestClient(app) as client:
+            old_summary = client.get("/graph/summary").json()
+            _move_cities(excel_path, changes)
+
+            phase = "before"
+            latencies = {"before": [], "during": [], "after": []}
+            summaries, errors = [], 0
+            stop = threading.Event()
+
+            def worker(index: int) -> None:
+                nonlocal errors
+                while not stop.is_set():
+                    path = PATHS[index % len(PATHS)]
+                    index += 1
+                    current = phase
+                    begin = time.perf_counter()
+                    response = client.get(path)
+                    latencies[current].append(time.perf_counter() - begin)
+                    if response.status_code != 200:
+                        errors += 1
+                    elif path == "/graph/summary":
+                        summaries.append(response.json())
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+            for thread in threads:
+                thread.start()
+            time.sleep(2.0)
+
+            phase = "during"
+            client.post("/admin/reload", headers=headers)
+            while client.get("/admin/reload", headers=headers).json()["status"] == "running":
+                time.sleep(0.05)
+            phase = "after"
+            time.sleep(2.0)
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+            result = client.get("/admin/reload", headers=headers).json()["last"]
+            new_summary = client.get("/graph/summary").json()
+
+    mixed = sum(1 for summary in summaries if summary not in (old_summary, new_summary))
+    print(f"recarga: {result.get('seconds')} s, grafo: {result.get('graph_source')}, "
+          f"ciudades cambiadas: {result.get('changed_cities')}")
+    for name, values in latencies.items():
+        print(f"  {name:<8}{_percentiles(values)}")
+    print(f"  errores: {errors}   /graph/summary fuera de ambas versiones: {mixed}")
+
+
+def _patch_vs_full(scales: List[int], changes: int, repeat: int) -> None:
+    from graphmap.domain.services.city_service import CityService
+    from graphmap.domain.services.graph_builder import GraphBuilder
+    from graphmap.domain.services.graph_service import GraphService
+
+    table = CityService().load_city_table()
+    rng = np.random.default_rng(0)
+    max_km = GraphService.MAX_DISTANCE_KM
+
+    print(f"{'ciudades':>10}{'completa (ms)':>16}{'parche (ms)':>14}  resultado")
+    for scale in scales:
+        lat = np.concatenate([table.lat + (rng.normal(0, 0.3, len(table)) if i else 0) for i in range(scale)])
+        lng = np.concatenate([table.lng + (rng.normal(0, 0.3, len(table)) if i else 0) for i in range(scale)])
+        lat, lng = lat.clip(-85, 85), lng.clip(-180, 180)
+        ids = np.arange(1, len(lat) + 1, dtype=np.int64)
+        graph = GraphBuilder.build_delaunay_graph_from_arrays(ids, lat, lng, max_km)
+
+        full_ms, patch_ms, outcome = [], [], "idéntico"
+        for _ in range(repeat):
+            moved = rng.choice(len(ids), changes, replace=False)
+            new_lat = lat.copy()
+            new_lat[moved] += 0.05
+
+            start = time.perf_counter()
+            full = GraphBuilder.build_delaunay_graph_from_arrays(ids, new_lat, lng, max_km)
+            full_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            patched = GraphBuilder.patch_delaunay_graph(graph, ids, lat, lng, ids, new_lat, lng, max_km)
+            patch_ms.append((time.perf_counter() - start) * 1000)
+
+            if patched is None:
+                outcome = "sin parche (triangulación completa)"
+            elif not all(np.array_equal(a, b) for a, b in zip(patched.to_csr(), full.to_csr())):
+                outcome = "DISTINTO"
+                break
+        print(f"{len(ids):>10}{statistics.median(full_ms):>16.1f}{statistics.median(patch_ms):>14.1f}  {outcome}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 40])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _reload_under_load(args.clients, args.changes)
+    print()
+    _patch_vs_full(args.scale, args.changes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
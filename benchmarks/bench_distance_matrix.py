@@ -0,0 +1,59 @@
+"""
+Benchmark: matrices de distancias S x T contra consultas A* par a par
+
+Mide `DistanceMatrixService.distance_matrix` (un Dijkstra por origen) para
+varios tamaños y lo compara con resolver cada par con `a_star`, que es lo
+que hacía un cliente llamando a /graph/shortest-path en bucle (sin contar
+el costo HTTP). El modo A* se estima sobre una muestra de pares.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_distance_matrix [--sizes 50 200 500] [--workers W] [--seed S]
+"""
+import argparse
+import random
+import time
+
+from graphmap.domain.services.graph_service import GraphService
+
+# Pares resueltos con A* para estimar el costo del enfoque par a par
+ASTAR_SAMPLE = 300
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto ROUTING_WORKERS)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    graph_service = GraphService()
+    pathfinding = graph_service.get_pathfinding_service()
+    service = graph_service.get_distance_matrix_service()
+    if args.workers is not None:
+        service.workers = args.workers
+
+    rng = random.Random(args.seed)
+    nodes = pathfinding.node_ids
+
+    sample = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(ASTAR_SAMPLE)]
+    start = time.perf_counter()
+    for pair in sample:
+        pathfinding.a_star(*pair)
+    astar_ms_per_pair = (time.perf_counter() - start) * 1000 / len(sample)
+
+    # Primera llamada fuera de la medición (arranque del pool de procesos)
+    service.distance_matrix(nodes[:service.PARALLEL_MIN_SOURCES], nodes[:1])
+
+    print(f"workers={service.workers}, A* par a par: {astar_ms_per_pair:.2f} ms/par")
+    print(f"{'tamaño':<12}{'matriz (s)':>12}{'A* estimado (s)':>18}{'aceleración':>14}")
+    for size in args.sizes:
+        sources, targets = rng.sample(nodes, size), rng.sample(nodes, size)
+        start = time.perf_counter()
+        service.distance_matrix(sources, targets)
+        elapsed = time.perf_counter() - start
+        estimated = astar_ms_per_pair * size * size / 1000
+        print(f"{f'{size}x{size}':<12}{elapsed:>12.2f}{estimated:>18.1f}{estimated / elapsed:>13.0f}x")
+
+
+if __name__ == "__main__":
+    main()
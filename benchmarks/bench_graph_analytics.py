@@ -0,0 +1,127 @@
+"""
+Benchmark: analítica del grafo con scipy.sparse.csgraph contra bucles en Python
+
+Para componentes conexas, grados y distancias desde un origen compara
+GraphAnalyticsService con la implementación directa en Python sobre los
+mismos arrays CSR (BFS con deque, Dijkstra con heapq) y verifica que den lo
+mismo. Las distancias se piden con limit=10 para medir el cálculo y no el
+armado de la respuesta completa. Para la centralidad mide el cálculo
+inicial y la respuesta en caché según el tamaño de la muestra.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_graph_analytics [--samples 16 64 256] [--sources 20]
+"""
+import argparse
+import heapq
+import statistics
+import time
+from collections import deque
+from typing import Callable, List
+
+import numpy as np
+
+from graphmap.domain.services.graph_analytics_service import CentralityMetric, GraphAnalyticsService
+
+
+def _ms(function: Callable, repeat: int = 1) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def _python_components(indptr: List[int], indices: List[int]) -> List[int]:
+    n = len(indptr) - 1
+    seen, sizes = [False] * n, []
+    for root in range(n):
+        if seen[root]:
+            continue
+        seen[root], queue, size = True, deque([root]), 0
+        while queue:
+            node = queue.popleft()
+            size += 1
+            for neighbor in indices[indptr[node]:indptr[node + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = True
+                    queue.append(neighbor)
+        sizes.append(size)
+    return sorted(sizes, reverse=True)
+
+
+def _python_dijkstra(indptr: List[int], indices: List[int], weights: List[float], source: int) -> List[float]:
+    distances = [float("inf")] * (len(indptr) - 1)
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        for position in range(indptr[node], indptr[node + 1]):
+            candidate = distance + weights[position]
+            if candidate < distances[indices[position]]:
+                distances[indices[position]] = candidate
+                heapq.heappush(heap, (candidate, indices[position]))
+    return distances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--sources", type=int, default=20, help="Orígenes para las distancias desde un origen")
+    args = parser.parse_args()
+
+    service = GraphAnalyticsService()
+    snapshot = service.graph_service.get_snapshot()
+    # Imports y filas de los nodos fuera de las mediciones
+    import scipy.sparse.csgraph  # noqa: F401
+    service.graph_service.get_node_rows(snapshot)
+    graph = snapshot["graph"]
+    indptr, indices, weights = graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+    print(f"grafo: {graph.num_nodes()} nodos, {graph.num_edges()} aristas\n")
+
+    print(f"{'métrica':<24}{'Python (ms)':>14}{'csgraph (ms)':>14}{'en caché (ms)':>15}  resultado")
+
+    python_ms = _ms(lambda: _python_components(indptr, indices))
+    csgraph_ms = _ms(service.get_components)
+    cached_ms = _ms(service.get_components, repeat=20)
+    sizes = [component["size"] for component in service.get_components(limit=len(indptr))["components"]]
+    same = "igual" if sizes == _python_components(indptr, indices) else "DISTINTO"
+    print(f"{'componentes':<24}{python_ms:>14.2f}{csgraph_ms:>14.2f}{cached_ms:>15.3f}  {same}")
+
+    python_ms = _ms(lambda: [indptr[i + 1] - indptr[i] for i in range(len(indptr) - 1)])
+    csgraph_ms = _ms(service.get_degree_distribution)
+    cached_ms = _ms(service.get_degree_distribution, repeat=20)
+    print(f"{'grados':<24}{python_ms:>14.2f}{csgraph_ms:>14.2f}{cached_ms:>15.3f}")
+
+    rng = np.random.default_rng(0)
+    sources = rng.choice(graph.num_nodes(), size=min(args.sources, graph.num_nodes()), replace=False)
+    python_ms, csgraph_ms, mismatches = [], [], 0
+    for source in sources.tolist():
+        start = time.perf_counter()
+        expected = _python_dijkstra(indptr, indices, weights, source)
+        python_ms.append((time.perf_counter() - start) * 1000)
+        source_id = int(graph.node_ids[source])
+        start = time.perf_counter()
+        result = service.get_distances_from(source_id, limit=10)
+        csgraph_ms.append((time.perf_counter() - start) * 1000)
+        reachable = sum(1 for distance in expected if distance != float("inf")) - 1
+        if result["reachable"] != reachable or abs(result["farthest_km"] - max(
+                distance for distance in expected if distance != float("inf"))) > 1e-2:
+            mismatches += 1
+    cached_ms = _ms(lambda: service.get_distances_from(int(graph.node_ids[sources[0]]), limit=10), repeat=20)
+    same = "igual" if not mismatches else f"{mismatches} DISTINTOS"
+    print(f"{'distancias (1 origen)':<24}{statistics.median(python_ms):>14.2f}"
+          f"{statistics.median(csgraph_ms):>14.2f}{cached_ms:>15.3f}  {same}")
+
+    print(f"\n{'centralidad':<24}{'muestra':>10}{'cálculo (ms)':>15}{'en caché (ms)':>15}")
+    for metric in CentralityMetric:
+        for samples in args.samples:
+            first_ms = _ms(lambda: service.get_centrality(metric, samples))
+            cached_ms = _ms(lambda: service.get_centrality(metric, samples), repeat=20)
+            print(f"{metric.value:<24}{samples:>10}{first_ms:>15.1f}{cached_ms:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: arranque en frío de /graph/shortest-path con y sin grafo precompilado
+
+Mide, desde cachés vacías, el tiempo hasta obtener la primera ruta
+(New York -> Los Angeles por defecto), tal como lo hace el controlador.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_graph_cold_start [--repeat N]
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.domain.services.pathfinding_service import PathfindingService
+from graphmap.infrastructure.cache.dataset_snapshot import PublishedDataset
+
+NEW_YORK = 1840034016
+LOS_ANGELES = 1840020491
+
+
+def _reset_caches() -> None:
+    PublishedDataset.reset()
+
+
+def _cold_query(artifacts_dir: str, start_id: int, goal_id: int) -> float:
+    _reset_caches()
+    start = time.perf_counter()
+    city_service = CityService(artifacts_dir=artifacts_dir)
+    graph_service = GraphService()
+    graph_service.city_service = city_service
+    graph = graph_service.build_city_graph()
+    result = PathfindingService(graph, city_service.load_city_table()).a_star(start_id, goal_id)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert result is not None
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--start-id", type=int, default=NEW_YORK)
+    parser.add_argument("--goal-id", type=int, default=LOS_ANGELES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as artifacts_dir:
+        def drop_graph_artifacts() -> None:
+            for path in Path(artifacts_dir).glob("graph-*"):
+                shutil.rmtree(path)
+
+        # Compilar el snapshot de ciudades para aislar el costo del grafo
+        _cold_query(artifacts_dir, args.start_id, args.goal_id)
+
+        # Solo el snapshot de ciudades: el grafo se construye con Delaunay
+        rebuilt = []
+        for _ in range(args.repeat):
+            drop_graph_artifacts()
+            rebuilt.append(_cold_query(artifacts_dir, args.start_id, args.goal_id))
+
+        # Snapshot de ciudades + grafo precompilado
+        _cold_query(artifacts_dir, args.start_id, args.goal_id)
+        precompiled = [_cold_query(artifacts_dir, args.start_id, args.goal_id) for _ in range(args.repeat)]
+
+    print(f"{'grafo':<24}{'mediana (ms)':>14}{'min (ms)':>12}")
+    for name, timings in (("delaunay en request", rebuilt), ("artefacto CSR", precompiled)):
+        print(f"{name:<24}{statistics.median(timings):>14.2f}{min(timings):>12.2f}")
+    _reset_caches()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: CityGraph (dict de listas de tuplas) vs CSRCityGraph (arrays NumPy)
+
+Compara memoria ocupada, costo de num_edges() y de recorrer todos los vecinos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_graph_storage
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+from graphmap.domain.model.entities.graph import CityGraph
+from graphmap.domain.services.graph_service import GraphService
+
+
+def _traced(factory):
+    tracemalloc.start()
+    obj = factory()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def _time_ms(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    csr = GraphService().build_city_graph()
+    arrays = [np.array(a) for a in csr.to_csr()]
+
+    dict_graph, dict_bytes = _traced(lambda: CityGraph.from_csr(*arrays))
+    csr_graph, csr_bytes = _traced(lambda: CSRCityGraph(*(a.copy() for a in arrays)))
+
+    def scan_dict():
+        for node in dict_graph.adj_list:
+            for _neighbor, _dist in dict_graph.get_neighbors(node):
+                pass
+
+    indptr, indices, weights = csr_graph.indptr.tolist(), csr_graph.indices.tolist(), csr_graph.weights.tolist()
+
+    def scan_csr():
+        for i in range(len(indptr) - 1):
+            for k in range(indptr[i], indptr[i + 1]):
+                _neighbor, _dist = indices[k], weights[k]
+
+    print(f"{'':<22}{'CityGraph':>14}{'CSRCityGraph':>14}")
+    print(f"{'memoria (KiB)':<22}{dict_bytes / 1024:>14.1f}{csr_bytes / 1024:>14.1f}")
+    print(f"{'num_edges() (ms)':<22}{_time_ms(dict_graph.num_edges):>14.4f}{_time_ms(csr_graph.num_edges):>14.4f}")
+    print(f"{'recorrido total (ms)':<22}{_time_ms(scan_dict):>14.2f}{_time_ms(scan_csr):>14.2f}")
+    print(f"nodos={csr_graph.num_nodes()} aristas={csr_graph.num_edges()} (dict: {dict_graph.num_edges()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: throughput y latencia con una carga mixta de requests concurrentes
+
+Arranca la API con uvicorn en un subproceso (un worker, WARMUP_MODE=blocking
+y caché de rutas deshabilitada para que cada ruta se calcule) y lanza
+--clients hilos durante --duration segundos. Cada hilo elige al azar:
+
+    heavy   /graph/shortest-path entre dos ciudades al azar (A*)
+    search  /cities/{query} con una subcadena frecuente (miles de resultados)
+    light   /health y /graph/route-cache/stats (no calculan nada)
+
+Se informa, por tipo, requests por segundo, latencia p50/p99 y cuántos
+recibieron 429. Si los handlers bloquean el event loop, los requests
+`light` esperan detrás de los `heavy` y su p99 se acerca al de estos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_mixed_load [--clients 32] [--duration 10] [--port 8399]
+                                          [--compute-workers W] [--queue-size Q]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+SEARCH_QUERIES = ["san", "ville", "burg", "port", "la"]
+LIGHT_PATHS = ["/health", "/graph/route-cache/stats"]
+WEIGHTS = {"heavy": 0.4, "search": 0.2, "light": 0.4}
+
+
+def _get(base_url: str, path: str) -> int:
+    """GET y lectura completa del cuerpo; retorna el status HTTP"""
+    try:
+        with urllib.request.urlopen(base_url + path, timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 300.0) -> None:
+    """Espera a que /health/ready responda 200"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if _get(base_url, "/health/ready") == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("Server did not become ready")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8399)
+    parser.add_argument("--compute-workers", type=int, default=None, help="COMPUTE_WORKERS del servidor")
+    parser.add_argument("--queue-size", type=int, default=None, help="COMPUTE_QUEUE_SIZE del servidor")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    env = dict(os.environ, WARMUP_MODE="blocking", ROUTE_CACHE_SIZE="0", PYTHONPATH=os.getcwd())
+    if args.compute_workers is not None:
+        env["COMPUTE_WORKERS"] = str(args.compute_workers)
+    if args.queue_size is not None:
+        env["COMPUTE_QUEUE_SIZE"] = str(args.queue_size)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        _wait_ready(base_url, server)
+        with urllib.request.urlopen(base_url + "/graph/edges", timeout=60) as response:
+            edges = json.loads(response.read())["edges"]
+        node_ids = sorted({edge["source"] for edge in edges} | {edge["target"] for edge in edges})
+
+        results = {kind: [] for kind in WEIGHTS}
+        rejected = {kind: 0 for kind in WEIGHTS}
+        results_lock = threading.Lock()
+        stop_at = time.perf_counter() + args.duration
+
+        def worker(index: int) -> None:
+            rng = random.Random(args.seed + index)
+            kinds, weights = list(WEIGHTS), list(WEIGHTS.values())
+            while time.perf_counter() < stop_at:
+                kind = rng.choices(kinds, weights)[0]
+                if kind == "heavy":
+                    path = f"/graph/shortest-path?start_id={rng.choice(node_ids)}&goal_id={rng.choice(node_ids)}"
+                elif kind == "search":
+                    path = f"/cities/{rng.choice(SEARCH_QUERIES)}"
+                else:
+                    path = rng.choice(LIGHT_PATHS)
+                begin = time.perf_counter()
+                status = _get(base_url, path)
+                elapsed = time.perf_counter() - begin
+                with results_lock:
+                    if status == 429:
+                        rejected[kind] += 1
+                    else:
+                        results[kind].append(elapsed)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{args.clients} clientes, {args.duration:.0f} s")
+    print(f"{'tipo':<8}{'req/s':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}{'429':>8}")
+    total = 0
+    for kind, latencies in results.items():
+        latencies.sort()
+        total += len(latencies)
+        if not latencies:
+            print(f"{kind:<8}{0:>10.1f}{'-':>12}{'-':>12}{rejected[kind]:>8}")
+            continue
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"{kind:<8}{len(latencies) / args.duration:>10.1f}{p50:>12.1f}{p99:>12.1f}{rejected[kind]:>8}")
+    print(f"{'total':<8}{total / args.duration:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: arranque y memoria con varios workers de uvicorn
+
+Arranca `uvicorn main:app --workers N` (WARMUP_MODE=blocking) y espera a que
+todos los workers terminen la precarga. Informa:
+
+    arranque    segundos hasta que la CPU de los workers se estabiliza
+    CPU total   segundos de CPU sumados de todos los workers (costo de
+                construcción: no debería multiplicarse por N)
+    RSS / PSS   memoria residente de cada worker; PSS reparte las páginas
+                compartidas (artefactos memory-mapped) entre los procesos
+                que las usan, así que refleja el costo real por worker
+
+Con --no-artifacts se usa un directorio de artefactos vacío: un solo worker
+lee el Excel y ejecuta Delaunay; los demás esperan y abren el resultado.
+
+Uso (desde la raíz del repositorio, solo Linux):
+    python -m benchmarks.bench_multi_worker [--workers 4] [--no-artifacts] [--port 8398]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+# Segundos sin consumo de CPU para considerar terminada la precarga
+SETTLE_SECONDS = 2.0
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def _workers(parent_pid: int) -> List[int]:
+    """PIDs de los workers de uvicorn (hijos del proceso maestro)"""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                fields = fh.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/cmdline", "rb") as fh:
+                cmdline = fh.read()
+        except OSError:
+            continue
+        if int(fields[1]) == parent_pid and b"spawn_main" in cmdline:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def _cpu_seconds(pid: int) -> float:
+    """Tiempo de CPU (usuario + sistema) consumido por un proceso"""
+    with open(f"/proc/{pid}/stat") as fh:
+        fields = fh.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    """RSS y PSS de un proceso en KB (de /proc/<pid>/smaps_rollup)"""
+    memory = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                memory[key] = int(value.split()[0])
+    return memory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--no-artifacts", action="store_true")
+    parser.add_argument("--port", type=int, default=8398)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as artifacts_dir:
+        env = dict(os.environ, WARMUP_MODE="blocking", PYTHONPATH=os.getcwd())
+        if args.no_artifacts:
+            env["ARTIFACTS_DIR"] = artifacts_dir
+
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            # Esperar a que arranquen todos los workers y dejen de consumir CPU
+            pids, last_total, last_change = [], -1.0, time.perf_counter()
+            while time.perf_counter() - start < args.timeout:
+                time.sleep(0.2)
+                pids = _workers(server.pid)
+                if len(pids) < args.workers:
+                    last_change = time.perf_counter()
+                    continue
+                total = sum(_cpu_seconds(pid) for pid in pids)
+                if total != last_total:
+                    last_total, last_change = total, time.perf_counter()
+                elif time.perf_counter() - last_change >= SETTLE_SECONDS:
+                    break
+            else:
+                raise RuntimeError("Workers did not finish warming up")
+
+            startup = last_change - start
+            memory = {pid: _memory_kb(pid) for pid in pids}
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.workers} workers, artefactos {'vacíos' if args.no_artifacts else 'precompilados'}")
+    print(f"arranque: {startup:.2f} s   CPU total: {last_total:.2f} s")
+    print(f"{'worker':<10}{'RSS (MB)':>12}{'PSS (MB)':>12}")
+    for pid, values in memory.items():
+        print(f"{pid:<10}{values['Rss'] / 1024:>12.1f}{values['Pss'] / 1024:>12.1f}")
+    print(f"{'total':<10}{sum(v['Rss'] for v in memory.values()) / 1024:>12.1f}"
+          f"{sum(v['Pss'] for v in memory.values()) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
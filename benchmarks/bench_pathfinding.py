@@ -0,0 +1,92 @@
+"""
+Benchmark: latencia y memoria por consulta de A* sobre pares aleatorios de ciudades
+
+Compara el motor actual (índices densos, arrays planos, heurística con `math`)
+contra la implementación anterior basada en diccionarios y objetos City.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_pathfinding [--pairs N] [--seed S]
+"""
+import argparse
+import heapq
+import random
+import statistics
+import time
+import tracemalloc
+
+from graphmap.domain.model.entities.geo_utils import GeoUtils
+from graphmap.domain.services.graph_service import GraphService
+
+
+def legacy_a_star(graph, city_id_map, start, goal):
+    """A* previo: dicts para g/f/came_from, heurística con NumPy escalar, sin conjunto cerrado"""
+    def heuristic(a, b):
+        c1, c2 = city_id_map[a], city_id_map[b]
+        return GeoUtils.haversine_distance(c1.lat, c1.lng, c2.lat, c2.lng)
+
+    g_score = {start: 0.0}
+    open_set = [(heuristic(start, goal), start)]
+    came_from = {}
+    explored = 0
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        explored += 1
+        if current == goal:
+            return g_score[goal], explored
+        for neighbor, weight in graph.get_neighbors(current):
+            tentative = g_score[current] + weight
+            if neighbor not in g_score or tentative < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative
+                heapq.heappush(open_set, (tentative + heuristic(neighbor, goal), neighbor))
+    return None, explored
+
+
+def _measure(fn, pairs):
+    latencies, peaks, results = [], [], []
+    for start, goal in pairs:
+        t0 = time.perf_counter()
+        results.append(fn(start, goal))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    # Memoria en una segunda pasada: tracemalloc distorsiona los tiempos
+    for start, goal in pairs:
+        tracemalloc.start()
+        fn(start, goal)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return latencies, peaks, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    graph_service = GraphService()
+    graph = graph_service.build_city_graph()
+    pathfinding = graph_service.get_pathfinding_service()
+
+    rng = random.Random(args.seed)
+    nodes = pathfinding.node_ids
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.pairs)]
+
+    city_id_map = {city.id: city for city in pathfinding.cities.records()}
+    legacy = _measure(lambda s, g: legacy_a_star(graph, city_id_map, s, g), pairs)
+    current = _measure(pathfinding.a_star, pairs)
+
+    mismatches = sum(
+        1 for (old, _), new in zip(legacy[2], current[2])
+        if (old is None) != (new is None) or (new is not None and abs(round(old, 2) - new["distance"]) > 0.01)
+    )
+
+    print(f"{args.pairs} pares aleatorios (seed={args.seed}), distancias distintas: {mismatches}")
+    print(f"{'motor':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'media (ms)':>12}{'pico mem (KiB)':>16}")
+    for name, (latencies, peaks, _) in (("anterior", legacy), ("actual", current)):
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{name:<12}{statistics.median(latencies):>10.2f}{p95:>10.2f}"
+              f"{statistics.mean(latencies):>12.2f}{statistics.mean(peaks) / 1024:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: motores de /graph/shortest-path sobre pares aleatorios de ciudades
+
+Reporta latencia, ciudades exploradas y diferencias de distancia respecto
+de A* con Haversine. Los pares "largos" son los separados por más de 2000 km.
+Incluye Dijkstra unidireccional como línea base para los modos bidireccionales.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_routing_engines [--pairs N] [--seed S]
+"""
+import argparse
+import random
+import statistics
+import time
+from functools import partial
+
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.domain.services.pathfinding_service import RoutingEngine
+
+LONG_ROUTE_KM = 2000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pathfinding = GraphService().get_pathfinding_service()
+
+    rng = random.Random(args.seed)
+    nodes = pathfinding.node_ids
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.pairs)]
+    long_pairs = {pair for pair in pairs if pathfinding._heuristic(*pair) > LONG_ROUTE_KM}
+
+    reference = {pair: pathfinding.a_star(*pair) for pair in pairs}
+
+    print(f"{len(pairs)} pares (seed={args.seed}), {len(long_pairs)} largos (> {LONG_ROUTE_KM} km)")
+    print(f"{'motor':<10}{'p50 (ms)':>10}{'media (ms)':>12}{'exploradas':>12}"
+          f"{'expl. largos':>14}{'difieren':>10}")
+    def dijkstra(start_id, goal_id):
+        # A* con heurística nula = Dijkstra unidireccional
+        return pathfinding._route(start_id, goal_id,
+                                  lambda start, goal: pathfinding._search(start, goal, lambda node: 0.0))
+
+    runners = [("dijkstra", dijkstra)]
+    runners += [(engine.value, partial(pathfinding.find_path, engine=engine)) for engine in RoutingEngine]
+
+    for name, route in runners:
+        try:
+            route(*pairs[0])
+        except ValueError:
+            print(f"{name:<10}{'no disponible':>10}")
+            continue
+
+        latencies, explored, explored_long, mismatches = [], [], [], 0
+        for pair in pairs:
+            start = time.perf_counter()
+            result = route(*pair)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            expected = reference[pair]
+            if (result is None) != (expected is None):
+                mismatches += 1
+            elif result is not None:
+                mismatches += abs(result["distance"] - expected["distance"]) > 0.01
+                explored.append(result["cities_explored"])
+                if pair in long_pairs:
+                    explored_long.append(result["cities_explored"])
+
+        print(f"{name:<10}{statistics.median(latencies):>10.2f}{statistics.mean(latencies):>12.2f}"
+              f"{statistics.mean(explored):>12.0f}{statistics.mean(explored_long or [0]):>14.0f}{mismatches:>10}")
+
+
+if __name__ == "__main__":
+    main()
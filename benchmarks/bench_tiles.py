@@ -0,0 +1,66 @@
+"""
+Benchmark: vector tiles (MVT) contra el JSON completo de /cities/ y /graph/edges
+
+Para cada zoom pide los tiles que cubren un viewport de 1024x768 px
+centrado en Nueva York y mide bytes y tiempo en frío (generación) y en
+caliente (caché LRU), frente a las respuestas JSON completas.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_tiles [--zooms 3 6 9 12]
+"""
+import argparse
+import math
+import time
+
+from fastapi.testclient import TestClient
+
+from graphmap.domain.services.tile_service import TileService
+from main import app
+
+CENTER = (40.7, -74.0)
+VIEWPORT_PIXELS = (1024, 768)
+
+
+def _visible_tiles(z: int):
+    """Tiles (x, y) que cubren el viewport alrededor de CENTER"""
+    lat, lng = CENTER
+    n = 2 ** z
+    center_x = (lng + 180.0) / 360.0 * n
+    center_y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n
+    half_x = VIEWPORT_PIXELS[0] / 2 / TileService.TILE_PIXELS
+    half_y = VIEWPORT_PIXELS[1] / 2 / TileService.TILE_PIXELS
+    return [
+        (x, y)
+        for x in range(max(0, int(center_x - half_x)), min(n - 1, int(center_x + half_x)) + 1)
+        for y in range(max(0, int(center_y - half_y)), min(n - 1, int(center_y + half_y)) + 1)
+    ]
+
+
+def _fetch(client: TestClient, paths):
+    start = time.perf_counter()
+    size = sum(len(client.get(path).content) for path in paths)
+    return (time.perf_counter() - start) * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--zooms", type=int, nargs="+", default=[3, 6, 9, 12])
+    args = parser.parse_args()
+
+    # Sin "Accept-Encoding" para comparar los tamaños sin comprimir
+    client = TestClient(app, headers={"Accept-Encoding": "identity"})
+    client.get("/tiles/0/0/0.mvt")  # carga grafo y geometría fuera de la medición
+
+    json_ms, json_bytes = _fetch(client, ["/cities/", "/graph/edges"])
+    print(f"JSON completo: {json_bytes / 1024:.1f} KB en {json_ms:.1f} ms\n")
+
+    print(f"{'zoom':>4}{'tiles':>7}{'KB':>9}{'frío (ms)':>12}{'caché (ms)':>12}")
+    for z in args.zooms:
+        paths = [f"/tiles/{z}/{x}/{y}.mvt" for x, y in _visible_tiles(z)]
+        cold_ms, size = _fetch(client, paths)
+        warm_ms, _ = _fetch(client, paths)
+        print(f"{z:>4}{len(paths):>7}{size / 1024:>9.1f}{cold_ms:>12.1f}{warm_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
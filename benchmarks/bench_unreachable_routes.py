@@ -0,0 +1,76 @@
+"""
+Benchmark: consultas de ruta entre componentes distintas (sin camino)
+
+Elige pares de ciudades en componentes distintas del grafo (islas que deja
+el filtro de 500 km) y mide cada motor con el rechazo por etiqueta de
+componente y sin él (todas las etiquetas iguales, como antes: la búsqueda
+explora toda la componente de origen antes de devolver None). También
+mide una consulta con camino como referencia.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_unreachable_routes [--pairs 20] [--seed 42]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.domain.services.pathfinding_service import RoutingEngine
+
+
+def _median_ms(pathfinding, pairs, engine: RoutingEngine) -> float:
+    times = []
+    for start_id, goal_id in pairs:
+        start = time.perf_counter()
+        pathfinding.find_path(start_id, goal_id, engine)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    graph_service = GraphService()
+    graph = graph_service.build_city_graph()
+    pathfinding = graph_service.get_pathfinding_service()
+    engines = [RoutingEngine.ASTAR, RoutingEngine.BIDIJKSTRA, RoutingEngine.BIASTAR]
+    if pathfinding.landmarks is not None:
+        engines.append(RoutingEngine.ALT)
+    if pathfinding.hierarchy is not None:
+        engines.append(RoutingEngine.CH)
+
+    if graph.num_components() < 2:
+        print("el grafo es conexo: no hay pares sin camino")
+        return
+
+    # Origen en la componente más grande y destino en cualquier otra (el peor caso)
+    rng = random.Random(args.seed)
+    labels = pathfinding.components
+    largest = max(set(labels), key=labels.count)
+    main_nodes = [node for node, label in zip(pathfinding.node_ids, labels) if label == largest]
+    other_nodes = [node for node, label in zip(pathfinding.node_ids, labels) if label != largest]
+    cross = [(rng.choice(main_nodes), rng.choice(other_nodes)) for _ in range(args.pairs)]
+    same = [(rng.choice(main_nodes), rng.choice(main_nodes)) for _ in range(args.pairs)]
+    print(f"componentes: {graph.num_components()}, pares: {args.pairs}\n")
+
+    print(f"{'motor':<12}{'sin etiquetas (ms)':>20}{'con etiquetas (ms)':>20}{'con camino (ms)':>18}")
+    for engine in engines:
+        with_labels = _median_ms(pathfinding, cross, engine)
+        reachable = _median_ms(pathfinding, same, engine)
+        pathfinding.components, saved = [0] * len(labels), pathfinding.components
+        try:
+            without_labels = _median_ms(pathfinding, cross, engine)
+        finally:
+            pathfinding.components = saved
+        print(f"{engine.value:<12}{without_labels:>20.2f}{with_labels:>20.4f}{reachable:>18.2f}")
+
+    start_id, goal_id = cross[0]
+    print(f"\n404: {graph_service.get_unreachable_reason(start_id, goal_id)}")
+
+
+if __name__ == "__main__":
+    main()
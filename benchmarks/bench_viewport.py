@@ -0,0 +1,55 @@
+"""
+Benchmark: /cities/ y /graph/edges completos contra filtrados por viewport
+
+Mide tiempo de servidor y tamaño del JSON para viewports de distinto
+tamaño (mundo, país, estado, ciudad) con su zoom típico, frente a la
+respuesta completa sin parámetros.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_viewport [--repeat N]
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+# nombre -> (min_lat, min_lng, max_lat, max_lng, zoom)
+VIEWPORTS = {
+    "mundo": (-85.0, -180.0, 85.0, 180.0, 2),
+    "EE.UU.": (24.0, -125.0, 50.0, -66.0, 4),
+    "estado (NY)": (40.4, -79.8, 45.1, -71.8, 7),
+    "ciudad (NYC)": (40.5, -74.3, 41.0, -73.6, 11),
+}
+
+
+def _measure(client: TestClient, path: str, params: dict, repeat: int):
+    response = client.get(path, params=params)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        client.get(path, params=params)
+    return (time.perf_counter() - start) / repeat * 1000, len(response.content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Sin "Accept-Encoding" para comparar el JSON sin comprimir
+    client = TestClient(app, headers={"Accept-Encoding": "identity"})
+
+    print(f"{'viewport':<14}{'cities (ms)':>12}{'cities (KB)':>13}{'edges (ms)':>12}{'edges (KB)':>12}")
+    cases = [("completo", {})] + [
+        (name, dict(zip(("min_lat", "min_lng", "max_lat", "max_lng", "zoom"), values)))
+        for name, values in VIEWPORTS.items()
+    ]
+    for name, params in cases:
+        cities_ms, cities_bytes = _measure(client, "/cities/", params, args.repeat)
+        edges_ms, edges_bytes = _measure(client, "/graph/edges", params, args.repeat)
+        print(f"{name:<14}{cities_ms:>12.2f}{cities_bytes / 1024:>13.1f}{edges_ms:>12.2f}{edges_bytes / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,54 @@ class Settings:
         if Path(_DATASET_RAW).is_absolute()
         else BASE_DIR / _DATASET_RAW
     )
+    # Artefactos compilados (snapshot binario del dataset, grafo precomputado)
+    _ARTIFACTS_RAW: str = os.getenv("ARTIFACTS_DIR", "artifacts")
+    ARTIFACTS_DIR: str = str(
+        Path(_ARTIFACTS_RAW)
+        if Path(_ARTIFACTS_RAW).is_absolute()
+        else BASE_DIR / _ARTIFACTS_RAW
+    )
+
+    # Routing: número de landmarks para la heurística ALT (0 = deshabilitada)
+    ALT_LANDMARKS: int = int(os.getenv("ALT_LANDMARKS", "16"))
+    # Routing: índice de Contraction Hierarchies (precompilar con scripts.compile_data)
+    CH_ENABLED: bool = os.getenv("CH_ENABLED", "true").lower() == "true"
+    # Routing: caché LRU de rutas (0 = deshabilitada) y vigencia en segundos (0 = sin vencimiento)
+    ROUTE_CACHE_SIZE: int = int(os.getenv("ROUTE_CACHE_SIZE", "10000"))
+    ROUTE_CACHE_TTL_SECONDS: float = float(os.getenv("ROUTE_CACHE_TTL_SECONDS", "0"))
+    # Routing en lote: procesos para /graph/distance-matrix y /graph/routes (1 = sin pool)
+    ROUTING_WORKERS: int = int(os.getenv("ROUTING_WORKERS", str(os.cpu_count() or 1)))
+
+    # Vector tiles: número de tiles codificados en la caché LRU (0 = deshabilitada)
+    TILE_CACHE_SIZE: int = int(os.getenv("TILE_CACHE_SIZE", "4096"))
+
+    # Analítica del grafo: distancias desde un origen guardadas en la caché LRU (0 = deshabilitada)
+    ANALYTICS_CACHE_SIZE: int = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+
+    # Respuestas estáticas precomprimidas (/cities/, /graph/edges): max-age de Cache-Control
+    STATIC_CACHE_MAX_AGE: int = int(os.getenv("STATIC_CACHE_MAX_AGE", "86400"))
+
+    # Precarga de cachés al arrancar: "background" (hilo aparte), "blocking" o "off"
+    WARMUP_MODE: str = os.getenv("WARMUP_MODE", "background").lower()
+
+    # Trabajo de CPU de los endpoints: hilos del pool y requests que pueden
+    # esperar un hilo libre (por encima se responde 429)
+    COMPUTE_WORKERS: int = int(os.getenv("COMPUTE_WORKERS", str(os.cpu_count() or 1)))
+    COMPUTE_QUEUE_SIZE: int = int(os.getenv("COMPUTE_QUEUE_SIZE", "64"))
+
+    # Recarga del dataset en caliente: segundos entre revisiones del Excel
+    # (0 = sin vigilancia; igual se puede recargar con POST /admin/reload)
+    DATASET_WATCH_SECONDS: float = float(os.getenv("DATASET_WATCH_SECONDS", "0"))
+    # Token de los endpoints /admin (header X-Admin-Token); sin token quedan deshabilitados
+    ADMIN_TOKEN: Optional[str] = os.getenv("ADMIN_TOKEN")
+    # Al recargar, el grafo se parchea localmente (en lugar de triangular todo)
+    # si el dataset tiene al menos GRAPH_PATCH_MIN_CITIES ciudades y cambiaron
+    # (agregadas, eliminadas o movidas) como mucho GRAPH_PATCH_MAX_CHANGES.
+    # Con el dataset incluido (~5.300 ciudades) el parche cuesta unos ms más
+    # que triangular todo, una diferencia despreciable frente a la recarga;
+    # desde ~20.000 ciudades ya es más rápido
+    GRAPH_PATCH_MIN_CITIES: int = int(os.getenv("GRAPH_PATCH_MIN_CITIES", "1000"))
+    GRAPH_PATCH_MAX_CHANGES: int = int(os.getenv("GRAPH_PATCH_MAX_CHANGES", "50"))
 
     # Server Configuration
     HOST: str = os.getenv("HOST", "127.0.0.1")
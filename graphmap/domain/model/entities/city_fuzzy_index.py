@@ -0,0 +1,167 @@
+"""
+Índice de búsqueda aproximada (tolerante a errores de tipeo) de ciudades
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from graphmap.domain.model.entities.city_search_index import CitySearchIndex
+from graphmap.domain.model.entities.city_table import CityTable
+
+
+class CityFuzzyIndex:
+    """Índice de borrados simétricos (estilo SymSpell) sobre `city_ascii`
+
+    Para cada nombre normalizado se guardan todas las variantes obtenidas
+    borrando hasta MAX_DISTANCE caracteres. Si dos palabras están a
+    distancia de edición <= k, comparten alguna variante con <= k borrados
+    de cada lado; así una consulta solo genera sus propios borrados, busca
+    esas variantes en el diccionario y verifica los pocos candidatos con
+    una distancia de edición acotada, sin recorrer todo el dataset.
+
+    Como en SymSpell, los borrados se generan solo sobre los primeros
+    PREFIX_LENGTH caracteres: si dos textos están a distancia <= k, sus
+    prefijos también comparten una variante con <= k borrados de cada
+    lado. Esto acota el tamaño del índice y el costo de consultas largas;
+    la verificación se hace siempre sobre el texto completo.
+
+    La distancia es Damerau-Levenshtein restringida (OSA): inserción,
+    borrado, sustitución y transposición de caracteres adyacentes.
+    """
+
+    MAX_DISTANCE = 2
+    PREFIX_LENGTH = 10
+    MAX_QUERY_LENGTH = 64
+
+    def __init__(self, ascii_names: List[str], population: List[int]):
+        """
+        Construye el índice
+
+        Args:
+            ascii_names: Nombre ASCII de cada ciudad (columna `city_ascii`)
+            population: Población por fila (valores negativos = desconocida)
+        """
+        self._population = population
+
+        # Nombres normalizados distintos y las filas que comparten cada uno
+        key_ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._key_rows: List[List[int]] = []
+        for row, name in enumerate(ascii_names):
+            key = CitySearchIndex.fold(name)
+            key_id = key_ids.get(key)
+            if key_id is None:
+                key_id = key_ids[key] = len(self._keys)
+                self._keys.append(key)
+                self._key_rows.append([])
+            self._key_rows[key_id].append(row)
+
+        # variante con borrados -> nombres que la generan
+        self._deletes: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self._keys):
+            for variant in self._variants(key[:self.PREFIX_LENGTH], self.MAX_DISTANCE):
+                self._deletes.setdefault(variant, []).append(key_id)
+
+    @classmethod
+    def from_table(cls, table: CityTable) -> "CityFuzzyIndex":
+        """Construye el índice a partir de la tabla columnar del dataset"""
+        return cls(table.column("city_ascii"), table.population.tolist())
+
+    def lookup(self, query: str, max_distance: int = MAX_DISTANCE,
+               limit: Optional[int] = 10, offset: int = 0) -> List[Tuple[int, int]]:
+        """
+        Ciudades cuyo nombre está a distancia de edición <= max_distance
+
+        Args:
+            query: Nombre posiblemente mal escrito
+            max_distance: Distancia máxima (0 a MAX_DISTANCE)
+            limit: Máximo de resultados (None = todos)
+            offset: Resultados a saltar (paginación)
+
+        Returns:
+            Lista de (fila, distancia) ordenada por distancia y población descendente
+        """
+        max_distance = max(0, min(max_distance, self.MAX_DISTANCE))
+        folded = CitySearchIndex.fold(query)[:self.MAX_QUERY_LENGTH]
+        if not folded:
+            return []
+
+        keys, edit_distance = self._keys, self.edit_distance
+        distances: Dict[int, int] = {}
+        for variant in self._variants(folded[:self.PREFIX_LENGTH], max_distance):
+            for key_id in self._deletes.get(variant, ()):
+                if key_id not in distances:
+                    distances[key_id] = edit_distance(folded, keys[key_id], max_distance)
+
+        population = self._population
+        matches = [
+            (row, distance)
+            for key_id, distance in distances.items() if distance <= max_distance
+            for row in self._key_rows[key_id]
+        ]
+        matches.sort(key=lambda match: (match[1], -population[match[0]], match[0]))
+        end = None if limit is None else offset + limit
+        return matches[offset:end]
+
+    @staticmethod
+    def _variants(word: str, depth: int) -> Set[str]:
+        """La palabra y todas sus variantes con hasta `depth` caracteres borrados"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(depth):
+            frontier = {
+                candidate[:i] + candidate[i + 1:]
+                for candidate in frontier if candidate
+                for i in range(len(candidate))
+            }
+            variants |= frontier
+        return variants
+
+    @staticmethod
+    def edit_distance(source: str, target: str, limit: int) -> int:
+        """
+        Distancia OSA acotada entre dos textos
+
+        Args:
+            source: Primer texto
+            target: Segundo texto
+            limit: Cota superior de interés
+
+        Returns:
+            La distancia si es <= limit; limit + 1 en caso contrario
+        """
+        if abs(len(source) - len(target)) > limit:
+            return limit + 1
+        if source == target:
+            return 0
+
+        # Solo se calcula la banda |i - j| <= limit: fuera de ella la
+        # distancia ya supera el límite (se representa como limit + 1)
+        exceeded = limit + 1
+        target_length = len(target)
+        previous_previous: List[int] = []
+        previous = [j if j <= limit else exceeded for j in range(target_length + 1)]
+        for i in range(1, len(source) + 1):
+            current = [exceeded] * (target_length + 1)
+            if i <= limit:
+                current[0] = i
+            row_min = current[0]
+            source_char = source[i - 1]
+            for j in range(max(1, i - limit), min(target_length, i + limit) + 1):
+                value = previous[j - 1] if source_char == target[j - 1] else previous[j - 1] + 1
+                if previous[j] + 1 < value:
+                    value = previous[j] + 1
+                if current[j - 1] + 1 < value:
+                    value = current[j - 1] + 1
+                if (i > 1 and j > 1 and source_char == target[j - 2] and source[i - 2] == target[j - 1]
+                        and previous_previous[j - 2] + 1 < value):
+                    value = previous_previous[j - 2] + 1
+                if value > exceeded:
+                    value = exceeded
+                current[j] = value
+                if value < row_min:
+                    row_min = value
+            # Ninguna celda de la fila puede mejorar: la distancia ya excede el límite
+            if row_min > limit:
+                return exceeded
+            previous_previous, previous = previous, current
+
+        return previous[target_length]
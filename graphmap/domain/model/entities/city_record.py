@@ -0,0 +1,57 @@
+"""
+Fila liviana de la tabla de ciudades (sin validación de pydantic)
+"""
+from typing import Dict, Optional
+
+from graphmap.domain.model.entities.city import City
+
+
+class CityRecord:
+    """Ciudad como objeto plano con `__slots__`
+
+    Tiene los mismos atributos que la entidad `City`, pero sin el costo de
+    un modelo de pydantic (validación, `__dict__`, campos por instancia).
+    Los servicios devuelven CityRecord creados a partir de la `CityTable`
+    solo para las filas pedidas; `to_model` y `to_dict` los convierten en
+    la frontera de la API.
+    """
+
+    __slots__ = ("city", "city_ascii", "lat", "lng", "country", "iso2", "iso3",
+                 "admin_name", "capital", "population", "id")
+
+    def __init__(self, city: str, city_ascii: str, lat: float, lng: float, country: str, iso2: str,
+                 iso3: str, admin_name: str, capital: str, population: Optional[int], id: int):
+        self.city = city
+        self.city_ascii = city_ascii
+        self.lat = lat
+        self.lng = lng
+        self.country = country
+        self.iso2 = iso2
+        self.iso3 = iso3
+        self.admin_name = admin_name
+        self.capital = capital
+        self.population = population
+        self.id = id
+
+    def __repr__(self) -> str:
+        return f"CityRecord(id={self.id}, city={self.city!r}, country={self.country!r})"
+
+    def to_dict(self) -> Dict:
+        """Campos en el mismo orden y formato que `City.model_dump()`"""
+        return {
+            "city": self.city,
+            "city_ascii": self.city_ascii,
+            "lat": self.lat,
+            "lng": self.lng,
+            "country": self.country,
+            "iso2": self.iso2,
+            "iso3": self.iso3,
+            "admin_name": self.admin_name,
+            "capital": self.capital,
+            "population": self.population,
+            "id": self.id,
+        }
+
+    def to_model(self) -> City:
+        """Entidad City equivalente (los datos ya fueron validados al compilar la tabla)"""
+        return City.model_construct(**self.to_dict())
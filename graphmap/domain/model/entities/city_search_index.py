@@ -0,0 +1,206 @@
+"""
+Índice de búsqueda de ciudades por nombre (prefijos y subcadenas)
+"""
+import heapq
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from graphmap.domain.model.entities.city_table import CityTable
+
+
+class CitySearchIndex:
+    """Índice en memoria sobre los nombres de las ciudades
+
+    Las claves se normalizan una sola vez (minúsculas y sin acentos) a
+    partir de `city` y `city_ascii`. Se combinan tres estructuras:
+
+    - Lista ordenada de claves: los prefijos se resuelven con bisect, O(log N)
+    - Top-K precalculado para todo prefijo que abarca más de
+      PREFIX_SCAN_LIMIT claves: el resto de prefijos recorre como máximo
+      ese número de claves, así que el autocompletado no depende del
+      tamaño del dataset
+    - Índice invertido de n-gramas (1 a 3 caracteres) para subcadenas:
+      se intersectan las listas de los trigramas de la consulta y solo
+      se verifican esos candidatos
+
+    Los resultados se ordenan por tipo de coincidencia (exacta > prefijo >
+    subcadena) y luego por población descendente. Las filas son índices
+    de la CityTable a partir de la cual se construyó el índice.
+    """
+
+    EXACT, PREFIX, SUBSTRING = 0, 1, 2
+    NGRAM_SIZE = 3
+    PREFIX_SCAN_LIMIT = 64
+    TOP_K = 100
+    SEPARATOR = "\x00"
+    # Mayor code point: prefix + MAX_CHAR acota por arriba todas las claves con ese prefijo
+    MAX_CHAR = "\U0010ffff"
+
+    def __init__(self, names: List[str], ascii_names: List[str], population: List[int]):
+        """
+        Construye el índice
+
+        Args:
+            names: Nombre de cada ciudad (columna `city`)
+            ascii_names: Nombre ASCII de cada ciudad (columna `city_ascii`)
+            population: Población por fila (valores negativos = desconocida)
+        """
+        self._population = population
+        # Claves normalizadas distintas de cada fila
+        self._row_keys: List[Tuple[str, ...]] = [
+            tuple({self.fold(name), self.fold(ascii_name)}) for name, ascii_name in zip(names, ascii_names)
+        ]
+        # Claves de cada fila concatenadas, cada una precedida por un separador:
+        # subcadena = `q in haystack`, prefijo = `SEP + q in haystack`
+        self._haystacks: List[str] = [self.SEPARATOR + self.SEPARATOR.join(keys) for keys in self._row_keys]
+
+        pairs = sorted((key, row) for row, keys in enumerate(self._row_keys) for key in keys)
+        self._sorted_keys: List[str] = [key for key, _ in pairs]
+        self._sorted_rows: List[int] = [row for _, row in pairs]
+
+        self._ngrams: Dict[str, Set[int]] = {}
+        for row, keys in enumerate(self._row_keys):
+            for key in keys:
+                for size in range(1, self.NGRAM_SIZE + 1):
+                    for start in range(len(key) - size + 1):
+                        self._ngrams.setdefault(key[start:start + size], set()).add(row)
+
+        # Filas ya ordenadas para cada prefijo "pesado"
+        self._top_by_prefix: Dict[str, List[int]] = {}
+        self._index_heavy_prefixes()
+
+    def _index_heavy_prefixes(self) -> None:
+        """Precalcula el top-K de los prefijos que abarcan más de PREFIX_SCAN_LIMIT claves
+
+        Se refina por longitud: solo los rangos pesados de longitud L se
+        subdividen en prefijos de longitud L + 1. En cada longitud los
+        rangos son disjuntos, así que el costo es O(N) por nivel.
+        """
+        keys = self._sorted_keys
+        heavy = [(0, len(keys))]
+        length = 1
+        while heavy:
+            next_heavy = []
+            for low, high in heavy:
+                position = low
+                while position < high:
+                    if len(keys[position]) < length:
+                        position += 1
+                        continue
+                    prefix = keys[position][:length]
+                    end = bisect_left(keys, prefix + self.MAX_CHAR, position, high)
+                    if end - position > self.PREFIX_SCAN_LIMIT:
+                        rows = set(self._sorted_rows[position:end])
+                        self._top_by_prefix[prefix] = self._rank(rows, prefix, self.TOP_K)
+                        next_heavy.append((position, end))
+                    position = end
+            heavy = next_heavy
+            length += 1
+
+    @classmethod
+    def from_table(cls, table: CityTable) -> "CitySearchIndex":
+        """Construye el índice a partir de la tabla columnar del dataset"""
+        return cls(table.column("city"), table.column("city_ascii"), table.population.tolist())
+
+    @staticmethod
+    def fold(text: str) -> str:
+        """Normaliza un texto para comparar: sin acentos y en minúsculas
+
+        Ejemplo: "San José" -> "san jose"
+        """
+        decomposed = unicodedata.normalize("NFKD", text)
+        return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+    def autocomplete(self, prefix: str, limit: int = 10, offset: int = 0) -> List[int]:
+        """
+        Ciudades cuyo nombre empieza por `prefix`
+
+        Args:
+            prefix: Texto escrito por el usuario
+            limit: Máximo de resultados
+            offset: Resultados a saltar (paginación)
+
+        Returns:
+            Filas ordenadas (exactas primero, luego por población)
+        """
+        folded = self.fold(prefix)
+        wanted = offset + limit
+        if not folded:
+            return []
+
+        top = self._top_by_prefix.get(folded)
+        if top is not None and wanted <= self.TOP_K:
+            return top[offset:wanted]
+        # Prefijo liviano (como máximo PREFIX_SCAN_LIMIT claves) o paginación profunda
+        return self._rank(self._prefix_rows(folded), folded, wanted)[offset:]
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0) -> List[int]:
+        """
+        Ciudades cuyo nombre contiene `query`
+
+        Args:
+            query: Texto a buscar en cualquier posición del nombre
+            limit: Máximo de resultados (None = todos)
+            offset: Resultados a saltar (paginación)
+
+        Returns:
+            Filas ordenadas: exactas, prefijo y subcadena; luego por población
+        """
+        folded = self.fold(query)
+        if not folded:
+            rows: Iterable[int] = range(len(self._row_keys))
+        elif len(folded) <= self.NGRAM_SIZE:
+            # El n-grama completo está indexado: no hace falta verificar
+            rows = self._ngrams.get(folded, ())
+        else:
+            rows = self._substring_rows(folded)
+
+        wanted = None if limit is None else offset + limit
+        ranked = self._rank(rows, folded, wanted)
+        return ranked[offset:]
+
+    def _prefix_rows(self, prefix: str) -> Set[int]:
+        """Filas con alguna clave que empieza por `prefix` (rango contiguo de la lista ordenada)"""
+        keys = self._sorted_keys
+        low = bisect_left(keys, prefix)
+        high = bisect_left(keys, prefix + self.MAX_CHAR, low)
+        return set(self._sorted_rows[low:high])
+
+    def _substring_rows(self, query: str) -> List[int]:
+        """Filas que contienen `query`: intersección de trigramas y verificación"""
+        size = self.NGRAM_SIZE
+        postings = []
+        for start in range(len(query) - size + 1):
+            posting = self._ngrams.get(query[start:start + size])
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+        haystacks = self._haystacks
+        return [row for row in candidates if query in haystacks[row]]
+
+    def _rank(self, rows: Iterable[int], query: str, limit: Optional[int]) -> List[int]:
+        """Ordena filas por tipo de coincidencia y población; solo las `limit` primeras si se indica"""
+        row_keys, haystacks, population = self._row_keys, self._haystacks, self._population
+        exact, prefix, substring = self.EXACT, self.PREFIX, self.SUBSTRING
+        marked = self.SEPARATOR + query
+
+        def rank_key(row: int) -> Tuple[int, int, int]:
+            if query in row_keys[row]:
+                match = exact
+            elif marked in haystacks[row]:
+                match = prefix
+            else:
+                match = substring
+            return match, -population[row], row
+
+        if limit is None:
+            return sorted(rows, key=rank_key)
+        return heapq.nsmallest(limit, rows, key=rank_key)
@@ -0,0 +1,96 @@
+"""
+Índice espacial de ciudades para consultas de vecino más cercano y por radio
+"""
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from graphmap.domain.model.entities.geo_utils import GeoUtils
+
+
+class CitySpatialIndex:
+    """k-d tree (SciPy cKDTree) sobre vectores unitarios 3D de las ciudades
+
+    En la esfera unitaria la cuerda entre dos puntos es 2 sin(d / 2R), una
+    función monótona de la distancia sobre la superficie: los k vecinos
+    por cuerda son exactamente los k más cercanos por Haversine, y un radio
+    en km se traduce a un radio de cuerda sin aproximaciones. Las distancias
+    devueltas se recalculan con Haversine.
+
+    Attributes:
+        rows: Fila (índice en el arreglo original) de cada punto indexado
+    """
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, rows: np.ndarray = None):
+        """
+        Construye el índice
+
+        Args:
+            lat: Latitudes en grados
+            lng: Longitudes en grados
+            rows: Fila que representa cada punto (por defecto 0..n-1)
+        """
+        # Lazy import para reducir el tiempo de import de la app en serverless.
+        from scipy.spatial import cKDTree
+
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.rows = np.arange(len(self.lat)) if rows is None else np.asarray(rows)
+        self._tree = cKDTree(GeoUtils.lat_lon_to_unit_vector_array(self.lat, self.lng))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        Los k puntos más cercanos a una coordenada
+
+        Args:
+            lat: Latitud en grados
+            lng: Longitud en grados
+            k: Número de vecinos
+
+        Returns:
+            Lista de (fila, distancia en km) ordenada por distancia
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        _, positions = self._tree.query(GeoUtils.lat_lon_to_unit_vector_array([lat], [lng])[0], k=k)
+        return self._refine(lat, lng, np.atleast_1d(positions))
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[int, float]]:
+        """
+        Todos los puntos a distancia <= radius_km de una coordenada
+
+        Args:
+            lat: Latitud en grados
+            lng: Longitud en grados
+            radius_km: Radio en kilómetros
+
+        Returns:
+            Lista de (fila, distancia en km) ordenada por distancia
+        """
+        if radius_km < 0:
+            return []
+        # Ángulo central del radio (acotado a media vuelta) -> longitud de cuerda
+        angle = min(radius_km / GeoUtils.EARTH_RADIUS_KM, math.pi)
+        chord = 2 * math.sin(angle / 2)
+        # Margen mínimo por redondeo; el filtro exacto es el de Haversine
+        positions = self._tree.query_ball_point(
+            GeoUtils.lat_lon_to_unit_vector_array([lat], [lng])[0], r=chord * (1 + 1e-9) + 1e-12
+        )
+        matches = self._refine(lat, lng, np.asarray(positions, dtype=np.int64))
+        return [(row, distance) for row, distance in matches if distance <= radius_km]
+
+    def _refine(self, lat: float, lng: float, positions: np.ndarray) -> List[Tuple[int, float]]:
+        """Calcula la distancia Haversine exacta de cada candidato y ordena"""
+        if len(positions) == 0:
+            return []
+        distances = GeoUtils.haversine_distance_array(
+            np.full(len(positions), lat), np.full(len(positions), lng),
+            self.lat[positions], self.lng[positions],
+        )
+        order = np.argsort(distances, kind="stable")
+        return list(zip(self.rows[positions[order]].tolist(), distances[order].tolist()))
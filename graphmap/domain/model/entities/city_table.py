@@ -0,0 +1,188 @@
+"""
+Representación columnar (struct-of-arrays) del dataset de ciudades
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from graphmap.domain.model.entities.city import City
+from graphmap.domain.model.entities.city_record import CityRecord
+
+
+class CityTable:
+    """Columnas del dataset de ciudades con tabla de strings internados
+
+    Las columnas numéricas son arrays NumPy alineados por índice de fila.
+    Las columnas de texto se guardan como códigos int32 que apuntan a una
+    única tabla de strings sin duplicados (muchos valores se repiten:
+    país, estado, capital...).
+
+    Es la representación interna del dataset: las filas se materializan
+    como `CityRecord` (o `City`) solo cuando un resultado sale por la API.
+    """
+
+    STRING_COLUMNS = ("city", "city_ascii", "country", "iso2", "iso3", "admin_name", "capital")
+    # Valor centinela para population=None en la columna int64
+    MISSING_POPULATION = -1
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        lat: np.ndarray,
+        lng: np.ndarray,
+        population: np.ndarray,
+        string_codes: Dict[str, np.ndarray],
+        strings: List[str],
+    ):
+        self.ids = ids
+        self.lat = lat
+        self.lng = lng
+        self.population = population
+        self.string_codes = string_codes
+        self.strings = strings
+        # ID de ciudad -> fila, construido en el primer uso
+        self._row_index: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_cities(cls, cities: List[City]) -> "CityTable":
+        """Construye la tabla columnar a partir de entidades City
+
+        Args:
+            cities: Lista de ciudades en el orden del dataset
+
+        Returns:
+            CityTable con las mismas filas
+        """
+        interned: Dict[str, int] = {}
+        strings: List[str] = []
+
+        def intern(value: str) -> int:
+            code = interned.get(value)
+            if code is None:
+                code = interned[value] = len(strings)
+                strings.append(value)
+            return code
+
+        string_codes = {
+            name: np.fromiter((intern(getattr(c, name)) for c in cities), dtype=np.int32, count=len(cities))
+            for name in cls.STRING_COLUMNS
+        }
+
+        return cls(
+            ids=np.fromiter((c.id for c in cities), dtype=np.int64, count=len(cities)),
+            lat=np.fromiter((c.lat for c in cities), dtype=np.float64, count=len(cities)),
+            lng=np.fromiter((c.lng for c in cities), dtype=np.float64, count=len(cities)),
+            population=np.fromiter(
+                (c.population if c.population is not None else cls.MISSING_POPULATION for c in cities),
+                dtype=np.int64,
+                count=len(cities),
+            ),
+            string_codes=string_codes,
+            strings=strings,
+        )
+
+    @property
+    def row_index(self) -> Dict[int, int]:
+        """Mapeo ID de ciudad -> fila (se construye una sola vez)"""
+        if self._row_index is None:
+            self._row_index = {city_id: row for row, city_id in enumerate(self.ids.tolist())}
+        return self._row_index
+
+    def row_of(self, city_id: int) -> Optional[int]:
+        """Fila de una ciudad por su ID, o None si no está en el dataset"""
+        return self.row_index.get(city_id)
+
+    def records(self, rows: Optional[Sequence[int]] = None) -> List[CityRecord]:
+        """Materializa filas como CityRecord, decodificando solo las filas pedidas
+
+        Args:
+            rows: Filas a materializar, en el orden deseado (None = todas)
+
+        Returns:
+            Lista de CityRecord alineada con `rows`
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        strings = self.strings
+        text = [[strings[code] for code in self.string_codes[name][rows].tolist()] for name in self.STRING_COLUMNS]
+        city, city_ascii, country, iso2, iso3, admin_name, capital = text
+        missing = self.MISSING_POPULATION
+        population = [value if value != missing else None for value in self.population[rows].tolist()]
+        return list(map(
+            CityRecord, city, city_ascii, self.lat[rows].tolist(), self.lng[rows].tolist(), country,
+            iso2, iso3, admin_name, capital, population, self.ids[rows].tolist(),
+        ))
+
+    def to_dicts(self, rows: Optional[Sequence[int]] = None) -> List[Dict]:
+        """Filas como dicts con el esquema de `City`, listos para serializar a JSON
+
+        Se arman directamente desde las columnas, sin objetos intermedios
+        por fila.
+
+        Args:
+            rows: Filas a convertir, en el orden deseado (None = todas)
+
+        Returns:
+            Lista de dicts alineada con `rows`, mismo formato que `City.model_dump()`
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        strings = self.strings
+        text = [[strings[code] for code in self.string_codes[name][rows].tolist()] for name in self.STRING_COLUMNS]
+        city, city_ascii, country, iso2, iso3, admin_name, capital = text
+        missing = self.MISSING_POPULATION
+        population = [value if value != missing else None for value in self.population[rows].tolist()]
+        return [
+            {"city": c, "city_ascii": a, "lat": la, "lng": ln, "country": co, "iso2": i2, "iso3": i3,
+             "admin_name": ad, "capital": ca, "population": po, "id": ci}
+            for c, a, la, ln, co, i2, i3, ad, ca, po, ci in zip(
+                city, city_ascii, self.lat[rows].tolist(), self.lng[rows].tolist(), country,
+                iso2, iso3, admin_name, capital, population, self.ids[rows].tolist(),
+            )
+        ]
+
+    def column(self, name: str) -> List[str]:
+        """Decodifica una columna de texto completa
+
+        Args:
+            name: Nombre de la columna (uno de STRING_COLUMNS)
+
+        Returns:
+            Lista de strings alineada por fila
+        """
+        strings = self.strings
+        return [strings[code] for code in self.string_codes[name].tolist()]
+
+    def to_cities(self) -> List[City]:
+        """Materializa las filas como entidades City
+
+        Los datos ya fueron validados al compilar la tabla, por lo que se usa
+        `model_construct` para evitar la validación de pydantic por fila.
+
+        Returns:
+            Lista de City en el orden de la tabla
+        """
+        text = {name: self.column(name) for name in self.STRING_COLUMNS}
+        ids = self.ids.tolist()
+        lat = self.lat.tolist()
+        lng = self.lng.tolist()
+        population = self.population.tolist()
+        missing = self.MISSING_POPULATION
+
+        return [
+            City.model_construct(
+                city=text["city"][i],
+                city_ascii=text["city_ascii"][i],
+                lat=lat[i],
+                lng=lng[i],
+                country=text["country"][i],
+                iso2=text["iso2"][i],
+                iso3=text["iso3"][i],
+                admin_name=text["admin_name"][i],
+                capital=text["capital"][i],
+                population=population[i] if population[i] != missing else None,
+                id=ids[i],
+            )
+            for i in range(len(ids))
+        ]
@@ -0,0 +1,164 @@
+"""
+Entidad que representa un índice de Contraction Hierarchies (CH) sobre el grafo
+"""
+import heapq
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class ContractionHierarchy:
+    """Grafo "hacia arriba" de una Contraction Hierarchy en formato CSR
+
+    Cada nodo tiene un `rank` (orden de contracción). Para cada nodo v se
+    guardan solo sus aristas hacia vecinos de mayor rank, tanto originales
+    como atajos (shortcuts). Un atajo u-w creado al contraer v guarda
+    `mid = v` para poder desempaquetarlo; las aristas originales usan -1.
+
+    Una consulta es un Dijkstra bidireccional que solo sube de rank desde
+    el origen y desde el destino (el grafo es no dirigido), con
+    stall-on-demand para podar nodos alcanzados por caminos subóptimos.
+
+    Attributes:
+        rank: Orden de contracción de cada nodo, shape (V,)
+        up_indptr: Offsets CSR del grafo hacia arriba, shape (V + 1,)
+        up_indices: Vecino de mayor rank de cada arista
+        up_weights: Peso de cada arista (km)
+        up_mid: Nodo intermedio del atajo, o -1 si es una arista original
+    """
+
+    def __init__(self, rank: np.ndarray, up_indptr: np.ndarray, up_indices: np.ndarray,
+                 up_weights: np.ndarray, up_mid: np.ndarray):
+        self.rank = rank
+        self.up_indptr = up_indptr
+        self.up_indices = up_indices
+        self.up_weights = up_weights
+        self.up_mid = up_mid
+
+        # Listas Python para el acceso escalar durante las consultas
+        self._rank: List[int] = rank.tolist()
+        self._indptr: List[int] = up_indptr.tolist()
+        self._indices: List[int] = up_indices.tolist()
+        self._weights: List[float] = up_weights.tolist()
+        self._mid: List[int] = up_mid.tolist()
+
+    def num_shortcuts(self) -> int:
+        """Retorna el número de atajos agregados durante la contracción"""
+        return int(np.count_nonzero(self.up_mid >= 0))
+
+    def query(self, source: int, target: int) -> Optional[Tuple[float, List[int], int]]:
+        """Búsqueda bidireccional ascendente entre dos nodos
+
+        Args:
+            source: Índice denso del origen
+            target: Índice denso del destino
+
+        Returns:
+            Tupla (distancia, camino de índices densos, nodos asentados),
+            o None si no existe camino
+        """
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        heappush, heappop = heapq.heappush, heapq.heappop
+        inf = math.inf
+
+        dist_f, dist_b = {source: 0.0}, {target: 0.0}
+        parent_f, parent_b = {source: -1}, {target: -1}
+        heap_f, heap_b = [(0.0, source)], [(0.0, target)]
+        best, meeting, settled = inf, -1, 0
+
+        while heap_f or heap_b:
+            # Avanzar la dirección con la menor clave pendiente
+            key_f = heap_f[0][0] if heap_f else inf
+            key_b = heap_b[0][0] if heap_b else inf
+            if key_f <= key_b:
+                if key_f >= best:
+                    break
+                heap, own, other, parent = heap_f, dist_f, dist_b, parent_f
+            else:
+                if key_b >= best:
+                    break
+                heap, own, other, parent = heap_b, dist_b, dist_f, parent_b
+
+            d, node = heappop(heap)
+            if d > own[node]:
+                continue
+            settled += 1
+
+            meet = other.get(node)
+            if meet is not None and d + meet < best:
+                best, meeting = d + meet, node
+
+            # Stall-on-demand: si un vecino de mayor rank ya alcanzado ofrece
+            # un camino más corto hasta este nodo, no vale la pena expandirlo
+            start, end = indptr[node], indptr[node + 1]
+            stalled = False
+            for k in range(start, end):
+                reached = own.get(indices[k])
+                if reached is not None and reached + weights[k] < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            for k in range(start, end):
+                neighbor = indices[k]
+                candidate = d + weights[k]
+                if candidate < own.get(neighbor, inf):
+                    own[neighbor] = candidate
+                    parent[neighbor] = node
+                    heappush(heap, (candidate, neighbor))
+
+        if meeting == -1:
+            return None
+
+        # Camino en el grafo con atajos: source -> meeting -> target
+        forward = []
+        node = meeting
+        while node != -1:
+            forward.append(node)
+            node = parent_f[node]
+        forward.reverse()
+        node = parent_b[meeting]
+        while node != -1:
+            forward.append(node)
+            node = parent_b[node]
+
+        path, distance = self._unpack(forward)
+        return distance, path, settled
+
+    def _edge(self, u: int, v: int) -> Tuple[float, int]:
+        """Retorna (peso, mid) de la arista u-v, buscándola en el nodo de menor rank"""
+        low, high = (u, v) if self._rank[u] < self._rank[v] else (v, u)
+        for k in range(self._indptr[low], self._indptr[low + 1]):
+            if self._indices[k] == high:
+                return self._weights[k], self._mid[k]
+        raise KeyError((u, v))
+
+    def _unpack(self, nodes: List[int]) -> Tuple[List[int], float]:
+        """Expande los atajos de un camino y recalcula su distancia
+
+        La distancia se suma sobre las aristas originales en orden
+        origen -> destino, igual que lo haría A* sobre el mismo camino.
+
+        Args:
+            nodes: Camino de índices densos que puede contener atajos
+
+        Returns:
+            Tupla (camino solo con aristas originales, distancia total)
+        """
+        path = [nodes[0]]
+        distance = 0.0
+        for u, v in zip(nodes, nodes[1:]):
+            # Pila de aristas por expandir; se procesa de izquierda a derecha
+            stack = [(u, v)]
+            while stack:
+                a, b = stack.pop()
+                weight, mid = self._edge(a, b)
+                if mid == -1:
+                    path.append(b)
+                    distance += weight
+                else:
+                    stack.append((mid, b))
+                    stack.append((a, mid))
+        return path, distance
@@ -0,0 +1,169 @@
+"""
+Entidad que representa un grafo no dirigido inmutable en formato CSR
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class CSRCityGraph:
+    """Grafo no dirigido de ciudades almacenado en arrays contiguos (CSR)
+
+    Misma API de consulta que CityGraph (`get_neighbors`, `get_edges`,
+    `num_nodes`, `num_edges`), pero sin objetos Python por arista:
+
+    - node_ids: IDs de ciudad ordenados; la posición es el índice denso del nodo
+    - indptr:   offsets; los vecinos del nodo i están en [indptr[i], indptr[i + 1])
+    - indices:  índice denso de cada vecino (int32)
+    - weights:  distancia en km de cada arista dirigida (float32)
+    - components: componente conexa de cada nodo (int32)
+
+    Cada arista no dirigida aparece dos veces (u -> v y v -> u).
+    """
+
+    def __init__(self, node_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 components: Optional[np.ndarray] = None):
+        """
+        Args:
+            node_ids, indptr, indices, weights: Arrays CSR del grafo
+            components: Etiqueta de componente de cada nodo (None = calcularla,
+                        ej: al construir el grafo; el artefacto ya la trae)
+        """
+        self.node_ids = node_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        # Sin auto-lazos, cada arista no dirigida ocupa dos entradas
+        self._num_edges = len(indices) // 2
+        # El filtro de distancia deja islas (Hawaii, Alaska...): dos nodos con
+        # etiquetas distintas no tienen camino, y eso se sabe sin buscarlo
+        self.components = components if components is not None else self._label_components()
+
+    @classmethod
+    def from_edges(cls, u_ids: np.ndarray, v_ids: np.ndarray, weights: np.ndarray) -> "CSRCityGraph":
+        """Construye el grafo a partir de aristas no dirigidas únicas
+
+        Args:
+            u_ids: IDs del primer nodo de cada arista
+            v_ids: IDs del segundo nodo de cada arista
+            weights: Distancia de cada arista
+
+        Returns:
+            CSRCityGraph con los nodos que tienen al menos una arista
+        """
+        u_ids = np.asarray(u_ids, dtype=np.int64)
+        v_ids = np.asarray(v_ids, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+
+        node_ids = np.unique(np.concatenate((u_ids, v_ids)))
+        u_idx = np.searchsorted(node_ids, u_ids)
+        v_idx = np.searchsorted(node_ids, v_ids)
+
+        # Duplicar cada arista en ambas direcciones y agrupar por origen
+        src = np.concatenate((u_idx, v_idx))
+        dst = np.concatenate((v_idx, u_idx))
+        w = np.concatenate((weights, weights))
+        order = np.lexsort((dst, src))
+
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(node_ids)), out=indptr[1:])
+
+        return cls(node_ids, indptr, dst[order].astype(np.int32), w[order])
+
+    @classmethod
+    def from_city_graph(cls, graph) -> "CSRCityGraph":
+        """Convierte un CityGraph (lista de adyacencia) a CSR
+
+        Args:
+            graph: CityGraph a convertir
+
+        Returns:
+            CSRCityGraph equivalente
+        """
+        node_ids, indptr, indices, weights = graph.to_csr()
+        return cls(node_ids, indptr, indices, weights.astype(np.float32))
+
+    def _label_components(self) -> np.ndarray:
+        """Etiqueta las componentes conexas con scipy.sparse.csgraph (O(V + E))"""
+        # Lazy imports para reducir el tiempo de import de la app en serverless.
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        n = len(self.node_ids)
+        if n == 0:
+            return np.empty(0, dtype=np.int32)
+        matrix = csr_matrix((self.weights, self.indices, self.indptr), shape=(n, n))
+        _, labels = connected_components(matrix, directed=False)
+        return labels.astype(np.int32)
+
+    def num_components(self) -> int:
+        """Retorna el número de componentes conexas"""
+        return int(self.components.max()) + 1 if len(self.components) else 0
+
+    def to_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Retorna los arrays CSR (node_ids, indptr, indices, weights)"""
+        return self.node_ids, self.indptr, self.indices, self.weights
+
+    def index_of(self, node: int) -> Optional[int]:
+        """Retorna el índice denso de un nodo, o None si no está en el grafo
+
+        Complejidad: O(log V) - búsqueda binaria sobre node_ids ordenados
+        """
+        i = int(np.searchsorted(self.node_ids, node))
+        if i < len(self.node_ids) and self.node_ids[i] == node:
+            return i
+        return None
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Retorna las aristas no dirigidas como arrays de índices densos (u < v)
+
+        Returns:
+            Tupla (u_idx, v_idx, weights)
+        """
+        src = np.repeat(np.arange(len(self.node_ids), dtype=np.int32), np.diff(self.indptr))
+        mask = src < self.indices
+        return src[mask], self.indices[mask], self.weights[mask]
+
+    def get_edges(self) -> List[Tuple[int, int, float]]:
+        """Retorna lista de aristas (u, v, distancia) sin duplicados
+
+        Returns:
+            Lista de tuplas (nodo_origen, nodo_destino, distancia)
+        """
+        u_idx, v_idx, weights = self.edge_arrays()
+        return list(zip(
+            self.node_ids[u_idx].tolist(),
+            self.node_ids[v_idx].tolist(),
+            weights.tolist(),
+        ))
+
+    def get_neighbors(self, node: int) -> List[Tuple[int, float]]:
+        """Retorna los vecinos de un nodo con sus distancias
+
+        Args:
+            node: ID del nodo
+
+        Returns:
+            Lista de tuplas (vecino, distancia)
+        """
+        i = self.index_of(node)
+        if i is None:
+            return []
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return list(zip(
+            self.node_ids[self.indices[start:end]].tolist(),
+            self.weights[start:end].tolist(),
+        ))
+
+    def num_nodes(self) -> int:
+        """Retorna el número de nodos en el grafo"""
+        return len(self.node_ids)
+
+    def num_edges(self) -> int:
+        """Retorna el número de aristas en el grafo"""
+        return self._num_edges
+
+    def nbytes(self) -> int:
+        """Retorna la memoria ocupada por los arrays del grafo (bytes)"""
+        return (self.node_ids.nbytes + self.indptr.nbytes + self.indices.nbytes
+                + self.weights.nbytes + self.components.nbytes)
@@ -33,6 +33,21 @@ class GeoUtils:
 
         return (x, y)
 
+    @staticmethod
+    def mercator_to_lat_lon(x: float, y: float) -> Tuple[float, float]:
+        """Inversa de `lat_lon_to_mercator`: coordenadas Web Mercator a (lat, lon)
+
+        Args:
+            x: Coordenada x Web Mercator
+            y: Coordenada y Web Mercator
+
+        Returns:
+            Tupla (lat, lon) en grados
+        """
+        lon = x * 180.0 / GeoUtils.MERCATOR_RANGE
+        lat = np.degrees(2 * np.arctan(np.exp(y * np.pi / GeoUtils.MERCATOR_RANGE)) - np.pi / 2)
+        return (lat, lon)
+
     @staticmethod
     def haversine_distance(lat1: float, lon1: float,
                           lat2: float, lon2: float) -> float:
@@ -59,4 +74,54 @@ class GeoUtils:
         a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
         c = 2 * np.arcsin(np.sqrt(a))
 
-        return GeoUtils.EARTH_RADIUS_KM * c
\ No newline at end of file
+        return GeoUtils.EARTH_RADIUS_KM * c
+
+    @staticmethod
+    def lat_lon_to_mercator_array(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Versión vectorizada de `lat_lon_to_mercator` para arrays de coordenadas
+
+        Args:
+            lat: Array de latitudes en grados
+            lon: Array de longitudes en grados
+
+        Returns:
+            Array (n, 2) con columnas (x, y) en coordenadas Web Mercator
+        """
+        x, y = GeoUtils.lat_lon_to_mercator(np.asarray(lat, dtype=np.float64),
+                                            np.asarray(lon, dtype=np.float64))
+        return np.column_stack((x, y))
+
+    @staticmethod
+    def haversine_distance_array(lat1: np.ndarray, lon1: np.ndarray,
+                                 lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+        """Versión vectorizada de `haversine_distance`: una distancia por elemento
+
+        Args:
+            lat1, lon1: Arrays con coordenadas de los puntos de origen (grados)
+            lat2, lon2: Arrays con coordenadas de los puntos de destino (grados)
+
+        Returns:
+            Array de distancias en kilómetros
+        """
+        return GeoUtils.haversine_distance(np.asarray(lat1, dtype=np.float64), np.asarray(lon1, dtype=np.float64),
+                                           np.asarray(lat2, dtype=np.float64), np.asarray(lon2, dtype=np.float64))
+
+    @staticmethod
+    def lat_lon_to_unit_vector_array(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Convierte coordenadas geográficas a vectores unitarios 3D (esfera de radio 1)
+
+        La distancia euclidiana (cuerda) entre dos vectores es monótona con
+        la distancia sobre la esfera, lo que permite usar índices espaciales
+        euclidianos (k-d tree) sin distorsión cerca de los polos o del antimeridiano.
+
+        Args:
+            lat: Array de latitudes en grados
+            lon: Array de longitudes en grados
+
+        Returns:
+            Array (n, 3) con columnas (x, y, z)
+        """
+        lat_rad = np.radians(np.asarray(lat, dtype=np.float64))
+        lon_rad = np.radians(np.asarray(lon, dtype=np.float64))
+        cos_lat = np.cos(lat_rad)
+        return np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
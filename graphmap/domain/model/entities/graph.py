@@ -3,6 +3,8 @@ Entidad que representa un grafo no dirigido con lista de adyacencia
 """
 from typing import List, Tuple, Dict, Set
 
+import numpy as np
+
 
 class CityGraph:
     """Grafo no dirigido que representa conexiones entre ciudades por proximidad"""
@@ -10,10 +12,16 @@ class CityGraph:
     def __init__(self):
         # Lista de adyacencia: {nodo: [(vecino, distancia), ...]}
         self.adj_list: Dict[int, List[Tuple[int, float]]] = {}
+        # Conjunto de vecinos por nodo: verificación de duplicados en O(1)
+        self._neighbor_sets: Dict[int, Set[int]] = {}
+        # Contador de aristas no dirigidas (evita recorrer el grafo en num_edges)
+        self._num_edges = 0
 
     def add_edge(self, u: int, v: int, weight: float):
         """Agrega arista bidireccional entre dos nodos con peso (distancia)
 
+        Complejidad: O(1) amortizado
+
         Args:
             u: ID del primer nodo
             v: ID del segundo nodo
@@ -21,14 +29,21 @@ class CityGraph:
         """
         if u not in self.adj_list:
             self.adj_list[u] = []
+            self._neighbor_sets[u] = set()
         if v not in self.adj_list:
             self.adj_list[v] = []
+            self._neighbor_sets[v] = set()
 
-        # Evitar duplicados
-        if not any(vec == v for vec, _ in self.adj_list[u]):
-            self.adj_list[u].append((v, weight))
-        if not any(vec == u for vec, _ in self.adj_list[v]):
+        # Evitar duplicados (el grafo es no dirigido: basta revisar u -> v)
+        if v in self._neighbor_sets[u]:
+            return
+
+        self.adj_list[u].append((v, weight))
+        self._neighbor_sets[u].add(v)
+        if u != v:
             self.adj_list[v].append((u, weight))
+            self._neighbor_sets[v].add(u)
+        self._num_edges += 1
 
     def get_edges(self) -> List[Tuple[int, int, float]]:
         """Retorna lista de aristas (u, v, distancia) sin duplicados
@@ -65,5 +80,54 @@ class CityGraph:
         return len(self.adj_list)
 
     def num_edges(self) -> int:
-        """Retorna el número de aristas en el grafo"""
-        return len(self.get_edges())
\ No newline at end of file
+        """Retorna el número de aristas en el grafo (O(1), contador mantenido al insertar)"""
+        return self._num_edges
+
+    def to_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Exporta el grafo en formato CSR (Compressed Sparse Row)
+
+        Los nodos se ordenan por ID y se les asigna un índice denso;
+        los vecinos del nodo i son indices[indptr[i]:indptr[i + 1]].
+
+        Returns:
+            Tupla (node_ids, indptr, indices, weights)
+        """
+        node_ids = np.array(sorted(self.adj_list), dtype=np.int64)
+        index = {node: i for i, node in enumerate(node_ids.tolist())}
+
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        neighbors: List[int] = []
+        weights: List[float] = []
+        for i, node in enumerate(node_ids.tolist()):
+            for v, dist in self.adj_list[node]:
+                neighbors.append(index[v])
+                weights.append(dist)
+            indptr[i + 1] = len(neighbors)
+
+        return (
+            node_ids,
+            indptr,
+            np.array(neighbors, dtype=np.int32),
+            np.array(weights, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_csr(cls, node_ids: np.ndarray, indptr: np.ndarray,
+                 indices: np.ndarray, weights: np.ndarray) -> "CityGraph":
+        """Reconstruye el grafo a partir de arrays CSR (ver `to_csr`)
+
+        Returns:
+            CityGraph equivalente
+        """
+        graph = cls()
+        ids = node_ids.tolist()
+        neighbor_ids = np.asarray(node_ids)[indices].tolist()
+        weight_list = np.asarray(weights).tolist()
+        offsets = indptr.tolist()
+
+        for i, node in enumerate(ids):
+            start, end = offsets[i], offsets[i + 1]
+            graph.adj_list[node] = list(zip(neighbor_ids[start:end], weight_list[start:end]))
+            graph._neighbor_sets[node] = set(neighbor_ids[start:end])
+        graph._num_edges = (len(neighbor_ids) + sum(u in graph._neighbor_sets[u] for u in ids)) // 2
+        return graph
@@ -0,0 +1,41 @@
+"""
+Entidad con las tablas de distancias desde landmarks (heurística ALT)
+"""
+import numpy as np
+
+
+class LandmarkTable:
+    """Distancias precomputadas de k landmarks a todos los nodos del grafo
+
+    Por la desigualdad triangular, para cualquier landmark L:
+        d(v, t) >= |d(L, t) - d(L, v)|
+    lo que da una cota inferior admisible para A* (ALT = A*, Landmarks, Triangle).
+
+    Attributes:
+        landmarks: Índices densos (del CSRCityGraph) de los landmarks, shape (k,)
+        distances: Distancias en km desde cada landmark, shape (k, V); inf = inalcanzable
+    """
+
+    def __init__(self, landmarks: np.ndarray, distances: np.ndarray):
+        self.landmarks = landmarks
+        self.distances = distances
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    def lower_bounds_to(self, goal: int) -> np.ndarray:
+        """Cota inferior de la distancia de cada nodo hasta `goal`
+
+        Args:
+            goal: Índice denso del nodo objetivo
+
+        Returns:
+            Array (V,) con max_L |d(L, goal) - d(L, v)|; inf si v no puede alcanzar goal
+        """
+        if len(self.landmarks) == 0:
+            return np.zeros(self.distances.shape[1])
+        with np.errstate(invalid="ignore"):
+            bounds = np.abs(self.distances - self.distances[:, goal:goal + 1])
+        # inf - inf: el landmark no alcanza ni v ni goal, no aporta información
+        bounds[np.isnan(bounds)] = 0.0
+        return bounds.max(axis=0)
@@ -0,0 +1,153 @@
+"""
+Índice de grilla para consultas por viewport (bounding box) y nivel de detalle
+"""
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# (min_lat, min_lng, max_lat, max_lng) en grados; min_lng > max_lng cruza el antimeridiano
+BoundingBox = Tuple[float, float, float, float]
+
+
+class GridIndex:
+    """Grilla uniforme lat/lng con los puntos agrupados por celda (formato CSR)
+
+    Las celdas se numeran por banda de latitud y, dentro de cada banda, por
+    columna de longitud. Así las celdas de una banda que cubren un rango de
+    longitudes son contiguas y un bounding box se resuelve con un slice por
+    banda, sin recorrer puntos fuera de la vista.
+    """
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, rows: np.ndarray, cell_degrees: float):
+        """
+        Args:
+            lat: Latitud de cada punto
+            lng: Longitud de cada punto
+            rows: Fila (en la tabla de ciudades) de cada punto
+            cell_degrees: Tamaño de celda en grados
+        """
+        self.cell_degrees = cell_degrees
+        self.num_columns = int(math.ceil(360.0 / cell_degrees))
+        self.num_bands = int(math.ceil(180.0 / cell_degrees))
+
+        cells = self._band(lat) * self.num_columns + self._column(lng)
+        order = np.argsort(cells, kind="stable")
+        self.rows = rows[order]
+        self.lat = lat[order]
+        self.lng = lng[order]
+        self.indptr = np.zeros(self.num_bands * self.num_columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.num_bands * self.num_columns), out=self.indptr[1:])
+
+    def _band(self, lat):
+        return np.clip(((np.asarray(lat) + 90.0) // self.cell_degrees).astype(np.int64), 0, self.num_bands - 1)
+
+    def _column(self, lng):
+        return np.clip(((np.asarray(lng) + 180.0) // self.cell_degrees).astype(np.int64), 0, self.num_columns - 1)
+
+    def query(self, bbox: BoundingBox) -> np.ndarray:
+        """
+        Filas de los puntos dentro del bounding box
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng)
+
+        Returns:
+            Array de filas (sin orden particular)
+        """
+        min_lat, min_lng, max_lat, max_lng = bbox
+        if min_lng > max_lng:
+            # Cruza el antimeridiano: dos rangos de longitud
+            return np.concatenate((self.query((min_lat, min_lng, max_lat, 180.0)),
+                                   self.query((min_lat, -180.0, max_lat, max_lng))))
+
+        first_band, last_band = int(self._band(min_lat)), int(self._band(max_lat))
+        first_column, last_column = int(self._column(min_lng)), int(self._column(max_lng))
+        slices = [
+            np.arange(self.indptr[band * self.num_columns + first_column],
+                      self.indptr[band * self.num_columns + last_column + 1])
+            for band in range(first_band, last_band + 1)
+        ]
+        positions = np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+        # Las celdas del borde pueden contener puntos fuera del bbox
+        lat, lng = self.lat[positions], self.lng[positions]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)
+        return self.rows[positions[inside]]
+
+
+class ViewportIndex:
+    """Consultas de ciudades por viewport con nivel de detalle según zoom
+
+    Con zoom (escala de mapas web: 0 = mundo entero en un tile de 256 px)
+    se divide el mundo en celdas de LOD_CELL_PIXELS píxeles y se conserva
+    la ciudad más poblada de cada celda, de modo que la cantidad de
+    ciudades devueltas depende de lo que cabe en pantalla y no del
+    tamaño del dataset. Desde FULL_DETAIL_ZOOM se devuelven todas.
+
+    Cada nivel de zoom tiene su propia grilla, construida en el primer uso.
+    """
+
+    # Celda de la grilla sin LOD
+    GRID_CELL_DEGREES = 1.0
+    TILE_SIZE = 256
+    LOD_CELL_PIXELS = 32
+    CITIES_PER_CELL = 1
+    FULL_DETAIL_ZOOM = 12
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, population: np.ndarray):
+        """
+        Args:
+            lat: Latitud de cada ciudad (alineada con la tabla de ciudades)
+            lng: Longitud de cada ciudad
+            population: Población de cada ciudad (valores negativos = desconocida)
+        """
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.population = np.asarray(population)
+        self._levels: Dict[Optional[int], GridIndex] = {}
+        self._lock = threading.Lock()
+
+    def query(self, bbox: Optional[BoundingBox] = None, zoom: Optional[int] = None) -> np.ndarray:
+        """
+        Ciudades visibles en un viewport
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng); None = mundo entero
+            zoom: Nivel de zoom para el nivel de detalle; None = todas las ciudades
+
+        Returns:
+            Array de filas de la tabla de ciudades, de mayor a menor población
+        """
+        if zoom is not None and zoom >= self.FULL_DETAIL_ZOOM:
+            zoom = None
+        grid = self._level(zoom)
+        rows = grid.rows if bbox is None else grid.query(bbox)
+        return rows[np.argsort(-self.population[rows], kind="stable")]
+
+    def _level(self, zoom: Optional[int]) -> GridIndex:
+        """Grilla de las ciudades seleccionadas para un zoom (con caché)"""
+        grid = self._levels.get(zoom)
+        if grid is None:
+            with self._lock:
+                grid = self._levels.get(zoom)
+                if grid is None:
+                    rows = np.arange(len(self.lat)) if zoom is None else self._select(zoom)
+                    grid = GridIndex(self.lat[rows], self.lng[rows], rows, self.GRID_CELL_DEGREES)
+                    self._levels[zoom] = grid
+        return grid
+
+    def _select(self, zoom: int) -> np.ndarray:
+        """Las CITIES_PER_CELL ciudades más pobladas de cada celda LOD del zoom dado"""
+        cell_degrees = 360.0 / (self.TILE_SIZE * 2 ** zoom) * self.LOD_CELL_PIXELS
+        columns = np.floor((self.lng + 180.0) / cell_degrees).astype(np.int64)
+        bands = np.floor((self.lat + 90.0) / cell_degrees).astype(np.int64)
+        cells = bands * (int(math.ceil(360.0 / cell_degrees)) + 1) + columns
+
+        # Ordenar por celda y, dentro de cada celda, por población descendente
+        order = np.lexsort((-self.population, cells))
+        sorted_cells = cells[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        rank_in_cell = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        return np.sort(order[rank_in_cell < self.CITIES_PER_CELL])
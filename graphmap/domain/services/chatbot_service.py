@@ -3,8 +3,9 @@ Servicio de chatbot usando DeepSeek para responder preguntas sobre el grafo
 """
 import json
 from typing import Dict, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 from config import settings
+from graphmap.domain.services.compute_pool import compute_pool
 from graphmap.domain.services.graph_service import GraphService
 from graphmap.domain.services.city_service import CityService
 
@@ -23,12 +24,12 @@ class ChatbotService:
         self.graph_service = GraphService()
         self.city_service = CityService()
 
-    def _get_client(self) -> OpenAI:
+    def _get_client(self) -> AsyncOpenAI:
         if self.client is not None:
             return self.client
         if not self.api_key:
             raise RuntimeError("Chat service is not configured")
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
         return self.client
 
     def _execute_tool(self, tool_name: str, arguments: Dict) -> Dict:
@@ -36,14 +37,17 @@ class ChatbotService:
             return self.graph_service.get_graph_summary()
         elif tool_name == "get_city_details":
             city_name = arguments.get("city_name", "")
-            results = self.city_service.search_cities(city_name)
+            results = self.city_service.search_cities(city_name, limit=1)
+            if not results:
+                # Nombre mal escrito: probar con búsqueda aproximada
+                results = self.city_service.fuzzy_search_cities(city_name, limit=1)
             if results:
                 c = results[0]
                 return {"id": c.id, "city": c.city, "country": c.country, "lat": c.lat, "lng": c.lng}
             return {"error": "City not found"}
         return {"error": "Unknown tool"}
 
-    def chat(self, user_message: str, conversation_history: Optional[list] = None) -> Dict:
+    async def chat(self, user_message: str, conversation_history: Optional[list] = None) -> Dict:
         client = self._get_client()
         msg_lower = user_message.lower().strip()
         if msg_lower in CACHED_RESPONSES:
@@ -54,7 +58,7 @@ class ChatbotService:
             messages = [messages[0]] + messages[-7:]
 
         if not messages:
-            ctx = self.graph_service.get_graph_summary()
+            ctx = await compute_pool.run(self.graph_service.get_graph_summary)
             system_msg = f"Asistente Graphito. {ctx['num_nodes']} ciudades, {ctx['num_edges']} conexiones. Responde en español y Markdown."
             messages.append({"role": "system", "content": system_msg})
 
@@ -65,7 +69,7 @@ class ChatbotService:
             {"type": "function", "function": {"name": "get_city_details", "description": "Detalles de ciudad por nombre", "parameters": {"type": "object", "properties": {"city_name": {"type": "string"}}, "required": ["city_name"]}}}
         ]
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="deepseek-chat", messages=messages, tools=tools, temperature=0.3, max_tokens=200
         )
 
@@ -77,10 +81,12 @@ class ChatbotService:
                 "tool_calls": [{"id": tc.id, "type": tc.type, "function": {"name": tc.function.name, "arguments": tc.function.arguments}} for tc in assistant_message.tool_calls]
             })
             for tool_call in assistant_message.tool_calls:
-                result = self._execute_tool(tool_call.function.name, json.loads(tool_call.function.arguments))
+                result = await compute_pool.run(
+                    self._execute_tool, tool_call.function.name, json.loads(tool_call.function.arguments)
+                )
                 messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": json.dumps(result)})
 
-            final = client.chat.completions.create(model="deepseek-chat", messages=messages, temperature=0.3, max_tokens=200)
+            final = await client.chat.completions.create(model="deepseek-chat", messages=messages, temperature=0.3, max_tokens=200)
             messages.append({"role": "assistant", "content": final.choices[0].message.content or ""})
             return {"response": final.choices[0].message.content, "conversation_history": messages, "tool_used": True}
 
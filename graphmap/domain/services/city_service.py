@@ -1,95 +1,272 @@
 """
 Servicio para manejar operaciones relacionadas con ciudades
 """
-from typing import List
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from openpyxl import load_workbook
 from fastapi import HTTPException
 from graphmap.domain.model.entities.city import City
+from graphmap.domain.model.entities.city_fuzzy_index import CityFuzzyIndex
+from graphmap.domain.model.entities.city_record import CityRecord
+from graphmap.domain.model.entities.city_search_index import CitySearchIndex
+from graphmap.domain.model.entities.city_spatial_index import CitySpatialIndex
+from graphmap.domain.model.entities.city_table import CityTable
+from graphmap.domain.model.entities.viewport_index import BoundingBox, ViewportIndex
+from graphmap.infrastructure.cache.dataset_snapshot import DatasetSnapshot, PublishedDataset
+from graphmap.infrastructure.cache.single_flight import SingleFlight
+from graphmap.infrastructure.http import wire_format as wire
+from graphmap.infrastructure.http.static_payload import StaticPayload, dumps_json
+from graphmap.infrastructure.persistence.artifact_store import ArtifactStore
+from graphmap.infrastructure.persistence.city_snapshot import load_city_snapshot, save_city_snapshot, snapshot_name
 from config import settings
 
 
 class CityService:
     """Servicio para manejar la lógica de negocio relacionada con ciudades"""
 
-    # Caché estático para evitar recargar el Excel en cada request
-    _cities_cache: List[City] = None
+    # Un lock por caché: requests concurrentes con la caché vacía la construyen una sola vez
+    _builds = SingleFlight()
+    # Versión publicada del dataset. Datos base: la tabla columnar
+    # (representación interna; las filas se materializan como CityRecord
+    # solo para los resultados de cada request), el hash del Excel y su
+    # fecha de modificación. Cachés derivadas, construidas a demanda:
+    #   search_index       índice de búsqueda por nombre
+    #   fuzzy_index        búsqueda aproximada (errores de tipeo) sobre city_ascii
+    #   spatial_index      k-d tree sobre las coordenadas de todas las ciudades
+    #   viewport_index     grilla por viewport con niveles de detalle por zoom
+    #   row_json           JSON de cada fila con el esquema de City: las
+    #                      respuestas de búsqueda solo concatenan fragmentos
+    #   cities_payload:*   respuesta de /cities/ serializada y comprimida, por formato
+    # La snapshot publicada vive en PublishedDataset junto con la del grafo:
+    # una recarga reemplaza ambas a la vez (ver GraphService.publish)
+    # Última versión asignada a una snapshot de ciudades
+    _version: int = 0
 
-    def __init__(self, excel_file_path: str = None):
+    def __init__(self, excel_file_path: str = None, artifacts_dir: str = None):
         """
         Inicializa el servicio con la ruta del archivo Excel
 
         Args:
             excel_file_path: Ruta al archivo Excel con los datos de ciudades.
                            Si es None, usa la configuración del .env
+            artifacts_dir: Directorio de artefactos compilados (snapshot binario).
+                           Si es None, usa la configuración del .env
         """
         self.excel_file_path = excel_file_path or settings.DATASET_PATH
-    
-    def load_cities_from_excel(self) -> List[City]:
+        self.artifact_store = ArtifactStore(artifacts_dir or settings.ARTIFACTS_DIR)
+
+    def is_loaded(self) -> bool:
+        """True si el dataset ya está en memoria (no hará falta leerlo en el próximo request)"""
+        return PublishedDataset.cities() is not None
+
+    def get_snapshot(self) -> DatasetSnapshot:
         """
-        Carga todas las ciudades desde el archivo Excel (con caché)
+        Obtiene la versión publicada del dataset (la carga en el primer uso)
+
+        Un request que combina varias cachés (ej: índice de búsqueda y
+        tabla) debe tomar la snapshot una sola vez y pasarla a cada getter,
+        para no mezclar versiones si el dataset se recarga en el medio.
 
         Returns:
-            Lista de objetos City con todos los datos del Excel
+            DatasetSnapshot con table, dataset_hash y last_modified
 
         Raises:
             HTTPException: Si hay error al leer el archivo
         """
-        # Retornar desde caché si ya existe
-        if CityService._cities_cache is not None:
-            return CityService._cities_cache
+        snapshot = PublishedDataset.cities()
+        if snapshot is not None:
+            return snapshot
+
+        with CityService._builds.lock("table"):
+            # Otro hilo pudo haberla cargado mientras se esperaba el lock
+            if PublishedDataset.cities() is None:
+                # Carga inicial: todavía no hay grafo que publicar junto con las ciudades
+                PublishedDataset.publish(self.load_snapshot())
+            return PublishedDataset.cities()
+
+    def load_snapshot(self) -> DatasetSnapshot:
+        """
+        Carga el Excel actual como una snapshot nueva, sin publicarla
+
+        Si no existe un snapshot binario para el hash actual del Excel, lo
+        parsea y compila el snapshot para los siguientes arranques en frío.
+        Con varios workers solo uno parsea el Excel; todos usan las columnas
+        memory-mapped del snapshot (compartidas entre procesos).
+
+        Returns:
+            DatasetSnapshot con la siguiente versión
 
+        Raises:
+            HTTPException: Si hay error al leer el archivo
+        """
         try:
-            # Leer el archivo Excel con openpyxl para evitar dependencias pesadas en serverless.
-            workbook = load_workbook(self.excel_file_path, data_only=True, read_only=True)
-            worksheet = workbook.active
-
-            rows = worksheet.iter_rows(values_only=True)
-            headers = next(rows, None)
-            if not headers:
-                return []
-
-            header_index = {str(name): idx for idx, name in enumerate(headers) if name is not None}
-            required = [
-                "city", "city_ascii", "lat", "lng", "country",
-                "iso2", "iso3", "admin_name", "capital", "population", "id"
-            ]
-            missing = [name for name in required if name not in header_index]
-            if missing:
-                raise ValueError(f"Missing required columns in dataset: {missing}")
-
-            cities = []
-
-            for row in rows:
-                record = {name: row[header_index[name]] for name in required}
-                population_raw = record["population"]
-                population = int(population_raw) if population_raw is not None else None
-
-                city = City(
-                    city=str(record["city"]),
-                    city_ascii=str(record["city_ascii"]),
-                    lat=float(record["lat"]),
-                    lng=float(record["lng"]),
-                    country=str(record["country"]),
-                    iso2=str(record["iso2"]),
-                    iso3=str(record["iso3"]),
-                    admin_name=str(record["admin_name"]),
-                    capital=str(record["capital"]),
-                    population=population,
-                    id=int(record["id"])
-                )
-                cities.append(city)
-
-            workbook.close()
-
-            # Guardar en caché
-            CityService._cities_cache = cities
-            return cities
+            store = self.artifact_store
+            last_modified = os.path.getmtime(self.excel_file_path)
+            dataset_hash = store.dataset_fingerprint(self.excel_file_path)
+            table = store.load_or_build(
+                snapshot_name(dataset_hash),
+                load=lambda: load_city_snapshot(store, dataset_hash),
+                build=lambda: CityTable.from_cities(self._read_excel()),
+                save=lambda built: save_city_snapshot(store, built, dataset_hash),
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error loading data from Excel: {str(e)}"
             )
+
+        with CityService._builds.lock("version"):
+            CityService._version += 1
+            return DatasetSnapshot(CityService._version, table=table, dataset_hash=dataset_hash,
+                                   last_modified=last_modified)
+
+    def get_dataset_hash(self, snapshot: Optional[DatasetSnapshot] = None) -> str:
+        """
+        Obtiene el hash SHA-256 del dataset cargado
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            Hash en hexadecimal que identifica la versión del Excel
+        """
+        return (snapshot or self.get_snapshot())["dataset_hash"]
+
+    def load_city_table(self, snapshot: Optional[DatasetSnapshot] = None) -> CityTable:
+        """
+        Carga el dataset como tabla columnar (con caché)
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            CityTable con todas las ciudades del dataset
+
+        Raises:
+            HTTPException: Si hay error al leer el archivo
+        """
+        return (snapshot or self.get_snapshot())["table"]
+
+    def _read_excel(self) -> List[City]:
+        """
+        Parsea el archivo Excel fila por fila
+
+        Returns:
+            Lista de objetos City con todos los datos del Excel
+
+        Raises:
+            ValueError: Si faltan columnas requeridas
+        """
+        # Leer el archivo Excel con openpyxl para evitar dependencias pesadas en serverless.
+        workbook = load_workbook(self.excel_file_path, data_only=True, read_only=True)
+        worksheet = workbook.active
+
+        rows = worksheet.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers:
+            return []
+
+        header_index = {str(name): idx for idx, name in enumerate(headers) if name is not None}
+        required = [
+            "city", "city_ascii", "lat", "lng", "country",
+            "iso2", "iso3", "admin_name", "capital", "population", "id"
+        ]
+        missing = [name for name in required if name not in header_index]
+        if missing:
+            raise ValueError(f"Missing required columns in dataset: {missing}")
+
+        cities = []
+
+        for row in rows:
+            record = {name: row[header_index[name]] for name in required}
+            population_raw = record["population"]
+            population = int(population_raw) if population_raw is not None else None
+
+            city = City(
+                city=str(record["city"]),
+                city_ascii=str(record["city_ascii"]),
+                lat=float(record["lat"]),
+                lng=float(record["lng"]),
+                country=str(record["country"]),
+                iso2=str(record["iso2"]),
+                iso3=str(record["iso3"]),
+                admin_name=str(record["admin_name"]),
+                capital=str(record["capital"]),
+                population=population,
+                id=int(record["id"])
+            )
+            cities.append(city)
+
+        workbook.close()
+        return cities
     
+    @staticmethod
+    def to_map_data(cities: List[CityRecord]) -> Dict:
+        """
+        Formatea ciudades con los datos mínimos para el mapa
+
+        Returns:
+            Diccionario con la lista de ciudades (id, city, lat, lng) y el total
+        """
+        city_data = [
+            {
+                "id": city.id,
+                "city": city.city,
+                "lat": city.lat,
+                "lng": city.lng
+            }
+            for city in cities
+        ]
+        return {"cities": city_data, "total": len(city_data)}
+
+    def get_cities_payload(self, wire_format: str = wire.JSON,
+                           snapshot: Optional[DatasetSnapshot] = None) -> StaticPayload:
+        """
+        Obtiene la respuesta completa de /cities/ ya serializada y comprimida (con caché)
+
+        Args:
+            wire_format: Formato de la respuesta (wire.JSON, wire.BINARY o wire.ARROW)
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            StaticPayload cuyo Last-Modified es la fecha del dataset
+        """
+        snapshot = snapshot or self.get_snapshot()
+
+        def build() -> StaticPayload:
+            table = snapshot["table"]
+            options = dict(
+                last_modified=snapshot["last_modified"],
+                cache_control=f"public, max-age={settings.STATIC_CACHE_MAX_AGE}",
+                vary="Accept, Accept-Encoding",
+            )
+            if wire_format == wire.JSON:
+                return StaticPayload.from_json(self.to_map_data(table.records()), **options)
+            rows = np.arange(len(table))
+            return StaticPayload(self.encode_city_rows(rows, wire_format, snapshot),
+                                 media_type=wire.MEDIA_TYPES[wire_format], **options)
+
+        return snapshot.get_or_build(f"cities_payload:{wire_format}", build)
+
+    def encode_city_rows(self, rows: np.ndarray, wire_format: str,
+                         snapshot: Optional[DatasetSnapshot] = None) -> bytes:
+        """
+        Codifica filas de la tabla de ciudades en un formato binario, directo desde los arrays
+
+        Args:
+            rows: Filas de la tabla de ciudades
+            wire_format: wire.BINARY o wire.ARROW
+            snapshot: Versión del dataset a la que pertenecen las filas (None = la publicada)
+
+        Returns:
+            Bytes con id, city, lat y lng de cada ciudad
+        """
+        table = self.load_city_table(snapshot)
+        strings = table.strings
+        names = [strings[code] for code in table.string_codes["city"][rows].tolist()]
+        return wire.encode_cities(table.ids[rows], table.lat[rows], table.lng[rows], names, wire_format)
+
     def get_cities_count(self) -> int:
         """
         Obtiene el número total de ciudades
@@ -97,24 +274,239 @@ class CityService:
         Returns:
             Número total de ciudades en el dataset
         """
-        cities = self.load_cities_from_excel()
-        return len(cities)
+        return len(self.load_city_table())
     
 
-    def search_cities(self, query: str) -> List[City]:
+    def get_search_index(self, snapshot: Optional[DatasetSnapshot] = None) -> CitySearchIndex:
+        """
+        Obtiene el índice de búsqueda por nombre (con caché)
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            CitySearchIndex alineado con las filas de la tabla de ciudades
+        """
+        snapshot = snapshot or self.get_snapshot()
+        return snapshot.get_or_build("search_index", lambda: CitySearchIndex.from_table(snapshot["table"]))
+
+    def get_fuzzy_index(self, snapshot: Optional[DatasetSnapshot] = None) -> CityFuzzyIndex:
+        """
+        Obtiene el índice de búsqueda aproximada (con caché)
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            CityFuzzyIndex alineado con las filas de la tabla de ciudades
+        """
+        snapshot = snapshot or self.get_snapshot()
+        return snapshot.get_or_build("fuzzy_index", lambda: CityFuzzyIndex.from_table(snapshot["table"]))
+
+    def search_cities(self, query: str, limit: Optional[int] = None, offset: int = 0) -> List[CityRecord]:
         """
         Busca ciudades cuyo nombre contenga la cadena de consulta
-        
+
+        La comparación ignora mayúsculas y acentos. Los resultados se ordenan
+        por coincidencia exacta, luego por prefijo y luego por subcadena; a
+        igualdad, por población descendente.
+
         Args:
             query: Cadena para buscar en los nombres de las ciudades
-            
+            limit: Máximo de resultados (None = todos)
+            offset: Resultados a saltar (paginación)
+
         Returns:
             Lista de ciudades que coinciden con la consulta
         """
-        all_cities = self.load_cities_from_excel()
-        query_lower = query.lower()
-        cities = [
-            city for city in all_cities 
-            if query_lower in city.city.lower() or query_lower in city.city_ascii.lower()
-        ]
-        return cities
+        snapshot = self.get_snapshot()
+        rows = self.get_search_index(snapshot).search(query, limit, offset)
+        return snapshot["table"].records(rows)
+
+    def get_search_results_json(self, query: str, limit: Optional[int] = None, offset: int = 0,
+                                fuzzy: bool = False,
+                                max_distance: int = CityFuzzyIndex.MAX_DISTANCE) -> List[bytes]:
+        """
+        Igual que search_cities / fuzzy_search_cities, pero retorna el JSON
+        precalculado de cada resultado (mismo esquema que City)
+
+        Args:
+            query: Cadena (o nombre aproximado si fuzzy) a buscar
+            limit: Máximo de resultados (None = todos)
+            offset: Resultados a saltar (paginación)
+            fuzzy: Tolerar errores de tipeo
+            max_distance: Máxima distancia de edición en modo fuzzy
+
+        Returns:
+            Lista de objetos JSON en UTF-8, en el mismo orden que la búsqueda
+        """
+        snapshot = self.get_snapshot()
+        rows = self._search_rows(snapshot, query, limit, offset, fuzzy, max_distance)
+        row_json = self.get_row_json(snapshot)
+        return [row_json[row] for row in rows]
+
+    def encode_search_results(self, query: str, limit: Optional[int] = None, offset: int = 0,
+                              fuzzy: bool = False, max_distance: int = CityFuzzyIndex.MAX_DISTANCE) -> bytes:
+        """
+        Igual que search_cities / fuzzy_search_cities, pero retorna la lista
+        ya serializada como JSON (mismo esquema que List[City])
+
+        Returns:
+            Array JSON en UTF-8 armado con el JSON precalculado de cada fila
+        """
+        return b"[" + b",".join(self.get_search_results_json(query, limit, offset, fuzzy, max_distance)) + b"]"
+
+    def _search_rows(self, snapshot: DatasetSnapshot, query: str, limit: Optional[int], offset: int,
+                     fuzzy: bool, max_distance: int) -> List[int]:
+        """Filas de la tabla que devuelve una búsqueda exacta o aproximada, en orden"""
+        if fuzzy:
+            return [row for row, _ in self.get_fuzzy_index(snapshot).lookup(query, max_distance, limit, offset)]
+        return self.get_search_index(snapshot).search(query, limit, offset)
+
+    def get_row_json(self, snapshot: Optional[DatasetSnapshot] = None) -> List[bytes]:
+        """
+        Obtiene el JSON de cada ciudad con el esquema de City (con caché)
+
+        Ocupa lo mismo que la respuesta con todas las ciudades, bastante menos
+        que una lista de modelos de pydantic, y evita validar y serializar
+        cada resultado en cada request.
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            Lista de objetos JSON en UTF-8 alineada con las filas de la tabla
+        """
+        snapshot = snapshot or self.get_snapshot()
+        return snapshot.get_or_build("row_json", lambda: [dumps_json(row) for row in snapshot["table"].to_dicts()])
+
+    def autocomplete_cities(self, prefix: str, limit: int = 10, offset: int = 0) -> List[CityRecord]:
+        """
+        Sugiere ciudades cuyo nombre empieza por el prefijo
+
+        Args:
+            prefix: Texto escrito por el usuario
+            limit: Máximo de sugerencias
+            offset: Sugerencias a saltar (paginación)
+
+        Returns:
+            Lista de ciudades ordenada (exactas primero, luego por población)
+        """
+        snapshot = self.get_snapshot()
+        rows = self.get_search_index(snapshot).autocomplete(prefix, limit, offset)
+        return snapshot["table"].records(rows)
+
+    def fuzzy_search_cities(self, query: str, max_distance: int = CityFuzzyIndex.MAX_DISTANCE,
+                            limit: Optional[int] = None, offset: int = 0) -> List[CityRecord]:
+        """
+        Busca ciudades cuyo nombre se parece a la consulta (tolerante a errores de tipeo)
+
+        Args:
+            query: Nombre posiblemente mal escrito
+            max_distance: Máxima distancia de edición aceptada (0 a 2)
+            limit: Máximo de resultados (None = todos)
+            offset: Resultados a saltar (paginación)
+
+        Returns:
+            Lista de ciudades ordenada por distancia y población descendente
+        """
+        snapshot = self.get_snapshot()
+        matches = self.get_fuzzy_index(snapshot).lookup(query, max_distance, limit, offset)
+        return snapshot["table"].records([row for row, _ in matches])
+
+    def get_spatial_index(self, snapshot: Optional[DatasetSnapshot] = None) -> CitySpatialIndex:
+        """
+        Obtiene el índice espacial de las ciudades (con caché)
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            CitySpatialIndex cuyas filas son las de la tabla de ciudades
+        """
+        snapshot = snapshot or self.get_snapshot()
+        table = snapshot["table"]
+        return snapshot.get_or_build("spatial_index", lambda: CitySpatialIndex(table.lat, table.lng))
+
+    def nearest_cities(self, lat: float, lng: float, k: int = 1) -> List[Tuple[CityRecord, float]]:
+        """
+        Ciudades más cercanas a una coordenada
+
+        Args:
+            lat: Latitud en grados
+            lng: Longitud en grados
+            k: Número de ciudades
+
+        Returns:
+            Lista de (ciudad, distancia Haversine en km) ordenada por distancia
+        """
+        snapshot = self.get_snapshot()
+        return self._with_distances(snapshot, self.get_spatial_index(snapshot).nearest(lat, lng, k))
+
+    def cities_within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[CityRecord, float]]:
+        """
+        Ciudades dentro de un radio alrededor de una coordenada
+
+        Args:
+            lat: Latitud en grados
+            lng: Longitud en grados
+            radius_km: Radio en kilómetros
+
+        Returns:
+            Lista de (ciudad, distancia Haversine en km) ordenada por distancia
+        """
+        snapshot = self.get_snapshot()
+        return self._with_distances(snapshot, self.get_spatial_index(snapshot).within(lat, lng, radius_km))
+
+    @staticmethod
+    def _with_distances(snapshot: DatasetSnapshot,
+                        matches: List[Tuple[int, float]]) -> List[Tuple[CityRecord, float]]:
+        """Materializa las filas de una consulta espacial junto a su distancia"""
+        records = snapshot["table"].records([row for row, _ in matches])
+        return [(record, distance) for record, (_, distance) in zip(records, matches)]
+
+    def get_viewport_index(self, snapshot: Optional[DatasetSnapshot] = None) -> ViewportIndex:
+        """
+        Obtiene el índice por viewport de las ciudades (con caché)
+
+        Args:
+            snapshot: Versión del dataset (None = la publicada)
+
+        Returns:
+            ViewportIndex cuyas filas son las de la tabla de ciudades
+        """
+        snapshot = snapshot or self.get_snapshot()
+        table = snapshot["table"]
+        return snapshot.get_or_build("viewport_index",
+                                     lambda: ViewportIndex(table.lat, table.lng, table.population))
+
+    def cities_in_view(self, bbox: Optional[BoundingBox] = None,
+                       zoom: Optional[int] = None) -> List[CityRecord]:
+        """
+        Ciudades visibles en un viewport del mapa
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng); None = mundo entero
+            zoom: Nivel de zoom del mapa; a menor zoom solo se conservan las
+                  ciudades más pobladas de cada celda. None = todas
+
+        Returns:
+            Lista de ciudades ordenada por población descendente
+        """
+        snapshot = self.get_snapshot()
+        return snapshot["table"].records(self.get_viewport_index(snapshot).query(bbox, zoom))
+
+    def encode_cities_in_view(self, bbox: Optional[BoundingBox], zoom: Optional[int], wire_format: str) -> bytes:
+        """
+        Ciudades visibles en el viewport codificadas en un formato binario
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng); None = mundo entero
+            zoom: Nivel de zoom del mapa; None = todas
+            wire_format: wire.BINARY o wire.ARROW
+
+        Returns:
+            Bytes en el mismo orden que cities_in_view
+        """
+        snapshot = self.get_snapshot()
+        return self.encode_city_rows(self.get_viewport_index(snapshot).query(bbox, zoom), wire_format, snapshot)
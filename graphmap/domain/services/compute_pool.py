@@ -0,0 +1,109 @@
+"""
+Pool acotado de hilos para el trabajo de CPU de los endpoints
+
+Los endpoints son `async def`: cualquier cálculo síncrono (A*, búsquedas,
+construcción de cachés, armado de listas grandes) hecho directamente en
+ellos bloquea el event loop y frena a todos los demás requests del worker.
+`ComputePool.run` lo ejecuta en un pool de COMPUTE_WORKERS hilos y el event
+loop sigue atendiendo mientras tanto.
+
+El pool admite como máximo COMPUTE_WORKERS tareas en ejecución más
+COMPUTE_QUEUE_SIZE en espera; por encima de eso `run` falla de inmediato con
+`ComputePoolSaturated` (la API responde 429) en lugar de encolar sin límite.
+
+Se usan hilos y no procesos porque las cachés (tabla de ciudades, grafo,
+índices) viven en memoria del proceso; el cálculo pesado de NumPy/SciPy
+libera el GIL, y la matriz de distancias ya reparte su trabajo en su
+propio pool de procesos.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from config import settings
+
+T = TypeVar("T")
+
+
+class ComputePoolSaturated(RuntimeError):
+    """El pool tiene todos sus hilos ocupados y la cola llena"""
+
+
+class ComputePool:
+    """Thread pool con límite de concurrencia y de cola (backpressure)"""
+
+    def __init__(self, workers: int, queue_size: int):
+        """
+        Args:
+            workers: Hilos que ejecutan tareas en paralelo (mínimo 1)
+            queue_size: Tareas que pueden esperar un hilo libre (0 = ninguna)
+        """
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="compute")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Ejecuta `func(*args, **kwargs)` en el pool sin bloquear el event loop
+
+        Returns:
+            El resultado de `func` (sus excepciones se propagan)
+
+        Raises:
+            ComputePoolSaturated: Si el pool y la cola están llenos
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._rejected += 1
+                raise ComputePoolSaturated(
+                    f"Compute pool is saturated ({self.workers} workers, {self.queue_size} queued)"
+                )
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(self._call, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # El cupo se libera al terminar la tarea (o al cancelarse antes de
+        # empezar, si el cliente se desconecta), no al volver al event loop
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _call(self, task: Callable[[], T]) -> T:
+        """Ejecuta la tarea contando cuántas están en curso"""
+        with self._lock:
+            self._running += 1
+        try:
+            return task()
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self) -> Dict:
+        """Retorna la configuración y los contadores del pool"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+# Pool compartido por todos los endpoints del proceso
+compute_pool = ComputePool(settings.COMPUTE_WORKERS, settings.COMPUTE_QUEUE_SIZE)
@@ -0,0 +1,142 @@
+"""
+Servicio para construir el índice de Contraction Hierarchies a partir del grafo
+"""
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from graphmap.domain.model.entities.contraction_hierarchy import ContractionHierarchy
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+
+
+class ContractionHierarchyBuilder:
+    """Constructor de Contraction Hierarchies
+
+    Orden de contracción por "edge difference" (atajos necesarios menos
+    aristas eliminadas), más el número de vecinos ya contraídos y el nivel
+    en la jerarquía para repartir la contracción uniformemente, con
+    actualización perezosa de prioridades.
+    """
+
+    # Máximo de nodos asentados por búsqueda de testigos; si se agota sin
+    # encontrar testigo se agrega el atajo (siempre correcto, solo más denso)
+    WITNESS_SETTLE_LIMIT = 60
+    # Límite reducido al solo estimar la prioridad de un nodo
+    SIMULATION_SETTLE_LIMIT = 12
+
+    @staticmethod
+    def build(graph: CSRCityGraph) -> ContractionHierarchy:
+        """Contrae todos los nodos del grafo
+
+        Args:
+            graph: Grafo en formato CSR
+
+        Returns:
+            ContractionHierarchy con el grafo ascendente y los atajos
+        """
+        n = graph.num_nodes()
+        indptr = graph.indptr.tolist()
+        indices = graph.indices.tolist()
+        weights = graph.weights.tolist()
+
+        # Grafo de trabajo (nodos aún no contraídos): vecino -> (peso, mid)
+        overlay: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        for u in range(n):
+            for k in range(indptr[u], indptr[u + 1]):
+                v, w = indices[k], weights[k]
+                current = overlay[u].get(v)
+                if current is None or w < current[0]:
+                    overlay[u][v] = (w, -1)
+
+        contracted_neighbors = [0] * n
+        # Profundidad en la jerarquía: evita cadenas largas de contracción
+        level = [0] * n
+        rank = [0] * n
+        up_edges: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+
+        def witness_distances(source: int, excluded: int, limit: float, targets: set,
+                              settle_limit: int) -> Dict[int, float]:
+            """Dijkstra local desde source sin pasar por `excluded`, acotado por distancia y nodos asentados"""
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            pending = set(targets)
+            settled = 0
+            while heap and pending and settled < settle_limit:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                if d > limit:
+                    break
+                settled += 1
+                pending.discard(node)
+                for neighbor, (w, _) in overlay[node].items():
+                    if neighbor == excluded:
+                        continue
+                    candidate = d + w
+                    if candidate <= limit and candidate < dist.get(neighbor, math.inf):
+                        dist[neighbor] = candidate
+                        heapq.heappush(heap, (candidate, neighbor))
+            return dist
+
+        def required_shortcuts(v: int, settle_limit: int) -> List[Tuple[int, int, float]]:
+            """Atajos u-w (vía v) que no tienen un camino testigo igual o más corto"""
+            neighbors = list(overlay[v].items())
+            shortcuts = []
+            for i, (u, (w_uv, _)) in enumerate(neighbors):
+                targets = {x: w_uv + w_vx for x, (w_vx, _) in neighbors[i + 1:]}
+                if not targets:
+                    continue
+                dist = witness_distances(u, v, max(targets.values()), set(targets), settle_limit)
+                for x, length in targets.items():
+                    if dist.get(x, math.inf) > length:
+                        shortcuts.append((u, x, length))
+            return shortcuts
+
+        def priority(v: int, shortcuts: List[Tuple[int, int, float]]) -> int:
+            edge_difference = len(shortcuts) - len(overlay[v])
+            return 2 * edge_difference + contracted_neighbors[v] + level[v]
+
+        simulation_limit = ContractionHierarchyBuilder.SIMULATION_SETTLE_LIMIT
+        queue = [(priority(v, required_shortcuts(v, simulation_limit)), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Actualización perezosa: recalcular y reinsertar si ya no es el mínimo
+            current = priority(v, required_shortcuts(v, simulation_limit))
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            shortcuts = required_shortcuts(v, ContractionHierarchyBuilder.WITNESS_SETTLE_LIMIT)
+            rank[v] = order
+            order += 1
+
+            # Las aristas que quedan en v apuntan a nodos que se contraerán después
+            for u, (w, mid) in overlay[v].items():
+                up_edges[v].append((u, w, mid))
+                del overlay[u][v]
+                contracted_neighbors[u] += 1
+                level[u] = max(level[u], level[v] + 1)
+            overlay[v] = {}
+
+            for u, x, length in shortcuts:
+                existing = overlay[u].get(x)
+                if existing is None or length < existing[0]:
+                    overlay[u][x] = (length, v)
+                    overlay[x][u] = (length, v)
+
+        up_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(edges) for edges in up_edges], out=up_indptr[1:])
+        flat = [edge for edges in up_edges for edge in edges]
+
+        return ContractionHierarchy(
+            rank=np.array(rank, dtype=np.int32),
+            up_indptr=up_indptr,
+            up_indices=np.array([u for u, _, _ in flat], dtype=np.int32),
+            up_weights=np.array([w for _, w, _ in flat], dtype=np.float64),
+            up_mid=np.array([m for _, _, m in flat], dtype=np.int32),
+        )
@@ -0,0 +1,287 @@
+"""
+Servicio para calcular distancias y rutas entre muchos pares de ciudades
+
+Ejecuta un Dijkstra por ciudad origen (SciPy, en C) que resuelve de una vez
+todos los destinos pedidos. Los orígenes se reparten en bloques entre un
+pool de procesos; las solicitudes pequeñas se resuelven en el mismo proceso.
+"""
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+
+logger = logging.getLogger(__name__)
+
+# Matriz del grafo en cada proceso del pool (la fija el initializer)
+_worker_matrix = None
+
+# Orígenes por llamada a dijkstra: SciPy devuelve matrices densas de
+# (orígenes x nodos), así que la memoria pico queda acotada por este bloque
+# y no por el número de orígenes de la solicitud
+SOURCE_BLOCK = 256
+
+
+def _as_matrix(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+    """Crea la matriz dispersa de SciPy a partir de los arrays CSR"""
+    from scipy.sparse import csr_matrix
+
+    n = len(indptr) - 1
+    return csr_matrix((weights, indices, indptr), shape=(n, n))
+
+
+def _init_worker(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> None:
+    """Initializer del pool: recibe el grafo una sola vez por proceso"""
+    global _worker_matrix
+    _worker_matrix = _as_matrix(indptr, indices, weights)
+
+
+def _solve_block(sources: np.ndarray, targets: np.ndarray, with_paths: bool,
+                 matrix=None) -> Tuple[np.ndarray, Optional[List[List[Optional[List[int]]]]]]:
+    """
+    Resuelve un bloque de orígenes contra todos los destinos
+
+    Los orígenes se procesan de a SOURCE_BLOCK: cada tramo se recorta a las
+    columnas de los destinos antes de calcular el siguiente.
+
+    Args:
+        sources: Índices densos de los orígenes del bloque
+        targets: Índices densos de los destinos
+        with_paths: Si se reconstruyen los caminos
+        matrix: Matriz del grafo; None = la del proceso del pool
+
+    Returns:
+        Tupla (distancias (len(sources), len(targets)), caminos de índices
+        densos por par o None si no se pidieron; None = inalcanzable)
+    """
+    matrix = _worker_matrix if matrix is None else matrix
+    if len(sources) <= SOURCE_BLOCK:
+        return _solve_chunk(matrix, sources, targets, with_paths)
+
+    distances, paths = [], [] if with_paths else None
+    for start in range(0, len(sources), SOURCE_BLOCK):
+        chunk_distances, chunk_paths = _solve_chunk(matrix, sources[start:start + SOURCE_BLOCK], targets, with_paths)
+        distances.append(chunk_distances)
+        if with_paths:
+            paths.extend(chunk_paths)
+    return np.vstack(distances), paths
+
+
+def _solve_chunk(matrix, sources: np.ndarray, targets: np.ndarray,
+                 with_paths: bool) -> Tuple[np.ndarray, Optional[List[List[Optional[List[int]]]]]]:
+    """Una llamada a dijkstra para a lo sumo SOURCE_BLOCK orígenes (ver _solve_block)"""
+    from scipy.sparse.csgraph import dijkstra
+
+    # El CSR guarda ambas direcciones de cada arista: directed=True evita
+    # que SciPy simetrice la matriz en cada llamada
+    if not with_paths:
+        distances = dijkstra(matrix, directed=True, indices=sources)
+        return distances[:, targets], None
+
+    distances, predecessors = dijkstra(matrix, directed=True, indices=sources, return_predecessors=True)
+    distances = distances[:, targets]
+    paths = []
+    for row, source in enumerate(sources.tolist()):
+        parents = predecessors[row]
+        row_paths = []
+        for column, target in enumerate(targets.tolist()):
+            if not np.isfinite(distances[row, column]):
+                row_paths.append(None)
+                continue
+            path = [target]
+            while path[-1] != source:
+                path.append(int(parents[path[-1]]))
+            path.reverse()
+            row_paths.append(path)
+        paths.append(row_paths)
+    return distances, paths
+
+
+class DistanceMatrixService:
+    """Servicio de distancias y rutas en lote sobre el grafo CSR
+
+    Se construye una vez por grafo; el pool de procesos se crea en la
+    primera solicitud grande y se reutiliza.
+    """
+
+    # Tope de pares por solicitud (500 x 500)
+    MAX_PAIRS = 250_000
+    # Por debajo de este número de orígenes no compensa repartir entre procesos
+    PARALLEL_MIN_SOURCES = 64
+
+    def __init__(self, graph: CSRCityGraph, city_ids: List[int], workers: int = 1):
+        """
+        Inicializa el servicio
+
+        Args:
+            graph: Grafo de ciudades en formato CSR
+            city_ids: IDs de todas las ciudades del dataset (incluidas las aisladas)
+            workers: Procesos del pool (1 = todo en el proceso actual)
+        """
+        self.graph = graph
+        self.city_ids = set(city_ids)
+        self.node_index: Dict[int, int] = {node: i for i, node in enumerate(graph.node_ids.tolist())}
+        self.node_ids: List[int] = graph.node_ids.tolist()
+        self.workers = workers
+
+        self._matrix = _as_matrix(graph.indptr, graph.indices, graph.weights)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def distance_matrix(self, sources: List[int], targets: List[int]) -> Dict:
+        """
+        Matriz de distancias de cada origen a cada destino
+
+        Args:
+            sources: IDs de las ciudades origen
+            targets: IDs de las ciudades destino
+
+        Returns:
+            Dict con sources, targets y distances (filas por origen, km
+            redondeados a 2 decimales; None si no hay camino)
+
+        Raises:
+            ValueError: Si la solicitud excede MAX_PAIRS o contiene IDs desconocidos
+        """
+        distances, _ = self._solve(sources, targets, with_paths=False)
+        return {
+            "sources": sources,
+            "targets": targets,
+            "distances": self._format_distances(distances),
+        }
+
+    def routes(self, sources: List[int], targets: List[int], include_path: bool = True) -> Dict:
+        """
+        Rutas de cada origen a cada destino
+
+        Args:
+            sources: IDs de las ciudades origen
+            targets: IDs de las ciudades destino
+            include_path: Si False solo se devuelven las distancias
+
+        Returns:
+            Dict con `routes`: lista por par {source, target, distance, path}
+            con `path` como lista de IDs (None si no hay camino); sin `path`
+            cuando include_path es False
+
+        Raises:
+            ValueError: Si la solicitud excede MAX_PAIRS o contiene IDs desconocidos
+        """
+        distances, paths = self._solve(sources, targets, with_paths=include_path)
+        rows = self._format_distances(distances)
+
+        routes = []
+        for i, source in enumerate(sources):
+            for j, target in enumerate(targets):
+                route = {"source": source, "target": target, "distance": rows[i][j]}
+                if include_path:
+                    route["path"] = paths[i][j]
+                routes.append(route)
+        return {"routes": routes, "total_routes": len(routes)}
+
+    def _solve(self, sources: List[int], targets: List[int],
+               with_paths: bool) -> Tuple[np.ndarray, Optional[List[List[Optional[List[int]]]]]]:
+        """
+        Valida los IDs, resuelve los pares y expande el resultado al orden pedido
+
+        Returns:
+            Tupla (distancias (S, T), caminos de IDs por par o None)
+        """
+        if len(sources) * len(targets) > self.MAX_PAIRS:
+            raise ValueError(
+                f"Too many pairs: {len(sources)} x {len(targets)} exceeds the limit of {self.MAX_PAIRS}"
+            )
+        unknown = sorted({city_id for city_id in sources + targets if city_id not in self.city_ids})
+        if unknown:
+            raise ValueError(f"Unknown city ids: {unknown[:10]}")
+
+        # Ciudades aisladas (sin aristas) solo se alcanzan a sí mismas
+        graph_sources = sorted({self.node_index[s] for s in sources if s in self.node_index})
+        graph_targets = sorted({self.node_index[t] for t in targets if t in self.node_index})
+        source_row = {node: i for i, node in enumerate(graph_sources)}
+        target_column = {node: j for j, node in enumerate(graph_targets)}
+
+        block_distances = np.empty((len(graph_sources), len(graph_targets)))
+        block_paths: List[List[Optional[List[int]]]] = []
+        if graph_sources and graph_targets:
+            block_distances, block_paths = self._run(
+                np.array(graph_sources, dtype=np.int32), np.array(graph_targets, dtype=np.int32), with_paths
+            )
+
+        distances = np.full((len(sources), len(targets)), np.inf)
+        paths = [[None] * len(targets) for _ in sources] if with_paths else None
+        for i, source in enumerate(sources):
+            row = source_row.get(self.node_index.get(source))
+            for j, target in enumerate(targets):
+                if source == target:
+                    distances[i, j] = 0.0
+                    if with_paths:
+                        paths[i][j] = [source]
+                    continue
+                column = target_column.get(self.node_index.get(target))
+                if row is None or column is None:
+                    continue
+                distances[i, j] = block_distances[row, column]
+                if with_paths and block_paths[row][column] is not None:
+                    paths[i][j] = [self.node_ids[node] for node in block_paths[row][column]]
+        return distances, paths
+
+    def _run(self, sources: np.ndarray, targets: np.ndarray,
+             with_paths: bool) -> Tuple[np.ndarray, Optional[List[List[Optional[List[int]]]]]]:
+        """Ejecuta los bloques de orígenes en el pool o en el proceso actual"""
+        executor = None
+        if self.workers > 1 and len(sources) >= self.PARALLEL_MIN_SOURCES:
+            executor = self._get_executor()
+        if executor is None:
+            return _solve_block(sources, targets, with_paths, self._matrix)
+
+        # Dos bloques por proceso para repartir mejor la carga
+        blocks = np.array_split(sources, min(len(sources), self.workers * 2))
+        try:
+            futures = [executor.submit(_solve_block, block, targets, with_paths) for block in blocks]
+        except RuntimeError:
+            # El pool se cerró (close) mientras se preparaba la solicitud
+            return _solve_block(sources, targets, with_paths, self._matrix)
+        results = [future.result() for future in futures]
+
+        distances = np.vstack([block_distances for block_distances, _ in results])
+        paths = None
+        if with_paths:
+            paths = [row for _, block_paths in results for row in block_paths]
+        return distances, paths
+
+    def close(self) -> None:
+        """Libera el pool de procesos (ej: al publicarse otra versión del grafo)
+
+        Las tareas ya enviadas terminan normalmente; las solicitudes
+        siguientes se resuelven en el proceso actual.
+        """
+        executor, self._executor = self._executor, None
+        self.workers = 1
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Crea el pool de procesos en el primer uso; None si la plataforma no lo permite"""
+        if self._executor is None:
+            try:
+                # spawn: no hereda locks ni hilos del servidor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.graph.indptr, self.graph.indices, self.graph.weights),
+                )
+            except (OSError, NotImplementedError):
+                logger.warning("Process pool unavailable, solving distance matrices in-process", exc_info=True)
+                self.workers = 1
+        return self._executor
+
+    @staticmethod
+    def _format_distances(distances: np.ndarray) -> List[List[Optional[float]]]:
+        """Redondea a 2 decimales y reemplaza inalcanzables (inf) por None"""
+        rounded = np.round(distances, 2).astype(object)
+        rounded[~np.isfinite(distances)] = None
+        return rounded.tolist()
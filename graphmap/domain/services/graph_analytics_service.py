@@ -0,0 +1,313 @@
+"""
+Servicio de analítica del grafo de ciudades (componentes, grados, distancias y centralidad)
+"""
+from enum import Enum
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.infrastructure.cache.dataset_snapshot import DatasetSnapshot
+from graphmap.infrastructure.cache.result_cache import ResultCache
+
+
+class CentralityMetric(str, Enum):
+    """Métricas disponibles para /graph/analytics/centrality"""
+    CLOSENESS = "closeness"
+    BETWEENNESS = "betweenness"
+
+
+class GraphAnalyticsService:
+    """Métricas del grafo calculadas con scipy.sparse.csgraph
+
+    Todas trabajan sobre una vista csr_matrix de los arrays CSR del grafo
+    (sin copiarlos) y se guardan en la snapshot del grafo con claves
+    "analytics:*", así que se calculan una vez por versión y se descartan
+    junto con ella al publicarse un grafo nuevo. Las distancias desde un
+    origen son una por ciudad, por lo que van a una caché LRU acotada.
+    """
+
+    # Distancias desde un origen (orden de nodos y km), por ciudad y versión del grafo
+    _distance_cache = ResultCache(settings.ANALYTICS_CACHE_SIZE)
+
+    # Semilla fija: la misma muestra (y el mismo resultado en caché) en cada request
+    SAMPLE_SEED = 0
+
+    def __init__(self):
+        self.graph_service = GraphService()
+
+    @staticmethod
+    def _get_matrix(snapshot: DatasetSnapshot):
+        """Vista csr_matrix del grafo de la snapshot (con caché)"""
+        from scipy.sparse import csr_matrix
+
+        def build():
+            graph = snapshot["graph"]
+            n = graph.num_nodes()
+            return csr_matrix((graph.weights, graph.indices, graph.indptr), shape=(n, n))
+
+        return snapshot.get_or_build("analytics:matrix", build)
+
+    def _describe(self, snapshot: DatasetSnapshot, nodes: np.ndarray) -> List[Dict]:
+        """ID y nombre de las ciudades de los nodos dados"""
+        table = snapshot["cities"]["table"]
+        rows = self.graph_service.get_node_rows(snapshot)[nodes]
+        names = table.string_codes["city"][rows].tolist()
+        return [
+            {"id": city_id, "name": table.strings[code]}
+            for city_id, code in zip(table.ids[rows].tolist(), names)
+        ]
+
+    def _isolated_cities(self, snapshot: DatasetSnapshot) -> np.ndarray:
+        """IDs de las ciudades del dataset sin ninguna arista (no son nodos del grafo)"""
+        table = snapshot["cities"]["table"]
+        graph = snapshot["graph"]
+        return np.sort(table.ids[~np.isin(table.ids, graph.node_ids)])
+
+    def get_components(self, limit: int = 20, max_city_ids: int = 20) -> Dict:
+        """Componentes conexas del grafo, de mayor a menor
+
+        Las ciudades sin aristas (a más de MAX_DISTANCE_KM de todas sus
+        vecinas de Delaunay) no son nodos del grafo: se informan aparte en
+        `isolated_cities`.
+
+        Args:
+            limit: Número máximo de componentes listadas
+            max_city_ids: Número máximo de IDs de ciudades por componente
+
+        Returns:
+            Diccionario con el número de componentes, sus tamaños y ciudades
+        """
+        snapshot = self.graph_service.get_snapshot()
+
+        def build() -> Dict:
+            # Las etiquetas se calculan al construir el grafo (connected_components)
+            graph = snapshot["graph"]
+            labels = graph.components
+            sizes = np.bincount(labels, minlength=graph.num_components())
+            # Nodos agrupados por componente, y componentes de mayor a menor
+            members = np.argsort(labels, kind="stable")
+            return {
+                "sizes": sizes,
+                "order": np.argsort(-sizes, kind="stable"),
+                "members": members,
+                "offsets": np.concatenate(([0], np.cumsum(sizes))),
+                "isolated": self._isolated_cities(snapshot),
+            }
+
+        components = snapshot.get_or_build("analytics:components", build)
+        node_ids = snapshot["graph"].node_ids
+        sizes, offsets, members = components["sizes"], components["offsets"], components["members"]
+
+        listed = []
+        for label in components["order"][:limit].tolist():
+            nodes = members[offsets[label]:offsets[label + 1]]
+            listed.append({
+                "size": int(sizes[label]),
+                "city_ids": np.sort(node_ids[nodes])[:max_city_ids].tolist(),
+            })
+
+        return {
+            "graph_version": snapshot.version,
+            "num_nodes": len(node_ids),
+            "num_components": len(sizes),
+            "largest_component_size": int(sizes.max()) if len(sizes) else 0,
+            "isolated_cities": components["isolated"].tolist(),
+            "components": listed,
+        }
+
+    def get_degree_distribution(self, top: int = 10) -> Dict:
+        """Distribución de grados de las ciudades
+
+        Los grados salen directamente de indptr (np.diff). Las ciudades sin
+        aristas cuentan con grado 0 en el histograma.
+
+        Args:
+            top: Número de ciudades de mayor grado a listar
+
+        Returns:
+            Diccionario con estadísticas, histograma y ciudades de mayor grado
+        """
+        snapshot = self.graph_service.get_snapshot()
+
+        def build() -> Dict:
+            degrees = np.diff(snapshot["graph"].indptr)
+            histogram = np.bincount(degrees) if len(degrees) else np.zeros(1, dtype=np.int64)
+            histogram[0] += len(self._isolated_cities(snapshot))
+            return {"degrees": degrees, "histogram": histogram, "ranking": np.argsort(-degrees, kind="stable")}
+
+        distribution = snapshot.get_or_build("analytics:degrees", build)
+        degrees, histogram = distribution["degrees"], distribution["histogram"]
+        ranking = distribution["ranking"][:top]
+
+        return {
+            "graph_version": snapshot.version,
+            "num_nodes": len(degrees),
+            "isolated_cities": int(histogram[0]),
+            "min": int(degrees.min()) if len(degrees) else 0,
+            "max": int(degrees.max()) if len(degrees) else 0,
+            "mean": round(float(degrees.mean()), 4) if len(degrees) else 0.0,
+            "median": float(np.median(degrees)) if len(degrees) else 0.0,
+            "histogram": [
+                {"degree": degree, "count": count}
+                for degree, count in enumerate(histogram.tolist()) if count
+            ],
+            "top": [
+                {**city, "degree": degree}
+                for city, degree in zip(self._describe(snapshot, ranking), degrees[ranking].tolist())
+            ],
+        }
+
+    def get_distances_from(self, source_id: int, limit: Optional[int] = None,
+                           max_km: Optional[float] = None) -> Dict:
+        """Distancias por el grafo desde una ciudad a todas las alcanzables
+
+        Args:
+            source_id: ID de la ciudad origen
+            limit: Número máximo de ciudades listadas (las más cercanas; None = todas)
+            max_km: Solo ciudades a esta distancia o menos (None = sin límite)
+
+        Returns:
+            Diccionario con el número de ciudades alcanzables, la más lejana
+            y la lista de distancias de menor a mayor
+
+        Raises:
+            ValueError: Si la ciudad no es un nodo del grafo
+        """
+        from scipy.sparse.csgraph import dijkstra
+
+        snapshot = self.graph_service.get_snapshot()
+        graph = snapshot["graph"]
+        source = int(np.searchsorted(graph.node_ids, source_id))
+        if source >= graph.num_nodes() or graph.node_ids[source] != source_id:
+            raise ValueError(f"City {source_id} is not a node of the graph")
+
+        cached = GraphAnalyticsService._distance_cache.get(source_id, snapshot.version)
+        if cached is None:
+            distances = dijkstra(self._get_matrix(snapshot), directed=False, indices=source)
+            reachable = np.flatnonzero(np.isfinite(distances))
+            order = reachable[np.argsort(distances[reachable], kind="stable")]
+            # El primero es el propio origen (distancia 0)
+            cached = (order[1:], distances[order[1:]])
+            GraphAnalyticsService._distance_cache.put(source_id, snapshot.version, cached)
+        order, distances = cached
+
+        count = len(order) if max_km is None else int(np.searchsorted(distances, max_km, side="right"))
+        if limit is not None:
+            count = min(count, limit)
+
+        return {
+            "source_id": source_id,
+            "graph_version": snapshot.version,
+            "reachable": len(order),
+            "farthest_km": round(float(distances[-1]), 3) if len(order) else 0.0,
+            "distances": [
+                {"id": city_id, "distance_km": round(distance, 3)}
+                for city_id, distance in zip(graph.node_ids[order[:count]].tolist(), distances[:count].tolist())
+            ],
+        }
+
+    def get_centrality(self, metric: CentralityMetric, samples: int, top: int = 20) -> Dict:
+        """Centralidad de cercanía o de intermediación a partir de nodos muestreados
+
+        - closeness: exacta para cada nodo muestreado, con la corrección de
+          Wasserman-Faust para grafos no conexos: (r / suma) * (r / (n - 1)),
+          con r las ciudades alcanzables y suma sus distancias (1/km).
+        - betweenness: estimación para todos los nodos a partir de Dijkstra
+          desde los nodos muestreados (Brandes-Pich), normalizada a [0, 1].
+          Se usa un único camino mínimo por par (el del árbol de
+          predecesores), lo que con distancias reales no cambia el resultado.
+
+        Args:
+            metric: Métrica a calcular
+            samples: Número de nodos muestreados (semilla fija)
+            top: Número de ciudades a listar, de mayor a menor centralidad
+
+        Returns:
+            Diccionario con la métrica, la muestra usada y las ciudades más centrales
+        """
+        metric = CentralityMetric(metric)
+        snapshot = self.graph_service.get_snapshot()
+        n = snapshot["graph"].num_nodes()
+        samples = min(samples, n)
+
+        def build() -> Dict:
+            sources = np.sort(np.random.default_rng(self.SAMPLE_SEED).choice(n, size=samples, replace=False))
+            matrix = self._get_matrix(snapshot)
+            if metric == CentralityMetric.CLOSENESS:
+                nodes, scores = sources, self._closeness(matrix, sources)
+            else:
+                nodes, scores = np.arange(n), self._betweenness(matrix, sources)
+            ranking = np.argsort(-scores, kind="stable")
+            return {"nodes": nodes[ranking], "scores": scores[ranking]}
+
+        centrality = snapshot.get_or_build(f"analytics:{metric.value}:{samples}", build)
+        nodes, scores = centrality["nodes"][:top], centrality["scores"][:top]
+
+        return {
+            "metric": metric.value,
+            "graph_version": snapshot.version,
+            "num_nodes": n,
+            "samples": samples,
+            "top": [
+                {**city, "score": score}
+                for city, score in zip(self._describe(snapshot, nodes), scores.tolist())
+            ],
+        }
+
+    @staticmethod
+    def _closeness(matrix, sources: np.ndarray) -> np.ndarray:
+        """Closeness (Wasserman-Faust) de cada nodo de `sources`"""
+        from scipy.sparse.csgraph import dijkstra
+
+        n = matrix.shape[0]
+        distances = dijkstra(matrix, directed=False, indices=sources)
+        reachable = np.isfinite(distances)
+        others = reachable.sum(axis=1) - 1
+        total = np.where(reachable, distances, 0.0).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = (others / total) * (others / max(n - 1, 1))
+        return np.where(total > 0, scores, 0.0)
+
+    @staticmethod
+    def _betweenness(matrix, sources: np.ndarray) -> np.ndarray:
+        """Betweenness normalizada de todos los nodos, estimada desde `sources`
+
+        Para cada origen s, la dependencia de un nodo v es el número de
+        descendientes de v en el árbol de caminos mínimos de s. Se acumula
+        por niveles del árbol (de las hojas a la raíz), con una operación
+        vectorizada por nivel en lugar de un recorrido nodo a nodo.
+        """
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import dijkstra
+
+        n = matrix.shape[0]
+        scores = np.zeros(n)
+        if n < 3 or not len(sources):
+            return scores
+
+        _, predecessors = dijkstra(matrix, directed=False, indices=sources, return_predecessors=True)
+        nodes = np.arange(n)
+        for source, parents in zip(sources.tolist(), predecessors):
+            # -9999: el origen y los nodos inalcanzables
+            children = np.flatnonzero(parents >= 0)
+            tree = csr_matrix((np.ones(len(children)), (parents[children], children)), shape=(n, n))
+            depth = dijkstra(tree, indices=source, unweighted=True)
+
+            reached = nodes[np.isfinite(depth)]
+            levels = depth[reached].astype(np.int64)
+            by_level = reached[np.argsort(levels, kind="stable")]
+            bounds = np.searchsorted(np.sort(levels), np.arange(levels.max() + 2))
+
+            descendants = np.zeros(n)
+            # Del nivel más profundo al 1: cada nodo suma sus descendientes (y él mismo) al padre
+            for level in range(levels.max(), 0, -1):
+                level_nodes = by_level[bounds[level]:bounds[level + 1]]
+                np.add.at(descendants, parents[level_nodes], descendants[level_nodes] + 1)
+            descendants[source] = 0.0
+            scores += descendants
+
+        # Escala de la muestra a todos los orígenes y normalización de Brandes
+        # para grafos no dirigidos (cada par se cuenta desde sus dos extremos)
+        return scores * (n / len(sources)) / ((n - 1) * (n - 2))
@@ -1,16 +1,23 @@
 """
 Servicio para construir grafos usando diferentes algoritmos de triangulación
 """
-from typing import List, Tuple
-from graphmap.domain.model.entities.graph import CityGraph
+from typing import Dict, List, Optional, Tuple, Sequence
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
 from graphmap.domain.model.entities.geo_utils import GeoUtils
 
 
 class GraphBuilder:
     """Constructor de grafos de proximidad geográfica"""
 
+    # Vecinos más cercanos con los que arranca la región local de cada
+    # ciudad afectada al parchear la triangulación
+    PATCH_NEIGHBORS = 16
+    # Fracción del dataset a partir de la cual la región local ya no
+    # compensa y conviene triangular todo
+    PATCH_MAX_REGION = 0.5
+
     @staticmethod
-    def build_delaunay_graph(cities_data: List[Tuple[int, float, float]], max_distance_km: float = None) -> CityGraph:
+    def build_delaunay_graph(cities_data: List[Tuple[int, float, float]], max_distance_km: float = None) -> CSRCityGraph:
         """Construye grafo usando triangulación de Delaunay con proyección Web Mercator
 
         Args:
@@ -18,48 +25,244 @@ class GraphBuilder:
             max_distance_km: Distancia máxima en km para conectar ciudades (None = sin límite)
 
         Returns:
-            CityGraph con conexiones basadas en Delaunay
+            CSRCityGraph con conexiones basadas en Delaunay
         """
-        graph = CityGraph()
+        ids, lats, lons = zip(*cities_data) if cities_data else ((), (), ())
+        return GraphBuilder.build_delaunay_graph_from_arrays(ids, lats, lons, max_distance_km)
 
-        if len(cities_data) < 3:
-            # Delaunay requiere al menos 3 puntos
-            return graph
+    @staticmethod
+    def build_delaunay_graph_from_arrays(ids: Sequence[int], lats: Sequence[float], lons: Sequence[float],
+                                         max_distance_km: float = None) -> CSRCityGraph:
+        """Construye grafo de Delaunay a partir de columnas de coordenadas
+
+        Todo el pipeline es vectorizado: proyección, extracción de aristas
+        únicas desde los triángulos, Haversine y filtrado por distancia.
+
+        Args:
+            ids: IDs de las ciudades
+            lats: Latitudes en grados (alineadas con ids)
+            lons: Longitudes en grados (alineadas con ids)
+            max_distance_km: Distancia máxima en km para conectar ciudades (None = sin límite)
 
+        Returns:
+            CSRCityGraph con conexiones basadas en Delaunay
+        """
         # Lazy imports para reducir el tiempo de import de la app en serverless.
         import numpy as np
+
+        if len(ids) < 3:
+            # Delaunay requiere al menos 3 puntos
+            empty = np.empty(0, dtype=np.int64)
+            return CSRCityGraph.from_edges(empty, empty, np.empty(0))
+
         from scipy.spatial import Delaunay
 
         # Guardar coordenadas originales (lat, lon) para cálculo de distancias
-        original_coords = np.array([(lat, lon) for _, lat, lon in cities_data])
-        id_map = [city_id for city_id, _, _ in cities_data]
+        ids = np.asarray(ids, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
 
         # Paso 1: Convertir coordenadas geográficas a proyección Web Mercator
-        mercator_points = np.array([
-            GeoUtils.lat_lon_to_mercator(lat, lon)
-            for _, lat, lon in cities_data
-        ])
+        mercator_points = GeoUtils.lat_lon_to_mercator_array(lats, lons)
 
         # Paso 2: Calcular triangulación de Delaunay en coordenadas proyectadas
         tri = Delaunay(mercator_points)
 
-        # Paso 3: Extraer aristas y calcular distancias reales con Haversine
-        for simplex in tri.simplices:
-            # Cada simplex es un triángulo con 3 vértices
-            # Conectar cada par de vértices del triángulo
-            for i in range(3):
-                for j in range(i + 1, 3):
-                    idx_u, idx_v = simplex[i], simplex[j]
+        # Paso 3: Extraer aristas únicas de los triángulos
+        # Cada simplex aporta sus 3 lados; se ordena cada par (menor, mayor)
+        # y se deduplica codificándolo como un único entero
+        simplices = tri.simplices.astype(np.int64)
+        pairs = np.concatenate((simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [0, 2]]))
+        pairs.sort(axis=1)
+        n = len(ids)
+        keys = np.unique(pairs[:, 0] * n + pairs[:, 1])
+        idx_u, idx_v = keys // n, keys % n
+
+        # Paso 4: Distancias reales con Haversine usando coordenadas ORIGINALES
+        dist = GeoUtils.haversine_distance_array(lats[idx_u], lons[idx_u], lats[idx_v], lons[idx_v])
+
+        # Paso 5: Filtrar por distancia máxima si se especificó
+        if max_distance_km is not None:
+            mask = dist <= max_distance_km
+            idx_u, idx_v, dist = idx_u[mask], idx_v[mask], dist[mask]
+
+        # Paso 6: Cargar todas las aristas de una vez en arrays CSR
+        return CSRCityGraph.from_edges(ids[idx_u], ids[idx_v], dist)
+
+    @staticmethod
+    def patch_delaunay_graph(graph: CSRCityGraph,
+                             old_ids: Sequence[int], old_lats: Sequence[float], old_lons: Sequence[float],
+                             new_ids: Sequence[int], new_lats: Sequence[float], new_lons: Sequence[float],
+                             max_distance_km: float = None) -> Optional[CSRCityGraph]:
+        """Actualiza un grafo de Delaunay re-triangulando solo alrededor de las ciudades modificadas
+
+        Una ciudad nueva solo cambia aristas entre sus vecinos de Delaunay
+        (la cavidad que re-triangula) y una ciudad eliminada solo crea
+        aristas entre sus vecinos anteriores; una ciudad movida cuenta como
+        eliminada y agregada. Las aristas entre ciudades fuera de esas
+        vecindades se conservan tal cual, y las de las ciudades afectadas
+        se toman de una triangulación local certificada (ver _local_stars).
+
+        Args:
+            graph: Grafo construido con build_delaunay_graph_from_arrays sobre el dataset anterior
+            old_ids, old_lats, old_lons: Columnas del dataset anterior
+            new_ids, new_lats, new_lons: Columnas del dataset nuevo
+            max_distance_km: El mismo límite con el que se construyó `graph`
+
+        Returns:
+            CSRCityGraph igual al de una triangulación completa del dataset
+            nuevo, o None si no se puede parchear localmente (IDs o
+            coordenadas repetidas, menos de 3 ciudades o cambios que no
+            quedan acotados a una región)
+        """
+        import numpy as np
+        from scipy.spatial import ConvexHull, cKDTree
+
+        old_ids = np.asarray(old_ids, dtype=np.int64)
+        new_ids = np.asarray(new_ids, dtype=np.int64)
+        old_lats, old_lons = np.asarray(old_lats, dtype=np.float64), np.asarray(old_lons, dtype=np.float64)
+        new_lats, new_lons = np.asarray(new_lats, dtype=np.float64), np.asarray(new_lons, dtype=np.float64)
+        if (len(old_ids) < 3 or len(new_ids) < 3 or len(np.unique(old_ids)) != len(old_ids)
+                or len(np.unique(new_ids)) != len(new_ids)):
+            return None
+
+        # Ciudades que conservan ID y coordenadas; el resto se elimina o se agrega
+        _, old_common, new_common = np.intersect1d(old_ids, new_ids, assume_unique=True, return_indices=True)
+        same = ((old_lats[old_common] == new_lats[new_common])
+                & (old_lons[old_common] == new_lons[new_common]))
+        kept_old = np.zeros(len(old_ids), dtype=bool)
+        kept_old[old_common[same]] = True
+        kept_new = np.zeros(len(new_ids), dtype=bool)
+        kept_new[new_common[same]] = True
+        removed, added = np.flatnonzero(~kept_old), np.flatnonzero(~kept_new)
+        if len(removed) == 0 and len(added) == 0:
+            # Solo cambiaron atributos sin coordenadas (nombre, población...)
+            return graph
+
+        old_xy = GeoUtils.lat_lon_to_mercator_array(old_lats, old_lons)
+        new_xy = GeoUtils.lat_lon_to_mercator_array(new_lats, new_lons)
+        new_tree, new_hull = cKDTree(new_xy), ConvexHull(new_xy).vertices
+        if new_tree.query_pairs(0.0):
+            # Con puntos repetidos Qhull descarta uno de cada par, y la región
+            # local podría descartar uno distinto que la triangulación completa
+            return None
+
+        # Fila nueva de cada ID (-1 = ya no está o se movió)
+        order = np.argsort(new_ids)
+
+        def to_new_rows(ids: np.ndarray) -> np.ndarray:
+            positions = np.minimum(np.searchsorted(new_ids, ids, sorter=order), len(new_ids) - 1)
+            rows = order[positions]
+            return np.where((new_ids[rows] == ids) & kept_new[rows], rows, -1)
+
+        # Vecinos anteriores de las eliminadas y vecinos nuevos de las agregadas
+        affected = set(added.tolist())
+        if len(removed):
+            old_tree = cKDTree(old_xy)
+            if old_tree.query_pairs(0.0):
+                return None
+            old_stars = GraphBuilder._local_stars(old_xy, old_tree, ConvexHull(old_xy).vertices, removed)
+            if old_stars is None:
+                return None
+            neighbors = np.unique(np.concatenate(list(old_stars.values())))
+            rows = to_new_rows(old_ids[neighbors])
+            affected.update(rows[rows >= 0].tolist())
+        if len(added):
+            added_stars = GraphBuilder._local_stars(new_xy, new_tree, new_hull, added)
+            if added_stars is None:
+                return None
+            affected.update(np.concatenate(list(added_stars.values())).tolist())
+
+        # Las aristas de las ciudades afectadas salen de sus estrellas locales
+        affected_rows = np.fromiter(affected, dtype=np.int64, count=len(affected))
+        stars = GraphBuilder._local_stars(new_xy, new_tree, new_hull, affected_rows)
+        if stars is None:
+            return None
+        local_u = np.concatenate([np.full(len(star), center) for center, star in stars.items()])
+        local_v = np.concatenate(list(stars.values()))
+        n = len(new_ids)
+        keys = np.unique(np.minimum(local_u, local_v) * n + np.maximum(local_u, local_v))
+        local_u, local_v = keys // n, keys % n
+        local_dist = GeoUtils.haversine_distance_array(new_lats[local_u], new_lons[local_u],
+                                                       new_lats[local_v], new_lons[local_v])
+        if max_distance_km is not None:
+            mask = local_dist <= max_distance_km
+            local_u, local_v, local_dist = local_u[mask], local_v[mask], local_dist[mask]
+
+        # El resto de las aristas anteriores no cambia
+        is_affected = np.zeros(n, dtype=bool)
+        is_affected[affected_rows] = True
+        u_idx, v_idx, weights = graph.edge_arrays()
+        old_u, old_v = to_new_rows(graph.node_ids[u_idx]), to_new_rows(graph.node_ids[v_idx])
+        keep = (old_u >= 0) & (old_v >= 0)
+        keep[keep] = ~is_affected[old_u[keep]] & ~is_affected[old_v[keep]]
+
+        return CSRCityGraph.from_edges(
+            new_ids[np.concatenate((old_u[keep], local_u))],
+            new_ids[np.concatenate((old_v[keep], local_v))],
+            np.concatenate((weights[keep], local_dist)),
+        )
+
+    @staticmethod
+    def _local_stars(points, tree, hull, centers) -> Optional[Dict[int, "np.ndarray"]]:
+        """Vecinos de Delaunay de algunos puntos sin triangular el conjunto completo
+
+        Triangula los centros junto a sus vecinos más cercanos y a los
+        vértices de la envolvente convexa (así la región tiene la misma
+        envolvente que el conjunto completo). Un triángulo local es también
+        de la triangulación global si ningún otro punto cae dentro de su
+        circunferencia circunscrita (se consulta el k-d tree de todos los
+        puntos); si todos los triángulos alrededor de un centro pasan esa
+        prueba, sus vecinos locales son exactamente los globales. Los centros
+        que no se pueden certificar se reintentan con el doble de vecinos.
+
+        Args:
+            points: Coordenadas proyectadas (n, 2) de todos los puntos
+            tree: cKDTree sobre `points`
+            hull: Filas de los vértices de la envolvente convexa de `points`
+            centers: Filas de los puntos cuyos vecinos se buscan
+
+        Returns:
+            Diccionario fila -> filas vecinas, o None si la región necesaria
+            supera PATCH_MAX_REGION del conjunto
+        """
+        import numpy as np
+        from scipy.spatial import Delaunay
 
-                    # Usar coordenadas ORIGINALES para calcular distancia real
-                    lat1, lon1 = original_coords[idx_u]
-                    lat2, lon2 = original_coords[idx_v]
+        stars: Dict[int, np.ndarray] = {}
+        pending = np.unique(np.asarray(centers, dtype=np.int64))
+        k = GraphBuilder.PATCH_NEIGHBORS
+        while len(pending):
+            _, nearest = tree.query(points[pending], min(k, len(points)))
+            region = np.unique(np.concatenate((pending, nearest.ravel(), hull)))
+            if len(region) > GraphBuilder.PATCH_MAX_REGION * len(points):
+                return None
+            tri = Delaunay(points[region])
+            simplices = tri.simplices
+            local = np.searchsorted(region, pending)
+            is_pending = np.zeros(len(region), dtype=bool)
+            is_pending[local] = True
+            incident = np.flatnonzero(is_pending[simplices].any(axis=1))
 
-                    # Calcular distancia real en km usando Haversine
-                    dist = GeoUtils.haversine_distance(lat1, lon1, lat2, lon2)
+            # Circunferencia circunscrita de los triángulos alrededor de los centros
+            a, b, c = (points[region[simplices[incident, i]]] for i in range(3))
+            ab, ac = b - a, c - a
+            d = 2 * (ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0])
+            ab2, ac2 = (ab ** 2).sum(axis=1), (ac ** 2).sum(axis=1)
+            offset = np.column_stack(((ac[:, 1] * ab2 - ab[:, 1] * ac2) / d,
+                                      (ab[:, 0] * ac2 - ac[:, 0] * ab2) / d))
+            radius = np.hypot(offset[:, 0], offset[:, 1])
+            # Los vértices están sobre la circunferencia: solo cuentan los puntos estrictamente dentro
+            failed = tree.query_ball_point(a + offset, radius * (1 - 1e-9), return_length=True) > 0
 
-                    # Filtrar por distancia máxima si se especificó
-                    if max_distance_km is None or dist <= max_distance_km:
-                        graph.add_edge(id_map[idx_u], id_map[idx_v], dist)
+            # Un centro queda certificado si ninguno de sus triángulos falló
+            broken = np.zeros(len(region), dtype=bool)
+            broken[simplices[incident[failed]].ravel()] = True
+            certified = ~broken[local]
+            indptr, neighbors = tri.vertex_neighbor_vertices
+            for center, row in zip(pending[certified].tolist(), local[certified].tolist()):
+                stars[center] = region[neighbors[indptr[row]:indptr[row + 1]]]
 
-        return graph
+            pending = pending[~certified]
+            k *= 2
+        return stars
@@ -1,64 +1,533 @@
 """
 Servicio para manejar operaciones relacionadas con grafos de ciudades
 """
-from typing import List, Dict
-from graphmap.domain.model.entities.graph import CityGraph
+from typing import Callable, List, Dict, Optional, Tuple
+import numpy as np
+from config import settings
+from graphmap.domain.model.entities.city_spatial_index import CitySpatialIndex
+from graphmap.domain.model.entities.contraction_hierarchy import ContractionHierarchy
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+from graphmap.domain.model.entities.landmarks import LandmarkTable
+from graphmap.domain.model.entities.viewport_index import BoundingBox
 from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.contraction_hierarchy_builder import ContractionHierarchyBuilder
+from graphmap.domain.services.distance_matrix_service import DistanceMatrixService
 from graphmap.domain.services.graph_builder import GraphBuilder
+from graphmap.domain.services.landmark_builder import LandmarkBuilder
+from graphmap.domain.services.pathfinding_service import PathfindingService, RoutingEngine
+from graphmap.infrastructure.cache.dataset_snapshot import DatasetSnapshot, PublishedDataset
+from graphmap.infrastructure.cache.route_cache import MISS, RouteCache
+from graphmap.infrastructure.cache.single_flight import SingleFlight
+from graphmap.infrastructure.http import wire_format as wire
+from graphmap.infrastructure.http.static_payload import StaticPayload
+from graphmap.infrastructure.persistence.graph_artifact import (
+    contraction_hierarchy_artifact_name,
+    graph_artifact_name,
+    landmark_artifact_name,
+    load_contraction_hierarchy_artifact,
+    load_graph_artifact,
+    load_landmark_artifact,
+    save_contraction_hierarchy_artifact,
+    save_graph_artifact,
+    save_landmark_artifact,
+)
 
 
 class GraphService:
     """Servicio para construir y consultar el grafo de ciudades"""
 
-    # Caché estático del grafo para evitar reconstruirlo en cada request
-    _graph_cache: CityGraph = None
-    #  Cache de aristas formateadas (evita re-formatear en cada request)
-    _edges_cache: List[Dict] = None
+    # Un lock por caché: requests concurrentes con la caché vacía la construyen una sola vez
+    _builds = SingleFlight()
+    # Versión publicada del grafo. Datos base: el grafo CSR y la snapshot de
+    # ciudades con la que se construyó (las filas y IDs de todo lo derivado
+    # salen de esa tabla). Cachés derivadas, construidas a demanda:
+    #   edges              aristas formateadas (evita re-formatear en cada request)
+    #   edges_payload:*    respuesta de /graph/edges serializada y comprimida, por formato
+    #   landmarks          tablas de landmarks (ALT)
+    #   hierarchy          índice de Contraction Hierarchies
+    #   pathfinding        motor de rutas
+    #   node_spatial_index índice espacial sobre los nodos (ajustar coordenadas a ciudades)
+    #   row_nodes          nodo del grafo de cada fila de la tabla (-1 = sin aristas)
+    #   node_rows          fila de la tabla de ciudades de cada nodo
+    #   distance_matrix    servicio de distancias en lote (mantiene su pool de procesos)
+    #   analytics:*        métricas de GraphAnalyticsService (componentes, grados, centralidad)
+    # La versión de la snapshot es la versión del grafo: cambia cada vez que
+    # se (re)construye, y con ella las claves de las cachés de rutas y tiles.
+    # Se publica en PublishedDataset junto con sus ciudades (ver publish)
+    # Última versión asignada a una snapshot del grafo
+    _graph_version: int = 0
+    # Rutas ya calculadas, indexadas por par de ciudades, motor y versión del grafo
+    _route_cache = RouteCache(
+        settings.ROUTE_CACHE_SIZE,
+        settings.ROUTE_CACHE_TTL_SECONDS if settings.ROUTE_CACHE_TTL_SECONDS > 0 else None,
+    )
+
+    # 500 km filtra conexiones irreales (ej: Hawaii-California)
+    MAX_DISTANCE_KM = 500
 
     def __init__(self):
         self.city_service = CityService()
 
-    def build_city_graph(self) -> CityGraph:
-        """Construye el grafo de ciudades usando triangulación de Delaunay (con caché)"""
-        # Retornar desde caché si ya existe
-        if GraphService._graph_cache is not None:
-            return GraphService._graph_cache
+    def get_snapshot(self) -> DatasetSnapshot:
+        """Obtiene la versión publicada del grafo (la carga en el primer uso)
+
+        Un request que combina varias cachés debe tomar la snapshot una sola
+        vez, igual que con CityService.get_snapshot.
+
+        Returns:
+            DatasetSnapshot con graph y cities (snapshot de ciudades)
+        """
+        snapshot = PublishedDataset.graph()
+        if snapshot is not None:
+            return snapshot
+
+        with GraphService._builds.lock("graph"):
+            # Otro hilo pudo haberlo construido mientras se esperaba el lock
+            if PublishedDataset.graph() is None:
+                cities = self.city_service.get_snapshot()
+                self.publish(self.create_snapshot(self.load_graph(cities), cities))
+            return PublishedDataset.graph()
+
+    def get_published_snapshot(self) -> Optional[DatasetSnapshot]:
+        """Snapshot publicada, o None si el grafo todavía no se cargó (no lo carga)"""
+        return PublishedDataset.graph()
+
+    def load_graph(self, cities: DatasetSnapshot,
+                   build: Optional[Callable[[], CSRCityGraph]] = None) -> CSRCityGraph:
+        """Carga el grafo de una versión del dataset
+
+        Usa el artefacto precompilado si existe para ese dataset; si no,
+        lo construye y lo persiste.
+
+        Args:
+            cities: Snapshot de ciudades
+            build: Construcción alternativa (ej: parche local al recargar);
+                   por defecto triangulación de Delaunay completa
+
+        Returns:
+            CSRCityGraph del dataset
+        """
+        store = self.city_service.artifact_store
+        dataset_hash = cities["dataset_hash"]
+        return store.load_or_build(
+            graph_artifact_name(dataset_hash, self.MAX_DISTANCE_KM),
+            load=lambda: load_graph_artifact(store, dataset_hash, self.MAX_DISTANCE_KM),
+            build=build or (lambda: self._build_delaunay_graph(cities)),
+            save=lambda built: save_graph_artifact(store, built, dataset_hash, self.MAX_DISTANCE_KM),
+        )
+
+    def create_snapshot(self, graph: CSRCityGraph, cities: DatasetSnapshot) -> DatasetSnapshot:
+        """Crea la snapshot (con la siguiente versión del grafo) sin publicarla"""
+        with GraphService._builds.lock("version"):
+            GraphService._graph_version += 1
+            return DatasetSnapshot(GraphService._graph_version, graph=graph, cities=cities)
+
+    def publish(self, snapshot: DatasetSnapshot) -> None:
+        """Reemplaza la versión publicada del grafo y, en la misma asignación, la de ciudades
 
-        # Cargar ciudades
-        cities = self.city_service.load_cities_from_excel()
+        Publica el par (snapshot["cities"], snapshot) en PublishedDataset:
+        /cities/*, /graph/* y /tiles/* pasan a la versión nueva a la vez.
+        Los requests en curso terminan con la snapshot que ya tomaron. Las
+        rutas cacheadas de versiones anteriores ya no se pueden pedir, así
+        que se descartan; el pool de procesos de la versión anterior se
+        libera sin cancelar lo que ya está calculando.
 
-        # Preparar datos: (id, lat, lng)
-        cities_data = [(city.id, city.lat, city.lng) for city in cities]
+        Args:
+            snapshot: Snapshot creada con create_snapshot
+        """
+        previous = PublishedDataset.graph()
+        PublishedDataset.publish(snapshot["cities"], snapshot)
+        GraphService._route_cache.clear()
+        if previous is not None and previous.get("distance_matrix") is not None:
+            previous["distance_matrix"].close()
+
+    def build_city_graph(self, snapshot: Optional[DatasetSnapshot] = None) -> CSRCityGraph:
+        """Obtiene el grafo de ciudades de una snapshot
+
+        Solo lee el grafo de la snapshot indicada o de la publicada; la carga
+        del artefacto o la triangulación ocurren al crear la snapshot (ver
+        get_snapshot y load_graph).
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+        """
+        return (snapshot or self.get_snapshot())["graph"]
+
+    def is_loaded(self) -> bool:
+        """True si el grafo y sus aristas formateadas ya están en memoria"""
+        snapshot = self.get_published_snapshot()
+        return snapshot is not None and "edges" in snapshot
+
+    def _build_delaunay_graph(self, cities: DatasetSnapshot) -> CSRCityGraph:
+        """Construye el grafo desde cero con triangulación de Delaunay"""
+        # Cargar ciudades (tabla columnar)
+        table = cities["table"]
 
         # Construir grafo usando el builder con límite de distancia
-        # 500 km filtra conexiones irreales (ej: Hawaii-California)
-        graph = GraphBuilder.build_delaunay_graph(cities_data, max_distance_km=500)
+        return GraphBuilder.build_delaunay_graph_from_arrays(
+            table.ids, table.lat, table.lng, max_distance_km=self.MAX_DISTANCE_KM
+        )
+
+    def get_landmarks(self, snapshot: Optional[DatasetSnapshot] = None) -> Optional[LandmarkTable]:
+        """Obtiene las tablas de landmarks para la heurística ALT (con caché)
+
+        Se cargan del artefacto asociado al grafo; si no existe, se calculan
+        (k Dijkstra con SciPy) y se persisten junto al grafo.
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            LandmarkTable, o None si ALT está deshabilitado (ALT_LANDMARKS=0)
+        """
+        num_landmarks = settings.ALT_LANDMARKS
+        if num_landmarks <= 0:
+            return None
+        snapshot = snapshot or self.get_snapshot()
+
+        def build() -> LandmarkTable:
+            graph = snapshot["graph"]
+            store = self.city_service.artifact_store
+            dataset_hash = snapshot["cities"]["dataset_hash"]
+            return store.load_or_build(
+                landmark_artifact_name(dataset_hash, self.MAX_DISTANCE_KM, num_landmarks),
+                load=lambda: load_landmark_artifact(store, dataset_hash, self.MAX_DISTANCE_KM, num_landmarks),
+                build=lambda: LandmarkBuilder.build(graph, num_landmarks),
+                save=lambda built: save_landmark_artifact(
+                    store, built, dataset_hash, self.MAX_DISTANCE_KM, num_landmarks
+                ),
+            )
+
+        return snapshot.get_or_build("landmarks", build)
+
+    def get_contraction_hierarchy(self, snapshot: Optional[DatasetSnapshot] = None) -> Optional[ContractionHierarchy]:
+        """Obtiene el índice de Contraction Hierarchies (con caché)
+
+        Se carga del artefacto asociado al grafo; si no existe se construye
+        (varios segundos: conviene precompilarlo con scripts.compile_data).
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            ContractionHierarchy, o None si CH está deshabilitado (CH_ENABLED=false)
+        """
+        if not settings.CH_ENABLED:
+            return None
+        snapshot = snapshot or self.get_snapshot()
+
+        def build() -> ContractionHierarchy:
+            graph = snapshot["graph"]
+            store = self.city_service.artifact_store
+            dataset_hash = snapshot["cities"]["dataset_hash"]
+            return store.load_or_build(
+                contraction_hierarchy_artifact_name(dataset_hash, self.MAX_DISTANCE_KM),
+                load=lambda: load_contraction_hierarchy_artifact(store, dataset_hash, self.MAX_DISTANCE_KM),
+                build=lambda: ContractionHierarchyBuilder.build(graph),
+                save=lambda built: save_contraction_hierarchy_artifact(
+                    store, built, dataset_hash, self.MAX_DISTANCE_KM
+                ),
+            )
+
+        return snapshot.get_or_build("hierarchy", build)
+
+    def get_pathfinding_service(self, snapshot: Optional[DatasetSnapshot] = None) -> PathfindingService:
+        """Retorna el servicio de rutas precomputado para el grafo cacheado
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+        """
+        snapshot = snapshot or self.get_snapshot()
+        return snapshot.get_or_build("pathfinding", lambda: PathfindingService(
+            snapshot["graph"], snapshot["cities"]["table"],
+            self.get_landmarks(snapshot), self.get_contraction_hierarchy(snapshot),
+        ))
+
+    def find_shortest_path(self, start_id: int, goal_id: int,
+                           engine: RoutingEngine = RoutingEngine.ASTAR,
+                           snapshot: Optional[DatasetSnapshot] = None) -> Optional[Dict]:
+        """Camino más corto entre dos ciudades, pasando por la caché de rutas
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+            engine: Algoritmo a utilizar
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            Mismo contrato que `PathfindingService.find_path`
+
+        Raises:
+            ValueError: Si el motor no está disponible para este grafo
+        """
+        # La versión de la caché es la de la snapshot con la que se calcula la ruta
+        snapshot = snapshot or self.get_snapshot()
+        version = snapshot.version
+        pathfinding = self.get_pathfinding_service(snapshot)
+
+        result = GraphService._route_cache.get(start_id, goal_id, engine.value, version)
+        if result is MISS:
+            result = pathfinding.find_path(start_id, goal_id, engine)
+            GraphService._route_cache.put(start_id, goal_id, engine.value, version, result)
+        return result
+
+    def get_unreachable_reason(self, start_id: int, goal_id: int,
+                               snapshot: Optional[DatasetSnapshot] = None) -> Optional[str]:
+        """Motivo por el que no hay camino entre dos ciudades (None si lo hay)
+
+        Ver `PathfindingService.unreachable_reason`: distingue ciudades que
+        no existen, ciudades sin aristas y ciudades en componentes distintas.
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+            snapshot: Versión del grafo (None = la publicada); debe ser la
+                      misma con la que se buscó la ruta
+        """
+        return self.get_pathfinding_service(snapshot).unreachable_reason(start_id, goal_id)
+
+    def get_node_spatial_index(self, snapshot: Optional[DatasetSnapshot] = None) -> CitySpatialIndex:
+        """Obtiene el índice espacial de los nodos del grafo (con caché)
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            CitySpatialIndex cuyas filas son IDs de ciudades con al menos una arista
+        """
+        snapshot = snapshot or self.get_snapshot()
+
+        def build() -> CitySpatialIndex:
+            table = snapshot["cities"]["table"]
+            rows = self.get_node_rows(snapshot)
+            return CitySpatialIndex(table.lat[rows], table.lng[rows], rows=snapshot["graph"].node_ids)
 
-        # Guardar en caché
-        GraphService._graph_cache = graph
-        return graph
+        return snapshot.get_or_build("node_spatial_index", build)
 
-    def get_graph_edges(self) -> List[Dict]:
+    def get_node_rows(self, snapshot: Optional[DatasetSnapshot] = None) -> np.ndarray:
+        """Fila de la tabla de ciudades de cada nodo del grafo (con caché)
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            Array alineado con graph.node_ids
+        """
+        snapshot = snapshot or self.get_snapshot()
+
+        def build() -> np.ndarray:
+            table = snapshot["cities"]["table"]
+            # Los IDs de la tabla no están ordenados
+            order = np.argsort(table.ids)
+            return order[np.searchsorted(table.ids, snapshot["graph"].node_ids, sorter=order)]
+
+        return snapshot.get_or_build("node_rows", build)
+
+    def get_graph_version(self) -> int:
+        """Versión del grafo publicado (cambia cada vez que se reconstruye)"""
+        return self.get_snapshot().version
+
+    def snap_to_graph(self, lat: float, lng: float,
+                      snapshot: Optional[DatasetSnapshot] = None) -> Optional[Tuple[int, float]]:
+        """Ajusta una coordenada a la ciudad del grafo más cercana
+
+        Args:
+            lat: Latitud en grados
+            lng: Longitud en grados
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            Tupla (ID de la ciudad, distancia en km), o None si el grafo está vacío
+        """
+        nearest = self.get_node_spatial_index(snapshot).nearest(lat, lng, k=1)
+        return nearest[0] if nearest else None
+
+    def get_route_cache_stats(self) -> Dict:
+        """Retorna los contadores de la caché de rutas y la versión del grafo"""
+        snapshot = self.get_published_snapshot()
+        return {**GraphService._route_cache.stats(), "graph_version": snapshot.version if snapshot else 0}
+
+    def get_distance_matrix_service(self, snapshot: Optional[DatasetSnapshot] = None) -> DistanceMatrixService:
+        """Retorna el servicio de distancias y rutas en lote para el grafo cacheado
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+        """
+        snapshot = snapshot or self.get_snapshot()
+        # get_or_build lo construye una sola vez: dos pools dejarían uno huérfano
+        return snapshot.get_or_build("distance_matrix", lambda: DistanceMatrixService(
+            snapshot["graph"], snapshot["cities"]["table"].ids.tolist(), workers=settings.ROUTING_WORKERS
+        ))
+
+    def get_graph_edges(self, snapshot: Optional[DatasetSnapshot] = None) -> List[Dict]:
         """ Retorna aristas con caché de formateo"""
-        
-        # Usar caché si existe
-        if GraphService._edges_cache is not None:
-            return GraphService._edges_cache
-        
-        # Construir y formatear solo una vez
-        graph = self.build_city_graph()
-        edges = graph.get_edges()
-        
-        GraphService._edges_cache = [
+        snapshot = snapshot or self.get_snapshot()
+
+        # Construir y formatear solo una vez por versión del grafo
+        def build() -> List[Dict]:
+            return [
+                {
+                    "source": u,
+                    "target": v,
+                    "distance": round(dist, 6)
+                }
+                for u, v, dist in snapshot["graph"].get_edges()
+            ]
+
+        return snapshot.get_or_build("edges", build)
+
+    @staticmethod
+    def to_map_data(edges: List[Dict]) -> Dict:
+        """
+        Formatea aristas con los datos mínimos para el mapa
+
+        Returns:
+            Diccionario con la lista de aristas (source, target) y el total
+        """
+        optimized_edges = [
             {
-                "source": u,
-                "target": v,
-                "distance": round(dist, 6)
+                "source": edge["source"],
+                "target": edge["target"]
             }
-            for u, v, dist in edges
+            for edge in edges
         ]
-        
-        return GraphService._edges_cache
+        return {"edges": optimized_edges, "total_edges": len(optimized_edges)}
+
+    def get_edges_payload(self, wire_format: str = wire.JSON,
+                          snapshot: Optional[DatasetSnapshot] = None) -> StaticPayload:
+        """
+        Obtiene la respuesta completa de /graph/edges ya serializada y comprimida (con caché)
+
+        Args:
+            wire_format: Formato de la respuesta (wire.JSON, wire.BINARY o wire.ARROW)
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            StaticPayload cuyo Last-Modified es la fecha del dataset
+        """
+        snapshot = snapshot or self.get_snapshot()
+
+        def build() -> StaticPayload:
+            options = dict(
+                last_modified=snapshot["cities"]["last_modified"],
+                cache_control=f"public, max-age={settings.STATIC_CACHE_MAX_AGE}",
+                vary="Accept, Accept-Encoding",
+            )
+            if wire_format == wire.JSON:
+                return StaticPayload.from_json(self.to_map_data(self.get_graph_edges(snapshot)), **options)
+            graph = snapshot["graph"]
+            u_idx, v_idx, _ = graph.edge_arrays()
+            body = wire.encode_edges(graph.node_ids[u_idx], graph.node_ids[v_idx], wire_format)
+            return StaticPayload(body, media_type=wire.MEDIA_TYPES[wire_format], **options)
+
+        return snapshot.get_or_build(f"edges_payload:{wire_format}", build)
+
+    def _get_row_nodes(self, snapshot: DatasetSnapshot) -> np.ndarray:
+        """Índice de nodo del grafo de cada fila de la tabla de ciudades (con caché)"""
+        def build() -> np.ndarray:
+            graph = snapshot["graph"]
+            table = snapshot["cities"]["table"]
+            positions = np.searchsorted(graph.node_ids, table.ids)
+            found = positions < graph.num_nodes()
+            found[found] = graph.node_ids[positions[found]] == table.ids[found]
+            return np.where(found, positions, -1)
+
+        return snapshot.get_or_build("row_nodes", build)
+
+    def _edges_in_view(self, snapshot: DatasetSnapshot, bbox: Optional[BoundingBox],
+                       zoom: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aristas con ambos extremos visibles, como arrays
+
+        Returns:
+            Tupla (índice denso origen, índice denso destino, posición en el CSR)
+        """
+        graph = snapshot["graph"]
+        rows = self.city_service.get_viewport_index(snapshot["cities"]).query(bbox, zoom)
+        nodes = self._get_row_nodes(snapshot)[rows]
+        nodes = nodes[nodes >= 0]
+
+        visible = np.zeros(graph.num_nodes(), dtype=bool)
+        visible[nodes] = True
+
+        # Aristas salientes de los nodos visibles, sin recorrer el resto del CSR
+        starts = graph.indptr[nodes]
+        counts = graph.indptr[nodes + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + offsets
+        sources = np.repeat(nodes, counts)
+        targets = graph.indices[positions]
+
+        # Cada arista no dirigida una sola vez, y solo si el otro extremo también se ve
+        keep = visible[targets] & (sources < targets)
+        return sources[keep], targets[keep], positions[keep]
+
+    def get_graph_edges_in_view(self, bbox: Optional[BoundingBox] = None,
+                                zoom: Optional[int] = None) -> List[Dict]:
+        """
+        Aristas cuyos dos extremos son ciudades visibles en el viewport
+
+        Las ciudades visibles son las mismas que devuelve
+        CityService.cities_in_view para ese bbox y zoom, así que el tamaño
+        del resultado depende de lo que hay en pantalla.
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng); None = mundo entero
+            zoom: Nivel de zoom del mapa (nivel de detalle); None = todas las ciudades
+
+        Returns:
+            Lista de aristas con source, target y distance
+        """
+        snapshot = self.get_snapshot()
+        graph = snapshot["graph"]
+        sources, targets, positions = self._edges_in_view(snapshot, bbox, zoom)
+        return [
+            {"source": u, "target": v, "distance": round(dist, 6)}
+            for u, v, dist in zip(graph.node_ids[sources].tolist(),
+                                  graph.node_ids[targets].tolist(),
+                                  graph.weights[positions].tolist())
+        ]
+
+    def encode_edges_in_view(self, bbox: Optional[BoundingBox], zoom: Optional[int], wire_format: str) -> bytes:
+        """
+        Aristas visibles en el viewport codificadas en un formato binario
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng); None = mundo entero
+            zoom: Nivel de zoom del mapa (nivel de detalle); None = todas las ciudades
+            wire_format: wire.BINARY o wire.ARROW
+
+        Returns:
+            Bytes con source y target de cada arista
+        """
+        snapshot = self.get_snapshot()
+        graph = snapshot["graph"]
+        sources, targets, _ = self._edges_in_view(snapshot, bbox, zoom)
+        return wire.encode_edges(graph.node_ids[sources], graph.node_ids[targets], wire_format)
+
+    def get_graph_edge_ids(self, bbox: Optional[BoundingBox] = None,
+                           zoom: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aristas del grafo (o del viewport) como arrays de IDs de ciudad
+
+        Es la parte costosa de la respuesta en streaming: se calcula de una
+        vez (en el pool de cómputo) y después solo se serializan las líneas.
+        Sin viewport sigue el mismo orden que get_graph_edges.
+
+        Args:
+            bbox: (min_lat, min_lng, max_lat, max_lng); None = mundo entero
+            zoom: Nivel de zoom del mapa (nivel de detalle); None = todas las ciudades
+
+        Returns:
+            Tupla (IDs origen, IDs destino)
+        """
+        snapshot = self.get_snapshot()
+        graph = snapshot["graph"]
+        if bbox is not None or zoom is not None:
+            sources, targets, _ = self._edges_in_view(snapshot, bbox, zoom)
+        else:
+            sources, targets, _ = graph.edge_arrays()
+        return graph.node_ids[sources], graph.node_ids[targets]
 
     def get_graph_summary(self) -> Dict:
         """Retorna resumen del grafo: número de nodos y aristas"""
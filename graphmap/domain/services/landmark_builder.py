@@ -0,0 +1,58 @@
+"""
+Servicio para seleccionar landmarks y precomputar sus distancias (ALT)
+"""
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+from graphmap.domain.model.entities.landmarks import LandmarkTable
+
+
+class LandmarkBuilder:
+    """Constructor de tablas de landmarks para la heurística ALT"""
+
+    @staticmethod
+    def build(graph: CSRCityGraph, num_landmarks: int) -> LandmarkTable:
+        """Selecciona landmarks por farthest-point y calcula Dijkstra desde cada uno
+
+        La selección parte de la componente conexa más grande: el primer
+        landmark es el nodo más lejano a un nodo de esa componente y cada
+        siguiente es el que maximiza la distancia mínima a los ya elegidos.
+
+        Args:
+            graph: Grafo en formato CSR
+            num_landmarks: Número de landmarks (k)
+
+        Returns:
+            LandmarkTable con k filas de distancias
+        """
+        # Lazy imports para reducir el tiempo de import de la app en serverless.
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import dijkstra
+
+        n = graph.num_nodes()
+        if n == 0 or num_landmarks <= 0:
+            return LandmarkTable(np.empty(0, dtype=np.int32), np.empty((0, n)))
+
+        matrix = csr_matrix((graph.weights, graph.indices, graph.indptr), shape=(n, n))
+
+        labels = graph.components
+        seed = int(np.argmax(labels == np.bincount(labels).argmax()))
+
+        def farthest(distances: np.ndarray) -> int:
+            # Los nodos inalcanzables (inf) nunca se eligen
+            return int(np.argmax(np.where(np.isfinite(distances), distances, -1.0)))
+
+        landmark = farthest(dijkstra(matrix, directed=False, indices=seed))
+        landmarks, rows = [], []
+        min_distance = np.full(n, np.inf)
+
+        for _ in range(min(num_landmarks, n)):
+            row = dijkstra(matrix, directed=False, indices=landmark)
+            landmarks.append(landmark)
+            rows.append(row)
+            np.minimum(min_distance, row, out=min_distance)
+            landmark = farthest(min_distance)
+            if min_distance[landmark] == 0.0:
+                # La componente ya está cubierta: no hay más candidatos útiles
+                break
+
+        return LandmarkTable(np.array(landmarks, dtype=np.int32), np.vstack(rows))
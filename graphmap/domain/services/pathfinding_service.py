@@ -10,41 +10,149 @@ ANÁLISIS DE COMPLEJIDAD BIG O:
      * log V proviene de las operaciones del heap (heappush/heappop)
 
    - Complejidad espacial: O(V)
-     * Almacena g_score, f_score, came_from para cada nodo visitado
-     * El heap open_set puede contener hasta V elementos
+     * g_score, came_from y closed son arrays planos indexados por nodo denso,
+       reservados una vez por hilo y reutilizados entre consultas
+     * El heap open_set puede contener hasta E elementos (entradas obsoletas
+       se descartan al extraerlas gracias al conjunto cerrado)
 
 2. HEURÍSTICA HAVERSINE:
-   - Complejidad: O(1) - cálculo trigonométrico constante
+   - Complejidad: O(1) - cálculo trigonométrico con `math` sobre
+     coordenadas en radianes precalculadas (sin lookups de objetos City)
 
 3. RECONSTRUCCIÓN DEL CAMINO:
    - Complejidad: O(k) donde k = longitud del camino (k << V)
 
 4. LOOKUP DE CIUDAD POR ID:
-   - Complejidad: O(1) - acceso directo por hash map
+   - Complejidad: O(1) - acceso directo por hash map (construido una sola vez)
+
+5. HEURÍSTICA ALT (opcional):
+   - Preprocesamiento: k Dijkstra desde landmarks, O(k E log V), persistido
+   - Por consulta: O(k V) vectorizado para acotar todos los nodos de una vez,
+     luego O(1) por nodo: max(Haversine, max_L |d(L, t) - d(L, v)|)
+
+6. CONTRACTION HIERARCHIES (opcional):
+   - Preprocesamiento: contracción de todos los nodos con atajos, persistido
+   - Por consulta: Dijkstra bidireccional ascendente; explora solo unos
+     cientos de nodos independientemente del largo de la ruta
+
+7. BÚSQUEDA BIDIRECCIONAL (opcional):
+   - Dijkstra simultáneo desde origen y destino; A* bidireccional con
+     potenciales balanceados p(v) = (h_t(v) - h_s(v)) / 2, consistentes en
+     ambos sentidos. Dos discos de radio ~d/2 en lugar de uno de radio d.
 
 TOTAL: O(E log V) - Óptimo para búsqueda de caminos en grafos ponderados
 """
 import heapq
-from typing import List, Dict, Optional
-from graphmap.domain.model.entities.graph import CityGraph
-from graphmap.domain.model.entities.city import City
+import math
+import threading
+from enum import Enum
+from typing import Callable, List, Dict, Optional
+
+import numpy as np
+
+from graphmap.domain.model.entities.contraction_hierarchy import ContractionHierarchy
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+from graphmap.domain.model.entities.city_table import CityTable
 from graphmap.domain.model.entities.geo_utils import GeoUtils
+from graphmap.domain.model.entities.landmarks import LandmarkTable
+
+
+class RoutingEngine(str, Enum):
+    """Algoritmos disponibles para /graph/shortest-path"""
+    ASTAR = "astar"
+    ALT = "alt"
+    CH = "ch"
+    BIDIJKSTRA = "bidijkstra"
+    BIASTAR = "biastar"
+
+
+class SearchSpace:
+    """Arrays de trabajo de una búsqueda, reutilizables entre consultas
+
+    En lugar de reinicializar O(V) posiciones por consulta, cada búsqueda
+    incrementa `generation`: una posición solo es válida si su sello
+    coincide con la generación actual.
+    """
+
+    __slots__ = ("g_score", "came_from", "seen", "closed", "generation")
+
+    def __init__(self, size: int):
+        self.g_score: List[float] = [math.inf] * size
+        self.came_from: List[int] = [-1] * size
+        # Generación en la que el nodo fue alcanzado / expandido
+        self.seen: List[int] = [0] * size
+        self.closed: List[int] = [0] * size
+        self.generation = 0
+
+    def reset(self) -> int:
+        """Invalida todos los valores de la búsqueda anterior en O(1)"""
+        self.generation += 1
+        return self.generation
 
 
 class PathfindingService:
-    """Servicio para cálculo de caminos óptimos entre ciudades usando A*"""
+    """Servicio para cálculo de caminos óptimos entre ciudades usando A*
 
-    def __init__(self, graph: CityGraph, cities: List[City]):
+    Se construye una vez por grafo: todas las estructuras auxiliares
+    (índices densos, coordenadas en radianes, CSR como listas Python)
+    se preparan en el constructor y se reutilizan entre consultas.
+    """
+
+    def __init__(self, graph: CSRCityGraph, cities: CityTable, landmarks: Optional[LandmarkTable] = None,
+                 hierarchy: Optional[ContractionHierarchy] = None):
         """
         Inicializa el servicio de búsqueda de caminos
 
         Args:
             graph: Grafo de ciudades construido con Delaunay
-            cities: Lista completa de ciudades del dataset
+            cities: Tabla columnar con todas las ciudades del dataset
+            landmarks: Tablas de landmarks para el modo ALT (None = deshabilitado)
+            hierarchy: Índice de Contraction Hierarchies (None = deshabilitado)
         """
         self.graph = graph
-        # Mapeo id -> city para acceso O(1)
-        self.city_id_map = {city.id: city for city in cities}
+        self.landmarks = landmarks
+        self.hierarchy = hierarchy
+        self.cities = cities
+        # Mapeo id -> fila de la tabla para acceso O(1) (compartido con la tabla)
+        self.city_rows: Dict[int, int] = cities.row_index
+
+        # Índice denso de cada ciudad presente en el grafo
+        node_ids = graph.node_ids.tolist()
+        self.node_index: Dict[int, int] = {node: i for i, node in enumerate(node_ids)}
+        self.node_ids = node_ids
+        # Componente conexa de cada nodo (precalculada con el grafo)
+        self.components: List[int] = graph.components.tolist()
+
+        # CSR como listas Python: el acceso escalar es más rápido que sobre arrays NumPy
+        self.indptr: List[int] = graph.indptr.tolist()
+        self.indices: List[int] = graph.indices.tolist()
+        self.weights: List[float] = graph.weights.tolist()
+
+        # Coordenadas precalculadas por nodo (radianes y coseno de la latitud)
+        rows = [self.city_rows[node] for node in node_ids]
+        self.lat_rad: List[float] = [math.radians(lat) for lat in cities.lat[rows].tolist()]
+        self.lng_rad: List[float] = [math.radians(lng) for lng in cities.lng[rows].tolist()]
+        self.cos_lat: List[float] = [math.cos(lat) for lat in self.lat_rad]
+        # Mismas coordenadas como arrays para cálculos vectorizados (ALT)
+        self._lat_rad_array = np.array(self.lat_rad)
+        self._lng_rad_array = np.array(self.lng_rad)
+
+        # Arrays de trabajo por hilo (el servicio se comparte entre requests)
+        self._local = threading.local()
+
+    def _search_space(self, backward: bool = False) -> SearchSpace:
+        """Retorna los arrays de trabajo del hilo actual, listos para una nueva búsqueda
+
+        Args:
+            backward: True para el juego de arrays de la búsqueda inversa (bidireccional)
+        """
+        slot = "backward_space" if backward else "space"
+        space = getattr(self._local, slot, None)
+        if space is None:
+            space = SearchSpace(len(self.node_ids))
+            setattr(self._local, slot, space)
+        space.reset()
+        return space
 
     def _heuristic(self, city_id1: int, city_id2: int) -> float:
         """
@@ -60,12 +168,78 @@ class PathfindingService:
         Returns:
             Distancia en km (heurística admisible)
         """
-        city1 = self.city_id_map[city_id1]
-        city2 = self.city_id_map[city_id2]
-        return GeoUtils.haversine_distance(
-            city1.lat, city1.lng,
-            city2.lat, city2.lng
-        )
+        return self._haversine_to(self.node_index[city_id2])(self.node_index[city_id1])
+
+    def _haversine_to(self, goal: int) -> Callable[[int], float]:
+        """
+        Crea la función heurística Haversine hacia un nodo objetivo fijo
+
+        Args:
+            goal: Índice denso del nodo objetivo
+
+        Returns:
+            Función índice -> distancia en km hasta el objetivo
+        """
+        lat_rad, lng_rad, cos_lat = self.lat_rad, self.lng_rad, self.cos_lat
+        goal_lat, goal_lng, goal_cos = lat_rad[goal], lng_rad[goal], cos_lat[goal]
+        diameter = 2 * GeoUtils.EARTH_RADIUS_KM
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+
+        def heuristic(node: int) -> float:
+            sin_dlat = sin((goal_lat - lat_rad[node]) * 0.5)
+            sin_dlng = sin((goal_lng - lng_rad[node]) * 0.5)
+            a = sin_dlat * sin_dlat + cos_lat[node] * goal_cos * sin_dlng * sin_dlng
+            return diameter * asin(sqrt(min(a, 1.0)))
+
+        return heuristic
+
+    def _alt_to(self, goal: int) -> Callable[[int], float]:
+        """
+        Crea la heurística ALT hacia un nodo objetivo fijo
+
+        Calcula de una vez (vectorizado) max(Haversine, cota de landmarks)
+        para todos los nodos; durante la búsqueda cada evaluación es un
+        acceso a lista.
+
+        Args:
+            goal: Índice denso del nodo objetivo
+
+        Returns:
+            Función índice -> cota inferior en km hasta el objetivo
+        """
+        lat, lng = self._lat_rad_array, self._lng_rad_array
+        sin_dlat = np.sin((lat[goal] - lat) * 0.5)
+        sin_dlng = np.sin((lng[goal] - lng) * 0.5)
+        a = sin_dlat ** 2 + np.cos(lat) * math.cos(lat[goal]) * sin_dlng ** 2
+        haversine = 2 * GeoUtils.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        bounds = np.maximum(haversine, self.landmarks.lower_bounds_to(goal))
+        return bounds.tolist().__getitem__
+
+    def find_path(self, start_id: int, goal_id: int, engine: RoutingEngine = RoutingEngine.ASTAR) -> Optional[Dict]:
+        """
+        Calcula el camino más corto con el motor indicado
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+            engine: Algoritmo a utilizar
+
+        Returns:
+            Mismo contrato que `a_star`
+
+        Raises:
+            ValueError: Si el motor no está disponible para este grafo
+        """
+        if engine == RoutingEngine.ALT:
+            return self.alt_a_star(start_id, goal_id)
+        if engine == RoutingEngine.CH:
+            return self.contraction_hierarchy_query(start_id, goal_id)
+        if engine == RoutingEngine.BIDIJKSTRA:
+            return self.bidirectional_dijkstra(start_id, goal_id)
+        if engine == RoutingEngine.BIASTAR:
+            return self.bidirectional_a_star(start_id, goal_id)
+        return self.a_star(start_id, goal_id)
 
     def a_star(self, start_id: int, goal_id: int) -> Optional[Dict]:
         """
@@ -77,7 +251,7 @@ class PathfindingService:
         - log V viene de las operaciones de heap (heappush/heappop)
 
         COMPLEJIDAD ESPACIAL: O(V)
-        - Almacena g_score, f_score, came_from, open_set
+        - Almacena g_score, came_from, closed, open_set
 
         Args:
             start_id: ID de la ciudad origen
@@ -90,63 +264,312 @@ class PathfindingService:
                 - cities_explored: Número de ciudades exploradas
             None si no hay camino o las ciudades no existen
         """
-        # Validar que las ciudades existan en el grafo - O(1)
-        if start_id not in self.city_id_map or goal_id not in self.city_id_map:
+        return self._route(start_id, goal_id, lambda start, goal: self._search(start, goal, self._haversine_to(goal)))
+
+    def alt_a_star(self, start_id: int, goal_id: int) -> Optional[Dict]:
+        """
+        A* con heurística ALT: max(Haversine, cotas por desigualdad triangular)
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+
+        Returns:
+            Mismo contrato que `a_star`
+
+        Raises:
+            ValueError: Si el servicio se creó sin tablas de landmarks
+        """
+        if self.landmarks is None or len(self.landmarks) == 0:
+            raise ValueError("ALT heuristic is not available: no landmarks were precomputed")
+
+        return self._route(start_id, goal_id, lambda start, goal: self._search(start, goal, self._alt_to(goal)))
+
+    def contraction_hierarchy_query(self, start_id: int, goal_id: int) -> Optional[Dict]:
+        """
+        Camino más corto usando el índice de Contraction Hierarchies
+
+        `cities_explored` reporta los nodos asentados en ambas búsquedas ascendentes.
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+
+        Returns:
+            Mismo contrato que `a_star`
+
+        Raises:
+            ValueError: Si el servicio se creó sin índice CH
+        """
+        if self.hierarchy is None:
+            raise ValueError("Contraction Hierarchies engine is not available: index was not built")
+
+        def search(start: int, goal: int) -> Optional[Dict]:
+            found = self.hierarchy.query(start, goal)
+            if found is None:
+                return None
+            distance, nodes, settled = found
+            return self._build_result([self.node_ids[i] for i in nodes], distance, settled)
+
+        return self._route(start_id, goal_id, search)
+
+    def bidirectional_dijkstra(self, start_id: int, goal_id: int) -> Optional[Dict]:
+        """
+        Dijkstra bidireccional: búsquedas simultáneas desde origen y destino
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+
+        Returns:
+            Mismo contrato que `a_star` (`cities_explored` suma ambas direcciones)
+        """
+        def search(start: int, goal: int) -> Optional[Dict]:
+            return self._bidirectional_search(start, goal, lambda node: 0.0)
+
+        return self._route(start_id, goal_id, search)
+
+    def bidirectional_a_star(self, start_id: int, goal_id: int) -> Optional[Dict]:
+        """
+        A* bidireccional con potenciales balanceados
+
+        Con h_t = Haversine al destino y h_s = Haversine al origen, el
+        potencial p(v) = (h_t(v) - h_s(v)) / 2 es consistente para la búsqueda
+        hacia adelante y -p(v) para la inversa, de modo que ambas operan
+        sobre los mismos costos reducidos y el criterio de parada de
+        Dijkstra bidireccional sigue siendo exacto.
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+
+        Returns:
+            Mismo contrato que `a_star` (`cities_explored` suma ambas direcciones)
+        """
+        def search(start: int, goal: int) -> Optional[Dict]:
+            to_goal, to_start = self._haversine_to(goal), self._haversine_to(start)
+            return self._bidirectional_search(start, goal, lambda node: 0.5 * (to_goal(node) - to_start(node)))
+
+        return self._route(start_id, goal_id, search)
+
+    def _route(self, start_id: int, goal_id: int,
+               search: Callable[[int, int], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Valida los IDs, resuelve sus índices densos y delega en un algoritmo de búsqueda
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+            search: Función (start, goal) sobre índices densos
+
+        Returns:
+            Resultado de la búsqueda, o None si no hay camino o las ciudades no existen
+        """
+        # Validar que las ciudades existan en el dataset - O(1)
+        if start_id not in self.city_rows or goal_id not in self.city_rows:
+            return None
+        if start_id == goal_id:
+            return self._build_result([start_id], 0.0, 1)
+
+        # Ciudades sin aristas no forman parte del grafo
+        start = self.node_index.get(start_id)
+        goal = self.node_index.get(goal_id)
+        if start is None or goal is None:
             return None
 
-        start = start_id
-        goal = goal_id
+        # En componentes distintas no hay camino: se evita explorar toda la componente de origen - O(1)
+        if self.components[start] != self.components[goal]:
+            return None
 
-        # g_score: costo real acumulado desde start hasta cada nodo
-        g_score = {start: 0.0}
+        return search(start, goal)
+
+    def unreachable_reason(self, start_id: int, goal_id: int) -> Optional[str]:
+        """
+        Explica por qué no hay camino entre dos ciudades, sin buscarlo - O(1)
+
+        Args:
+            start_id: ID de la ciudad origen
+            goal_id: ID de la ciudad destino
+
+        Returns:
+            Mensaje para el cliente, o None si ambas ciudades están en la
+            misma componente del grafo (hay camino)
+        """
+        for city_id in (start_id, goal_id):
+            if city_id not in self.city_rows:
+                return f"La ciudad {city_id} no existe en el dataset"
+        if start_id == goal_id:
+            return None
+        for city_id in (start_id, goal_id):
+            if city_id not in self.node_index:
+                return (f"La ciudad {city_id} no tiene conexiones en el grafo "
+                        f"(todas sus vecinas están a más del límite de distancia)")
+        if self.components[self.node_index[start_id]] != self.components[self.node_index[goal_id]]:
+            return f"Las ciudades {start_id} y {goal_id} están en componentes distintas del grafo (no hay camino)"
+        return None
+
+    def _search(self, start: int, goal: int, heuristic: Callable[[int], float]) -> Optional[Dict]:
+        """
+        Bucle principal de A* sobre índices densos
 
-        # f_score: g(n) + h(n) - estimación total del costo
-        f_score = {start: self._heuristic(start, goal)}
+        Args:
+            start: Índice denso del nodo origen
+            goal: Índice denso del nodo destino
+            heuristic: Cota inferior admisible y consistente hacia goal
 
-        # Priority queue: (f_score, city_id)
-        # heapq mantiene el elemento con menor f_score en la raíz
-        open_set = [(f_score[start], start)]
+        Returns:
+            Resultado formateado o None si no hay camino
+        """
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        heappush, heappop = heapq.heappush, heapq.heappop
 
+        space = self._search_space()
+        generation = space.generation
+        # g_score: costo real acumulado desde start hasta cada nodo
+        g_score = space.g_score
         # Para reconstruir el camino
-        came_from = {}
+        came_from = space.came_from
+        # Sellos de generación: nodos alcanzados / ya expandidos en esta búsqueda
+        seen, closed = space.seen, space.closed
+
+        g_score[start] = 0.0
+        came_from[start] = -1
+        seen[start] = generation
+
+        # Priority queue: (f_score, nodo) con f = g(n) + h(n)
+        open_set = [(heuristic(start), start)]
 
         # Contador de ciudades exploradas (para análisis)
         cities_explored = 0
 
-        # Bucle principal A*
-        # En el peor caso, explora todos los nodos: O(V log V)
-        # En cada nodo, revisa sus vecinos: O(E)
-        # Complejidad total: O((V + E) log V) = O(E log V) en grafos conexos
         while open_set:
             # Extraer nodo con menor f_score (O(log V))
-            current_f, current = heapq.heappop(open_set)
+            _, current = heappop(open_set)
+            # Entrada obsoleta: el nodo ya fue expandido con un costo menor
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
             cities_explored += 1
 
             # Si llegamos al objetivo, reconstruir camino
             if current == goal:
                 return self._reconstruct_path(came_from, current, g_score[goal], cities_explored)
 
+            current_g = g_score[current]
             # Explorar vecinos (O(grado promedio del nodo))
-            for neighbor, edge_weight in self.graph.get_neighbors(current):
-                # Calcular nuevo costo tentativo
-                tentative_g = g_score[current] + edge_weight
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if closed[neighbor] == generation:
+                    continue
+                tentative_g = current_g + weights[k]
 
                 # Si encontramos un camino mejor (o es la primera vez)
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    # Actualizar mejor camino conocido
+                if seen[neighbor] != generation or tentative_g < g_score[neighbor]:
+                    seen[neighbor] = generation
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self._heuristic(neighbor, goal)
-
-                    # Agregar a open_set (O(log V))
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                    heappush(open_set, (tentative_g + heuristic(neighbor), neighbor))
 
         # No hay camino
         return None
 
+    def _bidirectional_search(self, start: int, goal: int, potential: Callable[[int], float]) -> Optional[Dict]:
+        """
+        Bucle de búsqueda bidireccional sobre índices densos
+
+        La búsqueda hacia adelante ordena por g_f(v) + p(v) y la inversa por
+        g_b(v) - p(v); para todo nodo v la suma de ambas claves es
+        g_f(v) + g_b(v), así que se puede detener en cuanto la suma de los
+        mínimos de ambos heaps alcanza el mejor camino encontrado.
+
+        En cada paso avanza la dirección con la frontera más pequeña (criterio
+        de cardinalidad de Pohl): con densidades de ciudades muy distintas en
+        ambos extremos, crece más el lado disperso, que es el más barato.
+
+        Args:
+            start: Índice denso del nodo origen
+            goal: Índice denso del nodo destino
+            potential: Potencial p(v) de la búsqueda hacia adelante (0 = Dijkstra)
+
+        Returns:
+            Resultado formateado o None si no hay camino
+        """
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        forward, backward = self._search_space(), self._search_space(backward=True)
+        generation_f, generation_b = forward.generation, backward.generation
+        forward.g_score[start], forward.came_from[start], forward.seen[start] = 0.0, -1, generation_f
+        backward.g_score[goal], backward.came_from[goal], backward.seen[goal] = 0.0, -1, generation_b
+
+        heap_f = [(potential(start), start)]
+        heap_b = [(-potential(goal), goal)]
+        best, meeting = math.inf, -1
+        cities_explored = 0
+
+        while heap_f and heap_b:
+            if heap_f[0][0] + heap_b[0][0] >= best:
+                break
+            # Avanzar la dirección con la frontera más pequeña
+            if len(heap_f) <= len(heap_b):
+                heap, own, other, sign = heap_f, forward, backward, 1.0
+                generation, other_generation = generation_f, generation_b
+            else:
+                heap, own, other, sign = heap_b, backward, forward, -1.0
+                generation, other_generation = generation_b, generation_f
+
+            _, current = heappop(heap)
+            if own.closed[current] == generation:
+                continue
+            own.closed[current] = generation
+            cities_explored += 1
+
+            g_score, came_from, seen, closed = own.g_score, own.came_from, own.seen, own.closed
+            other_g, other_seen = other.g_score, other.seen
+            current_g = g_score[current]
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if closed[neighbor] == generation:
+                    continue
+                tentative_g = current_g + weights[k]
+                if seen[neighbor] != generation or tentative_g < g_score[neighbor]:
+                    seen[neighbor] = generation
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    heappush(heap, (tentative_g + sign * potential(neighbor), neighbor))
+                    # Camino candidato que une ambas búsquedas en `neighbor`
+                    if other_seen[neighbor] == other_generation and tentative_g + other_g[neighbor] < best:
+                        best, meeting = tentative_g + other_g[neighbor], neighbor
+
+        if meeting == -1:
+            return None
+
+        # start -> meeting por la búsqueda hacia adelante, meeting -> goal por la inversa
+        nodes = [meeting]
+        while forward.came_from[nodes[-1]] != -1:
+            nodes.append(forward.came_from[nodes[-1]])
+        nodes.reverse()
+        distance = forward.g_score[meeting]
+        node = meeting
+        while backward.came_from[node] != -1:
+            parent = backward.came_from[node]
+            # Distancia acumulada en orden start -> goal, igual que A*
+            distance += self._edge_weight(node, parent)
+            nodes.append(parent)
+            node = parent
+
+        return self._build_result([self.node_ids[i] for i in nodes], distance, cities_explored)
+
+    def _edge_weight(self, u: int, v: int) -> float:
+        """Peso de la arista u-v (índices densos); O(grado de u)"""
+        for k in range(self.indptr[u], self.indptr[u + 1]):
+            if self.indices[k] == v:
+                return self.weights[k]
+        raise KeyError((u, v))
+
     def _reconstruct_path(
         self,
-        came_from: Dict[int, int],
+        came_from: List[int],
         current: int,
         total_distance: float,
         cities_explored: int
@@ -157,27 +580,38 @@ class PathfindingService:
         Complejidad: O(k) donde k es el largo del camino (k << V)
 
         Args:
-            came_from: Diccionario de padres
-            current: Nodo actual (objetivo)
+            came_from: Array de padres por índice denso (-1 = sin padre)
+            current: Índice del nodo actual (objetivo)
             total_distance: Distancia total del camino
             cities_explored: Ciudades exploradas durante la búsqueda
 
         Returns:
             Dict con información del camino incluyendo coordenadas
         """
-        path = []
-        city_current = self.city_id_map[current]
-        path.append({
-            "id": city_current.id,
-            "city": city_current.city,
-            "lat": city_current.lat,
-            "lng": city_current.lng
-        })
-
+        nodes = [current]
         # Reconstruir desde goal hacia start
-        while current in came_from:
+        while came_from[current] != -1:
             current = came_from[current]
-            city = self.city_id_map[current]
+            nodes.append(current)
+
+        # Invertir para obtener start -> goal
+        nodes.reverse()
+        return self._build_result([self.node_ids[i] for i in nodes], total_distance, cities_explored)
+
+    def _build_result(self, city_ids: List[int], total_distance: float, cities_explored: int) -> Dict:
+        """
+        Formatea la respuesta de una ruta
+
+        Args:
+            city_ids: IDs de ciudades del camino en orden start -> goal
+            total_distance: Distancia total del camino
+            cities_explored: Ciudades exploradas durante la búsqueda
+
+        Returns:
+            Dict con información del camino incluyendo coordenadas
+        """
+        path = []
+        for city in self.cities.records([self.city_rows[city_id] for city_id in city_ids]):
             path.append({
                 "id": city.id,
                 "city": city.city,
@@ -185,9 +619,6 @@ class PathfindingService:
                 "lng": city.lng
             })
 
-        # Invertir para obtener start -> goal
-        path.reverse()
-
         return {
             "path": path,
             "distance": round(total_distance, 2),
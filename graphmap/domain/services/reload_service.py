@@ -0,0 +1,186 @@
+"""
+Servicio de recarga del dataset en caliente (sin reiniciar el proceso)
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from graphmap.domain.model.entities.city_table import CityTable
+from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.graph_builder import GraphBuilder
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.domain.services.warmup_service import WarmupService
+
+logger = logging.getLogger(__name__)
+
+
+class ReloadService:
+    """Construye la nueva versión del dataset en segundo plano y la publica de una vez
+
+    Mientras se recarga, los requests siguen usando la versión publicada:
+    la tabla, el grafo y todas sus cachés derivadas (índices, payloads,
+    landmarks, CH, motor de rutas) se construyen sobre snapshots nuevas que
+    nadie ve todavía. Al terminar se publican las snapshots de ciudades y
+    del grafo en una sola asignación (PublishedDataset); los requests en
+    curso terminan con la versión que tomaron.
+    Si algo falla, la versión anterior sigue publicada.
+
+    El grafo nuevo se carga del artefacto si ya existe; si no, cuando
+    cambiaron pocas ciudades de un dataset grande se parchea la
+    triangulación alrededor de ellas (GraphBuilder.patch_delaunay_graph) y,
+    si no, se triangula todo.
+    """
+
+    # Estado compartido de la recarga (una a la vez por proceso)
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _watcher: Optional[threading.Thread] = None
+    _status: str = "idle"
+    _last: Dict = {}
+
+    def __init__(self):
+        self.city_service = CityService()
+        self.graph_service = GraphService()
+
+    def start(self, wait: bool = False) -> bool:
+        """
+        Inicia una recarga
+
+        Args:
+            wait: True para recargar en el hilo actual y volver al terminar;
+                  False para hacerlo en un hilo daemon
+
+        Returns:
+            False si ya había una recarga en curso (no se inicia otra)
+        """
+        with ReloadService._lock:
+            if ReloadService._status == "running":
+                return False
+            ReloadService._status = "running"
+
+        if wait:
+            self._run()
+        else:
+            ReloadService._thread = threading.Thread(target=self._run, name="dataset-reload", daemon=True)
+            ReloadService._thread.start()
+        return True
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            result = self._reload()
+            status = "done"
+        except Exception as e:
+            result = {"error": str(getattr(e, "detail", e))}
+            status = "failed"
+            logger.exception("Dataset reload failed")
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        ReloadService._last = {**result, "finished_at": time.time()}
+        ReloadService._status = status
+        logger.info("Dataset reload %s in %.2f s", status, result["seconds"])
+
+    def _reload(self) -> Dict:
+        """Construye, precarga y publica la nueva versión si el Excel cambió"""
+        current = self.graph_service.get_snapshot()
+        current_cities = current["cities"]
+        cities = self.city_service.load_snapshot()
+        if cities["dataset_hash"] == current_cities["dataset_hash"]:
+            return {"changed": False, "graph_version": current.version}
+
+        old_table, new_table = current_cities["table"], cities["table"]
+        changed_cities = self._count_changes(old_table, new_table)
+        graph_source = "artifact"
+
+        def build():
+            nonlocal graph_source
+            if (len(new_table) >= settings.GRAPH_PATCH_MIN_CITIES
+                    and changed_cities <= settings.GRAPH_PATCH_MAX_CHANGES):
+                graph = GraphBuilder.patch_delaunay_graph(
+                    current["graph"], old_table.ids, old_table.lat, old_table.lng,
+                    new_table.ids, new_table.lat, new_table.lng, max_distance_km=GraphService.MAX_DISTANCE_KM,
+                )
+                if graph is not None:
+                    graph_source = "patch"
+                    return graph
+            graph_source = "delaunay"
+            return GraphBuilder.build_delaunay_graph_from_arrays(
+                new_table.ids, new_table.lat, new_table.lng, max_distance_km=GraphService.MAX_DISTANCE_KM
+            )
+
+        graph = self.graph_service.create_snapshot(self.graph_service.load_graph(cities, build), cities)
+
+        # Las cachés se construyen antes de publicar: el primer request no paga la recarga
+        for _, step in WarmupService().plan(cities, graph):
+            step()
+
+        # Ciudades y grafo juntos: ningún request ve una versión de cada uno
+        self.graph_service.publish(graph)
+        return {
+            "changed": True,
+            "graph_version": graph.version,
+            "dataset_hash": cities["dataset_hash"],
+            "cities": len(new_table),
+            "changed_cities": changed_cities,
+            "graph_source": graph_source,
+        }
+
+    @staticmethod
+    def _count_changes(old: CityTable, new: CityTable) -> int:
+        """Ciudades agregadas, eliminadas o con coordenadas distintas entre dos tablas"""
+        common, old_rows, new_rows = np.intersect1d(old.ids, new.ids, return_indices=True)
+        moved = ((old.lat[old_rows] != new.lat[new_rows]) | (old.lng[old_rows] != new.lng[new_rows])).sum()
+        return int(len(old.ids) + len(new.ids) - 2 * len(common) + moved)
+
+    def watch(self, interval: float) -> None:
+        """
+        Vigila el Excel en un hilo daemon y lo recarga cuando cambia
+
+        Args:
+            interval: Segundos entre revisiones (<= 0 = no vigilar)
+        """
+        if interval <= 0 or ReloadService._watcher is not None:
+            return
+        ReloadService._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="dataset-watcher", daemon=True
+        )
+        ReloadService._watcher.start()
+
+    def _watch(self, interval: float) -> None:
+        loaded = previous = self._file_state()
+        while True:
+            time.sleep(interval)
+            state = self._file_state()
+            # Recargar recién cuando el archivo deja de cambiar (escritura en curso);
+            # si ya hay una recarga en curso se reintenta en la próxima revisión
+            if state is not None and state != loaded and state == previous and self.start():
+                loaded = state
+            previous = state
+
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        """(mtime en ns, tamaño) del Excel, o None si no se puede leer"""
+        try:
+            stat = os.stat(self.city_service.excel_file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def status(self) -> Dict:
+        """
+        Estado de la recarga y versión publicada
+
+        Returns:
+            Diccionario con status, versión del grafo, hash del dataset publicado
+            y resultado de la última recarga
+        """
+        snapshot = self.graph_service.get_published_snapshot()
+        return {
+            "status": ReloadService._status,
+            "graph_version": snapshot.version if snapshot else None,
+            "dataset_hash": snapshot["cities"]["dataset_hash"] if snapshot else None,
+            "last": dict(ReloadService._last),
+        }
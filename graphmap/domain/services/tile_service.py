@@ -0,0 +1,169 @@
+"""
+Servicio de vector tiles (MVT) de ciudades y aristas del grafo
+"""
+import hashlib
+from typing import Dict, Optional
+
+import numpy as np
+
+from config import settings
+from graphmap.domain.model.entities.geo_utils import GeoUtils
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.infrastructure.cache.dataset_snapshot import DatasetSnapshot
+from graphmap.infrastructure.cache.tile_cache import CachedTile, TileCache
+from graphmap.infrastructure.tiles.mvt_encoder import MVTLayer, encode_tile
+
+
+class TileService:
+    """Genera tiles `z/x/y` en Web Mercator a partir de las ciudades y el grafo cacheados
+
+    Cada tile tiene dos capas:
+
+    - `cities`: puntos con id (ID de la ciudad), name y population. Se
+      aplica el mismo nivel de detalle que /cities/?zoom=z: a zoom bajo
+      solo la ciudad más poblada de cada celda.
+    - `edges`: segmentos con source, target y distance (km). Se omiten
+      las aristas que a ese zoom miden menos de MIN_EDGE_PIXELS píxeles,
+      que no se distinguirían en pantalla.
+
+    Los tiles codificados se guardan en una caché LRU por versión del
+    grafo, junto con su ETag (hash del contenido). Cada tile se dibuja con
+    una sola snapshot del grafo (y la tabla de ciudades con la que se
+    construyó), aunque el dataset se recargue mientras tanto.
+    """
+
+    EXTENT = 4096
+    # Margen alrededor del tile (en unidades de EXTENT) para que el cliente recorte sin cortes visibles
+    BUFFER = 64
+    TILE_PIXELS = 256
+    MIN_EDGE_PIXELS = 4.0
+    MAX_ZOOM = 22
+
+    # Tiles codificados, indexados por (z, x, y, versión del grafo)
+    _tile_cache = TileCache(settings.TILE_CACHE_SIZE)
+
+    def __init__(self):
+        self.graph_service = GraphService()
+        self.city_service = self.graph_service.city_service
+
+    def get_tile(self, z: int, x: int, y: int) -> CachedTile:
+        """
+        Obtiene un tile codificado (con caché)
+
+        Args:
+            z: Nivel de zoom
+            x: Columna del tile
+            y: Fila del tile (0 = norte)
+
+        Returns:
+            Tupla (contenido MVT, ETag)
+
+        Raises:
+            ValueError: Si el tile no existe en ese zoom
+        """
+        if not 0 <= z <= self.MAX_ZOOM or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+            raise ValueError(f"Tile {z}/{x}/{y} is out of range")
+
+        snapshot = self.graph_service.get_snapshot()
+        version = snapshot.version
+        tile = TileService._tile_cache.get(z, x, y, version)
+        if tile is None:
+            content = self.render_tile(z, x, y, snapshot)
+            tile = (content, f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"')
+            TileService._tile_cache.put(z, x, y, version, tile)
+        return tile
+
+    def get_tile_cache_stats(self) -> Dict:
+        """Retorna los contadores de la caché de tiles"""
+        return TileService._tile_cache.stats()
+
+    def render_tile(self, z: int, x: int, y: int, snapshot: Optional[DatasetSnapshot] = None) -> bytes:
+        """
+        Codifica un tile sin pasar por la caché
+
+        Args:
+            snapshot: Versión del grafo (None = la publicada)
+
+        Returns:
+            Contenido MVT (vacío si el tile no tiene features)
+        """
+        snapshot = snapshot or self.graph_service.get_snapshot()
+        cities_snapshot = snapshot["cities"]
+        geometry = self._get_geometry(snapshot)
+        tile_size = 2 * GeoUtils.MERCATOR_RANGE / 2 ** z
+        min_x = -GeoUtils.MERCATOR_RANGE + x * tile_size
+        max_y = GeoUtils.MERCATOR_RANGE - y * tile_size
+        scale = self.EXTENT / tile_size
+        margin = self.BUFFER / scale
+
+        # Bounding box geográfico del tile con su margen
+        low_x, high_x = min_x - margin, min_x + tile_size + margin
+        low_y, high_y = max_y - tile_size - margin, max_y + margin
+        min_lat, min_lng = GeoUtils.mercator_to_lat_lon(low_x, low_y)
+        max_lat, max_lng = GeoUtils.mercator_to_lat_lon(high_x, high_y)
+        bbox = (float(min_lat), max(float(min_lng), -180.0), float(max_lat), min(float(max_lng), 180.0))
+
+        cities = MVTLayer("cities", self.EXTENT)
+        table = cities_snapshot["table"]
+        rows = self.city_service.get_viewport_index(cities_snapshot).query(bbox, z)
+        px = np.rint((geometry["city_x"][rows] - min_x) * scale).astype(np.int64)
+        py = np.rint((max_y - geometry["city_y"][rows]) * scale).astype(np.int64)
+        names = [table.strings[code] for code in table.string_codes["city"][rows].tolist()]
+        for city_id, name, population, point_x, point_y in zip(
+                table.ids[rows].tolist(), names, table.population[rows].tolist(), px.tolist(), py.tolist()):
+            properties = {"name": name}
+            if population >= 0:
+                properties["population"] = population
+            cities.add_point(point_x, point_y, properties, feature_id=city_id)
+
+        # Aristas cuyo rectángulo envolvente toca el tile y que se ven a este zoom
+        x1, y1, x2, y2 = geometry["x1"], geometry["y1"], geometry["x2"], geometry["y2"]
+        visible = ((np.maximum(x1, x2) >= low_x) & (np.minimum(x1, x2) <= high_x)
+                   & (np.maximum(y1, y2) >= low_y) & (np.minimum(y1, y2) <= high_y)
+                   & (geometry["length"] * (self.TILE_PIXELS / tile_size) >= self.MIN_EDGE_PIXELS))
+        selected = np.flatnonzero(visible)
+        # Descartar las que solo tocan el tile con su rectángulo envolvente:
+        # el segmento cruza el tile si las esquinas no quedan todas del mismo lado
+        dx, dy = x2[selected] - x1[selected], y2[selected] - y1[selected]
+        sides = np.stack([dx * (corner_y - y1[selected]) - dy * (corner_x - x1[selected])
+                          for corner_x in (low_x, high_x) for corner_y in (low_y, high_y)])
+        selected = selected[(sides.min(axis=0) <= 0) & (sides.max(axis=0) >= 0)]
+
+        edges = MVTLayer("edges", self.EXTENT)
+        ex1 = np.rint((x1[selected] - min_x) * scale).astype(np.int64).tolist()
+        ey1 = np.rint((max_y - y1[selected]) * scale).astype(np.int64).tolist()
+        ex2 = np.rint((x2[selected] - min_x) * scale).astype(np.int64).tolist()
+        ey2 = np.rint((max_y - y2[selected]) * scale).astype(np.int64).tolist()
+        for source, target, distance, ax, ay, bx, by in zip(
+                geometry["source"][selected].tolist(), geometry["target"][selected].tolist(),
+                geometry["distance"][selected].tolist(), ex1, ey1, ex2, ey2):
+            edges.add_line([(ax, ay), (bx, by)],
+                           {"source": source, "target": target, "distance": round(distance, 1)})
+
+        return encode_tile([cities, edges])
+
+    def _get_geometry(self, snapshot: DatasetSnapshot) -> Dict[str, np.ndarray]:
+        """Proyecta ciudades y aristas a Web Mercator una vez por versión del grafo"""
+        return snapshot.get_or_build("tile_geometry", lambda: self._build_geometry(snapshot))
+
+    def _build_geometry(self, snapshot: DatasetSnapshot) -> Dict[str, np.ndarray]:
+        """Calcula las coordenadas Mercator de ciudades y aristas de una versión del grafo"""
+        graph = snapshot["graph"]
+        table = snapshot["cities"]["table"]
+        city_xy = GeoUtils.lat_lon_to_mercator_array(table.lat, table.lng)
+
+        u_idx, v_idx, weights = graph.edge_arrays()
+        node_rows = self.graph_service.get_node_rows(snapshot)
+        u_xy, v_xy = city_xy[node_rows[u_idx]], city_xy[node_rows[v_idx]]
+        return {
+            "city_x": city_xy[:, 0],
+            "city_y": city_xy[:, 1],
+            "source": graph.node_ids[u_idx],
+            "target": graph.node_ids[v_idx],
+            "distance": weights,
+            "x1": u_xy[:, 0],
+            "y1": u_xy[:, 1],
+            "x2": v_xy[:, 0],
+            "y2": v_xy[:, 1],
+            "length": np.hypot(v_xy[:, 0] - u_xy[:, 0], v_xy[:, 1] - u_xy[:, 1]),
+        }
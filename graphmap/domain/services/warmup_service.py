@@ -0,0 +1,123 @@
+"""
+Servicio de precarga (warm-up) de las cachés al arrancar la aplicación
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.infrastructure.cache.dataset_snapshot import DatasetSnapshot
+from graphmap.infrastructure.http import wire_format as wire
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """Construye de antemano las cachés que usan los requests
+
+    Cada paso llama al mismo getter que usaría un request, así que la
+    construcción pasa por los locks de cada caché: si un request llega
+    durante la precarga, espera a que termine ese paso en lugar de
+    repetirlo. Un paso que falla se registra y no impide los siguientes
+    (el request correspondiente volverá a intentarlo).
+    """
+
+    BACKGROUND, BLOCKING, OFF = "background", "blocking", "off"
+
+    # Estado compartido de la precarga (una por proceso)
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _status: str = "pending"
+    _steps: Dict[str, Dict] = {}
+    _started_at: Optional[float] = None
+    _finished_at: Optional[float] = None
+
+    def __init__(self):
+        self.city_service = CityService()
+        self.graph_service = GraphService()
+
+    def plan(self, cities: Optional[DatasetSnapshot] = None,
+             graph: Optional[DatasetSnapshot] = None) -> List[Tuple[str, Callable[[], object]]]:
+        """
+        Pasos en orden: primero lo que necesitan /cities/ y /graph/edges
+
+        Args:
+            cities: Snapshot de ciudades a precargar (None = la publicada)
+            graph: Snapshot del grafo a precargar (None = la publicada)
+        """
+        city_service, graph_service = self.city_service, self.graph_service
+        return [
+            ("cities", lambda: city_service.load_city_table(cities)),
+            ("graph", lambda: graph_service.build_city_graph(graph)),
+            ("edges", lambda: graph_service.get_graph_edges(graph)),
+            ("cities_payload", lambda: city_service.get_cities_payload(wire.JSON, cities)),
+            ("edges_payload", lambda: graph_service.get_edges_payload(wire.JSON, graph)),
+            ("search_index", lambda: city_service.get_search_index(cities)),
+            ("row_json", lambda: city_service.get_row_json(cities)),
+            ("viewport_index", lambda: city_service.get_viewport_index(cities)),
+            ("spatial_index", lambda: city_service.get_spatial_index(cities)),
+            ("node_spatial_index", lambda: graph_service.get_node_spatial_index(graph)),
+            ("pathfinding", lambda: graph_service.get_pathfinding_service(graph)),
+            ("fuzzy_index", lambda: city_service.get_fuzzy_index(cities)),
+        ]
+
+    def start(self, mode: str = BACKGROUND) -> None:
+        """
+        Inicia la precarga (solo la primera vez por proceso)
+
+        Args:
+            mode: BACKGROUND (hilo daemon, no demora el arranque),
+                  BLOCKING (termina antes de aceptar requests) u OFF
+        """
+        if mode == self.OFF:
+            return
+        with WarmupService._lock:
+            if WarmupService._status != "pending":
+                return
+            WarmupService._status = "running"
+            WarmupService._started_at = time.time()
+
+        if mode == self.BLOCKING:
+            self._run()
+        else:
+            WarmupService._thread = threading.Thread(target=self._run, name="cache-warmup", daemon=True)
+            WarmupService._thread.start()
+
+    def _run(self) -> None:
+        failed = False
+        for name, step in self.plan():
+            start = time.perf_counter()
+            try:
+                step()
+                WarmupService._steps[name] = {"seconds": round(time.perf_counter() - start, 3)}
+            except Exception as e:
+                failed = True
+                WarmupService._steps[name] = {"error": str(getattr(e, "detail", e))}
+                logger.exception("Warm-up step failed: %s", name)
+        WarmupService._finished_at = time.time()
+        WarmupService._status = "failed" if failed else "done"
+        logger.info("Warm-up %s in %.2f s", WarmupService._status,
+                    WarmupService._finished_at - WarmupService._started_at)
+
+    def readiness(self) -> Dict:
+        """
+        Estado de preparación del proceso
+
+        `ready` depende de las cachés reales (ciudades, grafo y aristas en
+        memoria), no solo de la precarga: también vale con WARMUP_MODE=off
+        una vez que algún request las cargó.
+
+        Returns:
+            Diccionario con ready, estado de la precarga y duración de cada paso
+        """
+        finished, started = WarmupService._finished_at, WarmupService._started_at
+        return {
+            "ready": self.city_service.is_loaded() and self.graph_service.is_loaded(),
+            "warmup": {
+                "status": WarmupService._status,
+                "seconds": round((finished or time.time()) - started, 3) if started else None,
+                "steps": dict(WarmupService._steps),
+            },
+        }
@@ -0,0 +1,106 @@
+"""
+Versión publicada del dataset junto con las cachés derivadas de ella
+"""
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from graphmap.infrastructure.cache.single_flight import SingleFlight
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class DatasetSnapshot:
+    """Datos base de una versión del dataset y las cachés construidas sobre ellos
+
+    Los servicios guardan una referencia a la snapshot actual y, al recargar
+    el dataset, la reemplazan entera con una sola asignación. Un request
+    toma la referencia al empezar y trabaja solo con ella: aunque se
+    publique una versión nueva a mitad del request, nunca combina la tabla
+    de una versión con un índice de otra.
+
+    Las cachés derivadas se construyen a demanda dentro de la snapshot, una
+    sola vez por clave (mismo esquema de doble verificación que SingleFlight).
+    """
+
+    def __init__(self, version: int, **values):
+        """
+        Args:
+            version: Número de versión (creciente dentro del proceso)
+            values: Datos base de la versión (ej: table, dataset_hash)
+        """
+        self.version = version
+        self._values: Dict[str, object] = dict(values)
+        self._builds = SingleFlight()
+
+    def __getitem__(self, key: str):
+        return self._values[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def get(self, key: str, default=None):
+        """Valor de `key` si ya está en la snapshot (no construye nada)"""
+        return self._values.get(key, default)
+
+    def get_or_build(self, key: str, build: Callable[[], T]) -> T:
+        """
+        Valor de `key`, construyéndolo con `build` la primera vez
+
+        Args:
+            key: Nombre de la caché derivada
+            build: Construye el valor a partir de los datos de esta snapshot
+
+        Returns:
+            El valor en caché para esta versión
+        """
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            with self._builds.lock(key):
+                value = self._values.get(key, _MISSING)
+                if value is _MISSING:
+                    value = build()
+                    self._values[key] = value
+        return value
+
+
+class PublishedDataset:
+    """Versión publicada del dataset: snapshot de ciudades y del grafo en una sola referencia
+
+    CityService y GraphService leen de aquí su snapshot. Publicar es una
+    sola asignación de la tupla (ciudades, grafo), así que ningún request ve
+    las ciudades de una versión junto con el grafo de otra: /cities/*,
+    /graph/* y /tiles/* cambian de versión en el mismo instante. La
+    snapshot del grafo siempre es la construida sobre esas ciudades.
+    """
+
+    _current: Tuple[Optional[DatasetSnapshot], Optional[DatasetSnapshot]] = (None, None)
+
+    @classmethod
+    def cities(cls) -> Optional[DatasetSnapshot]:
+        """Snapshot de ciudades publicada (None si todavía no se cargó)"""
+        return cls._current[0]
+
+    @classmethod
+    def graph(cls) -> Optional[DatasetSnapshot]:
+        """Snapshot del grafo publicada (None si todavía no se cargó)"""
+        return cls._current[1]
+
+    @classmethod
+    def publish(cls, cities: DatasetSnapshot, graph: Optional[DatasetSnapshot] = None) -> None:
+        """
+        Reemplaza la versión publicada
+
+        Args:
+            cities: Snapshot de ciudades
+            graph: Snapshot del grafo construida sobre `cities` (None = solo
+                   ciudades, en la carga inicial antes de construir el grafo)
+        """
+        if graph is not None and graph["cities"] is not cities:
+            raise ValueError("The graph snapshot was built from another cities snapshot")
+        cls._current = (cities, graph)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Olvida la versión publicada (la siguiente lectura vuelve a cargar el dataset)"""
+        cls._current = (None, None)
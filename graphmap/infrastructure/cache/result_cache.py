@@ -0,0 +1,108 @@
+"""
+Caché en memoria de resultados por versión del grafo (LRU)
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+_MISSING = object()
+
+
+class ResultCache:
+    """Caché LRU de resultados calculados sobre el grafo
+
+    La clave es (clave del resultado, versión del grafo): al publicarse un
+    grafo nuevo cambia la versión y los resultados anteriores dejan de
+    servirse (y terminan desalojados por los nuevos).
+
+    Es la base de las cachés de rutas y de tiles: las subclases arman la
+    clave y pueden redefinir `_expired` (vencimiento), `_added` y
+    `_removed` (contabilidad por entrada), que se llaman con el lock tomado.
+
+    Es seguro entre hilos: todas las operaciones toman un lock.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Inicializa la caché
+
+        Args:
+            max_entries: Número máximo de resultados guardados (0 = caché deshabilitada)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, int], object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, graph_version: int, default=None):
+        """Retorna el resultado guardado, o `default` si no está en caché (o venció)"""
+        entry_key = (key, graph_version)
+        with self._lock:
+            entry = self._entries.get(entry_key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            if self._expired(entry):
+                del self._entries[entry_key]
+                self._removed(entry)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, graph_version: int, result: object) -> None:
+        """Guarda un resultado, desalojando el menos usado si se supera el tamaño máximo"""
+        if self.max_entries <= 0:
+            return
+        entry_key = (key, graph_version)
+        with self._lock:
+            previous = self._entries.pop(entry_key, _MISSING)
+            if previous is not _MISSING:
+                self._removed(previous)
+            self._entries[entry_key] = result
+            self._added(result)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._removed(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Elimina todas las entradas (los contadores se conservan)"""
+        with self._lock:
+            for entry in self._entries.values():
+                self._removed(entry)
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Retorna tamaño, capacidad y contadores de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                **self._extra_stats(),
+            }
+
+    def _expired(self, entry: object) -> bool:
+        """True si la entrada ya no debe servirse (por defecto nunca vence)"""
+        return False
+
+    def _added(self, entry: object) -> None:
+        """Se llama al guardar una entrada"""
+
+    def _removed(self, entry: object) -> None:
+        """Se llama al quitar una entrada (reemplazo, desalojo, vencimiento o clear)"""
+
+    def _extra_stats(self) -> Dict:
+        """Campos propios de la subclase para stats()"""
+        return {}
@@ -0,0 +1,71 @@
+"""
+Caché en memoria de resultados de rutas (LRU con TTL opcional)
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+from graphmap.infrastructure.cache.result_cache import ResultCache
+
+# Marca de "no está en caché" (None es un resultado válido: no hay camino)
+MISS = object()
+
+
+class RouteCache(ResultCache):
+    """Caché LRU de resultados de /graph/shortest-path
+
+    La clave es (min(id), max(id), motor, versión del grafo): como el grafo
+    es no dirigido, A->B y B->A comparten entrada y el camino se invierte
+    al servir el sentido contrario. Incluir la versión del grafo garantiza
+    que nunca se sirva una ruta calculada sobre un grafo anterior.
+
+    Es seguro entre hilos (ver ResultCache).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        """
+        Inicializa la caché
+
+        Args:
+            max_entries: Número máximo de rutas guardadas (0 = caché deshabilitada)
+            ttl_seconds: Vigencia de cada entrada en segundos (None = sin vencimiento)
+        """
+        super().__init__(max_entries)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(start_id: int, goal_id: int, engine: str) -> Tuple:
+        return min(start_id, goal_id), max(start_id, goal_id), engine
+
+    def get(self, start_id: int, goal_id: int, engine: str, graph_version: int):
+        """
+        Busca una ruta en la caché
+
+        Returns:
+            El resultado orientado de start_id a goal_id (puede ser None si
+            se cacheó que no hay camino), o MISS si no está
+        """
+        entry = super().get(self._key(start_id, goal_id, engine), graph_version, MISS)
+        if entry is MISS:
+            return MISS
+
+        _, result = entry
+        if result is None or result["path"][0]["id"] == start_id:
+            return result
+        return self._reversed(result)
+
+    def put(self, start_id: int, goal_id: int, engine: str, graph_version: int, result: Optional[Dict]) -> None:
+        """Guarda una ruta, desalojando la menos usada si se supera el tamaño máximo"""
+        super().put(self._key(start_id, goal_id, engine), graph_version, (time.monotonic(), result))
+
+    def _expired(self, entry: Tuple[float, Optional[Dict]]) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - entry[0] > self.ttl_seconds
+
+    def _extra_stats(self) -> Dict:
+        return {"ttl_seconds": self.ttl_seconds}
+
+    @staticmethod
+    def _reversed(result: Dict) -> Dict:
+        """Misma ruta en sentido contrario (válida porque el grafo es no dirigido)"""
+        reversed_result = dict(result)
+        reversed_result["path"] = result["path"][::-1]
+        return reversed_result
@@ -0,0 +1,34 @@
+"""
+Locks por clave para construir cada caché una sola vez entre hilos concurrentes
+"""
+import threading
+from typing import Dict
+
+
+class SingleFlight:
+    """Registro de locks reentrantes, uno por caché
+
+    Uso (doble verificación: el camino rápido no toma ningún lock)::
+
+        if Service._cache is None:
+            with Service._builds.lock("cache"):
+                if Service._cache is None:
+                    Service._cache = build()
+
+    Si varios requests llegan a la vez con la caché vacía, solo el primero
+    la construye; los demás esperan en el lock y luego reutilizan el
+    resultado. Cada caché tiene su propio lock, así que construir una no
+    bloquea a las demás.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, threading.RLock] = {}
+        self._guard = threading.Lock()
+
+    def lock(self, key: str) -> threading.RLock:
+        """Lock asociado a `key` (se crea en el primer uso)"""
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(key, threading.RLock())
+        return lock
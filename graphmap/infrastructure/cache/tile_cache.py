@@ -0,0 +1,47 @@
+"""
+Caché en memoria de vector tiles codificados (LRU)
+"""
+from typing import Dict, Optional, Tuple
+
+from graphmap.infrastructure.cache.result_cache import ResultCache
+
+# (contenido MVT, ETag)
+CachedTile = Tuple[bytes, str]
+
+
+class TileCache(ResultCache):
+    """Caché LRU de tiles ya codificados
+
+    La clave es (z, x, y, versión del grafo): al reconstruirse el grafo
+    cambia la versión y los tiles anteriores dejan de servirse. Además de
+    los contadores de ResultCache lleva los bytes ocupados por los tiles.
+
+    Es seguro entre hilos (ver ResultCache).
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Inicializa la caché
+
+        Args:
+            max_entries: Número máximo de tiles guardados (0 = caché deshabilitada)
+        """
+        super().__init__(max_entries)
+        self._bytes = 0
+
+    def get(self, z: int, x: int, y: int, graph_version: int) -> Optional[CachedTile]:
+        """Retorna (contenido, ETag) del tile, o None si no está en caché"""
+        return super().get((z, x, y), graph_version)
+
+    def put(self, z: int, x: int, y: int, graph_version: int, tile: CachedTile) -> None:
+        """Guarda un tile, desalojando el menos usado si se supera el tamaño máximo"""
+        super().put((z, x, y), graph_version, tile)
+
+    def _added(self, tile: CachedTile) -> None:
+        self._bytes += len(tile[0])
+
+    def _removed(self, tile: CachedTile) -> None:
+        self._bytes -= len(tile[0])
+
+    def _extra_stats(self) -> Dict:
+        return {"bytes": self._bytes}
@@ -0,0 +1,155 @@
+"""
+Respuestas HTTP serializadas y comprimidas una sola vez (contenido estático)
+"""
+import gzip
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Optional, Set
+
+from pydantic_core import to_json
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Están en requirements.txt; si faltan (ej: instalación mínima) se usa pydantic_core y solo gzip
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serializa a JSON compacto en UTF-8 (orjson si está disponible)
+
+    Sin orjson usa el serializador en Rust de pydantic_core (dependencia de
+    FastAPI), unas 3 veces más rápido que `json.dumps` y con la misma salida.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return to_json(data)
+
+
+def accepted_values(header: str) -> Set[str]:
+    """
+    Valores aceptados en una cabecera con pesos q (Accept, Accept-Encoding)
+
+    Args:
+        header: Valor de la cabecera, ej: "gzip, br;q=0.8, *;q=0"
+
+    Returns:
+        Valores en minúsculas con q > 0 (sin parámetros)
+    """
+    accepted: Set[str] = set()
+    for item in header.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+class StaticPayload:
+    """Cuerpo de respuesta inmutable, precomprimido y con validadores HTTP
+
+    Se serializa y comprime una vez (gzip y, si está instalado, brotli);
+    cada request solo elige la variante según `Accept-Encoding` y
+    responde 304 si el cliente ya tiene la versión actual. El ETag es
+    fuerte y distinto por codificación, como exige HTTP para variantes
+    con distintos bytes.
+    """
+
+    GZIP_LEVEL = 9
+    BROTLI_QUALITY = 11
+    # Orden de preferencia entre las codificaciones aceptadas por el cliente
+    PREFERENCE = ("br", "gzip", "identity")
+
+    def __init__(self, body: bytes, last_modified: float, media_type: str = "application/json",
+                 cache_control: str = "public, max-age=86400", vary: str = "Accept-Encoding"):
+        """
+        Args:
+            body: Contenido sin comprimir
+            last_modified: Fecha de la última modificación de los datos (timestamp)
+            media_type: Content-Type de la respuesta
+            cache_control: Valor de la cabecera Cache-Control
+            vary: Valor de la cabecera Vary (cabeceras del request que eligen la variante)
+        """
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.vary = vary
+        self.last_modified = formatdate(last_modified, usegmt=True)
+        self._last_modified_timestamp = int(last_modified)
+
+        self.variants: Dict[str, bytes] = {
+            "identity": body,
+            # mtime=0: el mismo contenido siempre produce los mismos bytes (y el mismo ETag)
+            "gzip": gzip.compress(body, compresslevel=self.GZIP_LEVEL, mtime=0),
+        }
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=self.BROTLI_QUALITY)
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etags: Dict[str, str] = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.variants
+        }
+
+    @classmethod
+    def from_json(cls, data: Any, last_modified: float, **kwargs) -> "StaticPayload":
+        """Construye el payload serializando `data` a JSON"""
+        return cls(dumps_json(data), last_modified, **kwargs)
+
+    def response(self, request: Request) -> Response:
+        """
+        Respuesta para un request: variante comprimida o 304
+
+        Args:
+            request: Request entrante (se leen Accept-Encoding, If-None-Match e If-Modified-Since)
+
+        Returns:
+            Response con los bytes precalculados
+        """
+        encoding = self._negotiate(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.etags[encoding],
+            "Last-Modified": self.last_modified,
+            "Cache-Control": self.cache_control,
+            "Vary": self.vary,
+        }
+        if self._not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.variants[encoding], media_type=self.media_type, headers=headers)
+
+    def _negotiate(self, accept_encoding: str) -> str:
+        """Mejor codificación disponible que el cliente acepta (q > 0)"""
+        accepted = accepted_values(accept_encoding)
+        for encoding in self.PREFERENCE:
+            if encoding in self.variants and (encoding in accepted or "*" in accepted or encoding == "identity"):
+                return encoding
+        return "identity"
+
+    def _not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Evalúa las precondiciones condicionales (If-None-Match tiene prioridad)"""
+        if if_none_match is not None:
+            candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+            return "*" in candidates or not candidates.isdisjoint(self.etags.values())
+        if if_modified_since is not None:
+            try:
+                return self._last_modified_timestamp <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
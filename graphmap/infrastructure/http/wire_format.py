@@ -0,0 +1,185 @@
+"""
+Formatos binarios para enviar ciudades y aristas en bloque
+
+Formato "binary" (`application/octet-stream`): arrays tipados little-endian
+contiguos, que el cliente puede leer sin parsear (ej: `new Float32Array(buf,
+offset, count)` en JavaScript). Todos los offsets son múltiplos de 4.
+
+Ciudades::
+
+    magic    4 bytes   b"GMC1"
+    count    uint32    número de ciudades (n)
+    names    uint32    tamaño en bytes del bloque de nombres
+    id       uint32[n]
+    lat      float32[n]
+    lng      float32[n]
+    offsets  uint32[n + 1]  inicio de cada nombre dentro del bloque
+    city     bytes          nombres en UTF-8, concatenados
+
+Aristas::
+
+    magic    4 bytes   b"GME1"
+    count    uint32    número de aristas (m)
+    source   uint32[m] ID de la ciudad origen
+    target   uint32[m] ID de la ciudad destino
+
+Formato "arrow" (`application/vnd.apache.arrow.stream`): un stream Arrow IPC
+con las mismas columnas. Solo está disponible si pyarrow está instalado.
+
+Formato "ndjson" (`application/x-ndjson`): un objeto JSON por línea, enviado
+en streaming a medida que se genera (ver `ndjson_chunks`).
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from graphmap.infrastructure.http.static_payload import accepted_values
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - depende del entorno
+    pyarrow = None
+
+JSON, BINARY, ARROW, NDJSON = "json", "binary", "arrow", "ndjson"
+
+MEDIA_TYPES: Dict[str, str] = {
+    JSON: "application/json",
+    BINARY: "application/octet-stream",
+    ARROW: "application/vnd.apache.arrow.stream",
+    NDJSON: "application/x-ndjson",
+}
+
+# Líneas NDJSON agrupadas por chunk de la respuesta en streaming
+NDJSON_BATCH_SIZE = 512
+
+CITIES_MAGIC = b"GMC1"
+EDGES_MAGIC = b"GME1"
+
+
+def available_formats() -> List[str]:
+    """Formatos que este servidor puede producir, en orden de preferencia"""
+    formats = [BINARY, JSON]
+    if pyarrow is not None:
+        formats.insert(0, ARROW)
+    return formats
+
+
+def negotiate(accept: str, supported: Optional[Sequence[str]] = None) -> str:
+    """
+    Elige el formato de respuesta según la cabecera Accept
+
+    Args:
+        accept: Valor de la cabecera Accept del request
+        supported: Formatos que ofrece el endpoint, en orden de preferencia
+                   (None = available_formats())
+
+    Returns:
+        Uno de los formatos soportados; JSON si el cliente no pidió otro disponible
+    """
+    accepted = accepted_values(accept)
+    for wire_format in supported if supported is not None else available_formats():
+        if wire_format == ARROW and pyarrow is None:
+            continue
+        if wire_format != JSON and MEDIA_TYPES[wire_format] in accepted:
+            return wire_format
+    return JSON
+
+
+def ndjson_chunks(lines: Iterable[str], batch_size: int = NDJSON_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Agrupa líneas JSON ya serializadas en chunks NDJSON para una respuesta en streaming
+
+    Consume `lines` de a poco: la memoria usada no depende del total de
+    líneas y el primer chunk sale en cuanto hay `batch_size` líneas.
+
+    Args:
+        lines: Objetos JSON serializados, uno por elemento (sin salto de línea)
+        batch_size: Líneas por chunk
+
+    Returns:
+        Iterador de chunks en UTF-8, cada línea terminada en "\\n"
+    """
+    batch: List[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            batch.append("")
+            yield "\n".join(batch).encode("utf-8")
+            batch = []
+    if batch:
+        batch.append("")
+        yield "\n".join(batch).encode("utf-8")
+
+
+def _as_uint32(ids: np.ndarray) -> np.ndarray:
+    """IDs de ciudad como uint32 little-endian (todos los IDs del dataset caben)"""
+    ids = np.asarray(ids)
+    if ids.size and (ids.min() < 0 or ids.max() > np.iinfo(np.uint32).max):
+        raise ValueError("City ids do not fit in uint32")
+    return ids.astype("<u4")
+
+
+def encode_cities(ids: np.ndarray, lat: np.ndarray, lng: np.ndarray,
+                  names: List[str], wire_format: str) -> bytes:
+    """
+    Codifica ciudades en formato binario o Arrow
+
+    Args:
+        ids: ID de cada ciudad
+        lat: Latitud de cada ciudad
+        lng: Longitud de cada ciudad
+        names: Nombre de cada ciudad
+        wire_format: BINARY o ARROW
+
+    Returns:
+        Bytes listos para enviar
+    """
+    ids = _as_uint32(ids)
+    lat = np.asarray(lat).astype("<f4")
+    lng = np.asarray(lng).astype("<f4")
+
+    if wire_format == ARROW:
+        table = pyarrow.table({
+            "id": pyarrow.array(ids),
+            "city": pyarrow.array(names, type=pyarrow.string()),
+            "lat": pyarrow.array(lat),
+            "lng": pyarrow.array(lng),
+        })
+        return _arrow_stream(table)
+
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    blob = b"".join(encoded)
+    header = CITIES_MAGIC + np.array([len(ids), len(blob)], dtype="<u4").tobytes()
+    return b"".join((header, ids.tobytes(), lat.tobytes(), lng.tobytes(), offsets.tobytes(), blob))
+
+
+def encode_edges(source: np.ndarray, target: np.ndarray, wire_format: str) -> bytes:
+    """
+    Codifica aristas (pares de IDs de ciudad) en formato binario o Arrow
+
+    Args:
+        source: ID de la ciudad origen de cada arista
+        target: ID de la ciudad destino de cada arista
+        wire_format: BINARY o ARROW
+
+    Returns:
+        Bytes listos para enviar
+    """
+    source, target = _as_uint32(source), _as_uint32(target)
+
+    if wire_format == ARROW:
+        return _arrow_stream(pyarrow.table({"source": pyarrow.array(source), "target": pyarrow.array(target)}))
+
+    header = EDGES_MAGIC + np.array([len(source)], dtype="<u4").tobytes()
+    return b"".join((header, source.tobytes(), target.tobytes()))
+
+
+def _arrow_stream(table) -> bytes:
+    """Serializa una tabla de pyarrow como stream Arrow IPC"""
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,189 @@
+"""
+Almacén de artefactos binarios precompilados (arrays NumPy memory-mapped)
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+META_FILE = "meta.json"
+FINGERPRINT_FILE = "dataset.json"
+
+
+class ArtifactStore:
+    """Guarda y carga grupos de arrays `.npy` en directorios versionados
+
+    Cada artefacto es un directorio con un `.npy` por array y un `meta.json`.
+    El directorio se escribe primero con un nombre temporal y luego se renombra,
+    de modo que un artefacto visible siempre está completo.
+
+    Los arrays se abren memory-mapped de solo lectura: con varios workers
+    (ej: `uvicorn --workers N`) todos comparten las mismas páginas del page
+    cache, sin copias por proceso. `load_or_build` asegura además que un
+    artefacto faltante lo construya un solo proceso.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def dataset_fingerprint(self, source_path: str) -> str:
+        """Calcula el SHA-256 del archivo fuente, reutilizándolo si mtime/tamaño no cambiaron
+
+        Args:
+            source_path: Ruta al archivo fuente (ej: dataset.xlsx)
+
+        Returns:
+            Hash SHA-256 en hexadecimal
+        """
+        stat = os.stat(source_path)
+        cache_path = self.root / FINGERPRINT_FILE
+        key = {"path": str(Path(source_path).resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        try:
+            cached = json.loads(cache_path.read_text())
+            if all(cached.get(k) == v for k, v in key.items()) and cached.get("sha256"):
+                return cached["sha256"]
+        except (OSError, ValueError):
+            pass
+
+        digest = hashlib.sha256()
+        with open(source_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{FINGERPRINT_FILE}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({**key, "sha256": sha256}))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            logger.warning("Could not persist dataset fingerprint in %s", self.root)
+
+        return sha256
+
+    def load(self, name: str, mmap: bool = True) -> Optional[Tuple[Dict[str, np.ndarray], Dict]]:
+        """Carga un artefacto si existe
+
+        Args:
+            name: Nombre del artefacto (directorio dentro de root)
+            mmap: Si True, los arrays se abren con memory-mapping de solo lectura
+
+        Returns:
+            Tupla (arrays, meta) o None si el artefacto no existe o está corrupto
+        """
+        directory = self.root / name
+        try:
+            meta = json.loads((directory / META_FILE).read_text())
+            arrays = {
+                key: np.load(directory / f"{key}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+                for key in meta["arrays"]
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+        return arrays, meta
+
+    @contextmanager
+    def build_lock(self, name: str) -> Iterator[None]:
+        """Lock exclusivo entre procesos para construir un artefacto
+
+        Usa `flock` sobre un archivo `.lock` en root. Si no hay `fcntl` o no se
+        puede crear el archivo (ej: sistema de archivos de solo lectura), no
+        bloquea: cada proceso construye su propia copia como antes.
+        """
+        if fcntl is None:
+            yield
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.root / f".{name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def load_or_build(self, name: str, load: Callable[[], Optional[T]], build: Callable[[], T],
+                      save: Callable[[T], bool]) -> T:
+        """Carga un artefacto o, si falta, lo construye un solo proceso
+
+        Los demás procesos esperan en `build_lock` y luego cargan el artefacto
+        ya escrito. El proceso que lo construye también lo vuelve a abrir
+        memory-mapped, para compartir las páginas en lugar de conservar su
+        copia en el heap.
+
+        Args:
+            name: Nombre del artefacto (identifica el lock)
+            load: Carga el artefacto; retorna None si no existe o no es válido
+            build: Construye el objeto desde cero
+            save: Persiste el objeto; retorna True si quedó disponible
+
+        Returns:
+            El objeto cargado del artefacto, o el construido si no se pudo persistir
+        """
+        loaded = load()
+        if loaded is not None:
+            return loaded
+        with self.build_lock(name):
+            # Otro proceso pudo haberlo escrito mientras se esperaba el lock
+            loaded = load()
+            if loaded is not None:
+                return loaded
+            built = build()
+            if save(built):
+                loaded = load()
+            return built if loaded is None else loaded
+
+    def save(self, name: str, arrays: Dict[str, np.ndarray], meta: Dict) -> bool:
+        """Guarda un artefacto de forma atómica (best-effort)
+
+        Args:
+            name: Nombre del artefacto (directorio dentro de root)
+            arrays: Arrays a persistir, uno por archivo `.npy`
+            meta: Metadatos serializables en JSON
+
+        Returns:
+            True si el artefacto quedó disponible, False si no se pudo escribir
+            (ej: sistema de archivos de solo lectura en serverless)
+        """
+        directory = self.root / name
+        tmp_dir = self.root / f".{name}.{os.getpid()}.tmp"
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir()
+            for key, array in arrays.items():
+                np.save(tmp_dir / f"{key}.npy", np.ascontiguousarray(array), allow_pickle=False)
+            (tmp_dir / META_FILE).write_text(json.dumps({**meta, "arrays": list(arrays)}))
+
+            if directory.exists():
+                # Otro proceso ya lo compiló: el contenido es equivalente
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return True
+            os.rename(tmp_dir, directory)
+            return True
+        except OSError:
+            if directory.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return True
+            logger.warning("Could not write artifact %s in %s", name, self.root)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
@@ -0,0 +1,84 @@
+"""
+Snapshot binario del dataset de ciudades compilado desde el Excel
+"""
+from typing import Optional
+
+import numpy as np
+
+from graphmap.domain.model.entities.city_table import CityTable
+from graphmap.infrastructure.persistence.artifact_store import ArtifactStore
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def snapshot_name(dataset_hash: str) -> str:
+    """Nombre del directorio del snapshot para una versión del dataset"""
+    return f"cities-v{SNAPSHOT_FORMAT_VERSION}-{dataset_hash[:16]}"
+
+
+def save_city_snapshot(store: ArtifactStore, table: CityTable, dataset_hash: str) -> bool:
+    """Persiste la tabla de ciudades como arrays columnares
+
+    La tabla de strings se guarda como un blob UTF-8 más un array de offsets
+    (en bytes), para que todo el snapshot sean arrays planos memory-mappables.
+
+    Args:
+        store: Almacén de artefactos
+        table: Tabla de ciudades a persistir
+        dataset_hash: Hash SHA-256 del Excel de origen
+
+    Returns:
+        True si el snapshot quedó disponible
+    """
+    encoded = [s.encode("utf-8") for s in table.strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    arrays = {
+        "id": table.ids,
+        "lat": table.lat,
+        "lng": table.lng,
+        "population": table.population,
+        "strings_blob": blob,
+        "strings_offsets": offsets,
+    }
+    arrays.update({f"str_{name}": codes for name, codes in table.string_codes.items()})
+
+    meta = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "dataset_sha256": dataset_hash,
+        "num_rows": len(table),
+    }
+    return store.save(snapshot_name(dataset_hash), arrays, meta)
+
+
+def load_city_snapshot(store: ArtifactStore, dataset_hash: str) -> Optional[CityTable]:
+    """Carga el snapshot de ciudades correspondiente a una versión del dataset
+
+    Args:
+        store: Almacén de artefactos
+        dataset_hash: Hash SHA-256 del Excel actual
+
+    Returns:
+        CityTable con columnas memory-mapped, o None si no existe o es de otra versión
+    """
+    loaded = store.load(snapshot_name(dataset_hash))
+    if loaded is None:
+        return None
+    arrays, meta = loaded
+    if meta.get("format_version") != SNAPSHOT_FORMAT_VERSION or meta.get("dataset_sha256") != dataset_hash:
+        return None
+
+    blob = arrays["strings_blob"].tobytes()
+    offsets = arrays["strings_offsets"].tolist()
+    strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    return CityTable(
+        ids=arrays["id"],
+        lat=arrays["lat"],
+        lng=arrays["lng"],
+        population=arrays["population"],
+        string_codes={name: arrays[f"str_{name}"] for name in CityTable.STRING_COLUMNS},
+        strings=strings,
+    )
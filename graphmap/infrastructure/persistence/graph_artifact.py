@@ -0,0 +1,177 @@
+"""
+Artefacto persistido del grafo de ciudades en formato CSR
+"""
+from typing import Optional, Union
+
+import numpy as np
+
+from graphmap.domain.model.entities.contraction_hierarchy import ContractionHierarchy
+from graphmap.domain.model.entities.csr_graph import CSRCityGraph
+from graphmap.domain.model.entities.graph import CityGraph
+from graphmap.domain.model.entities.landmarks import LandmarkTable
+from graphmap.infrastructure.persistence.artifact_store import ArtifactStore
+
+GRAPH_FORMAT_VERSION = 3
+
+
+def graph_artifact_name(dataset_hash: str, max_distance_km: Optional[float]) -> str:
+    """Nombre del artefacto para una versión del dataset y un límite de distancia"""
+    limit = "inf" if max_distance_km is None else f"{max_distance_km:g}"
+    return f"graph-v{GRAPH_FORMAT_VERSION}-{dataset_hash[:16]}-{limit}km"
+
+
+def save_graph_artifact(store: ArtifactStore, graph: Union[CityGraph, CSRCityGraph],
+                        dataset_hash: str, max_distance_km: Optional[float]) -> bool:
+    """Persiste el grafo como arrays CSR (node_ids/indptr/indices/weights) y
+    la etiqueta de componente conexa de cada nodo
+
+    Args:
+        store: Almacén de artefactos
+        graph: Grafo construido
+        dataset_hash: Hash SHA-256 del dataset de origen
+        max_distance_km: Límite de distancia usado al construir el grafo
+
+    Returns:
+        True si el artefacto quedó disponible
+    """
+    if not isinstance(graph, CSRCityGraph):
+        graph = CSRCityGraph.from_city_graph(graph)
+    node_ids, indptr, indices, weights = graph.to_csr()
+    meta = {
+        "format_version": GRAPH_FORMAT_VERSION,
+        "dataset_sha256": dataset_hash,
+        "max_distance_km": max_distance_km,
+    }
+    return store.save(
+        graph_artifact_name(dataset_hash, max_distance_km),
+        {
+            "node_ids": node_ids,
+            "indptr": indptr,
+            "indices": indices.astype(np.int32, copy=False),
+            "weights": weights.astype(np.float32, copy=False),
+            "components": graph.components,
+        },
+        meta,
+    )
+
+
+def load_graph_artifact(store: ArtifactStore, dataset_hash: str,
+                        max_distance_km: Optional[float]) -> Optional[CSRCityGraph]:
+    """Carga el grafo precomputado (arrays memory-mapped)
+
+    Args:
+        store: Almacén de artefactos
+        dataset_hash: Hash SHA-256 del dataset actual
+        max_distance_km: Límite de distancia esperado
+
+    Returns:
+        CSRCityGraph respaldado por los arrays del artefacto, o None si no
+        hay artefacto para esa combinación
+    """
+    loaded = store.load(graph_artifact_name(dataset_hash, max_distance_km))
+    if loaded is None:
+        return None
+    arrays, meta = loaded
+    if (meta.get("format_version") != GRAPH_FORMAT_VERSION
+            or meta.get("dataset_sha256") != dataset_hash
+            or meta.get("max_distance_km") != max_distance_km):
+        return None
+
+    return CSRCityGraph(arrays["node_ids"], arrays["indptr"], arrays["indices"], arrays["weights"],
+                        arrays["components"])
+
+
+def landmark_artifact_name(dataset_hash: str, max_distance_km: Optional[float], num_landmarks: int) -> str:
+    """Nombre del artefacto de landmarks asociado a un grafo"""
+    return f"{graph_artifact_name(dataset_hash, max_distance_km)}-alt{num_landmarks}"
+
+
+def save_landmark_artifact(store: ArtifactStore, table: LandmarkTable, dataset_hash: str,
+                           max_distance_km: Optional[float], num_landmarks: int) -> bool:
+    """Persiste las tablas de landmarks junto al grafo del que provienen
+
+    Args:
+        store: Almacén de artefactos
+        table: Landmarks y distancias precomputadas
+        dataset_hash: Hash SHA-256 del dataset de origen
+        max_distance_km: Límite de distancia del grafo
+        num_landmarks: Número de landmarks solicitado
+
+    Returns:
+        True si el artefacto quedó disponible
+    """
+    meta = {
+        "format_version": GRAPH_FORMAT_VERSION,
+        "dataset_sha256": dataset_hash,
+        "max_distance_km": max_distance_km,
+        "num_landmarks": num_landmarks,
+    }
+    return store.save(
+        landmark_artifact_name(dataset_hash, max_distance_km, num_landmarks),
+        {"landmarks": table.landmarks, "distances": table.distances},
+        meta,
+    )
+
+
+def load_landmark_artifact(store: ArtifactStore, dataset_hash: str,
+                           max_distance_km: Optional[float], num_landmarks: int) -> Optional[LandmarkTable]:
+    """Carga las tablas de landmarks precomputadas (arrays memory-mapped)
+
+    Returns:
+        LandmarkTable o None si no hay artefacto para esa combinación
+    """
+    loaded = store.load(landmark_artifact_name(dataset_hash, max_distance_km, num_landmarks))
+    if loaded is None:
+        return None
+    arrays, meta = loaded
+    if meta.get("format_version") != GRAPH_FORMAT_VERSION or meta.get("dataset_sha256") != dataset_hash:
+        return None
+    return LandmarkTable(arrays["landmarks"], arrays["distances"])
+
+
+def contraction_hierarchy_artifact_name(dataset_hash: str, max_distance_km: Optional[float]) -> str:
+    """Nombre del artefacto de Contraction Hierarchies asociado a un grafo"""
+    return f"{graph_artifact_name(dataset_hash, max_distance_km)}-ch"
+
+
+def save_contraction_hierarchy_artifact(store: ArtifactStore, hierarchy: ContractionHierarchy,
+                                        dataset_hash: str, max_distance_km: Optional[float]) -> bool:
+    """Persiste el índice CH (ranks y grafo ascendente con atajos)
+
+    Returns:
+        True si el artefacto quedó disponible
+    """
+    meta = {
+        "format_version": GRAPH_FORMAT_VERSION,
+        "dataset_sha256": dataset_hash,
+        "max_distance_km": max_distance_km,
+    }
+    return store.save(
+        contraction_hierarchy_artifact_name(dataset_hash, max_distance_km),
+        {
+            "rank": hierarchy.rank,
+            "up_indptr": hierarchy.up_indptr,
+            "up_indices": hierarchy.up_indices,
+            "up_weights": hierarchy.up_weights,
+            "up_mid": hierarchy.up_mid,
+        },
+        meta,
+    )
+
+
+def load_contraction_hierarchy_artifact(store: ArtifactStore, dataset_hash: str,
+                                        max_distance_km: Optional[float]) -> Optional[ContractionHierarchy]:
+    """Carga el índice CH precomputado
+
+    Returns:
+        ContractionHierarchy o None si no hay artefacto para esa combinación
+    """
+    loaded = store.load(contraction_hierarchy_artifact_name(dataset_hash, max_distance_km))
+    if loaded is None:
+        return None
+    arrays, meta = loaded
+    if meta.get("format_version") != GRAPH_FORMAT_VERSION or meta.get("dataset_sha256") != dataset_hash:
+        return None
+    return ContractionHierarchy(
+        arrays["rank"], arrays["up_indptr"], arrays["up_indices"], arrays["up_weights"], arrays["up_mid"]
+    )
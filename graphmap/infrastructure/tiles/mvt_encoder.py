@@ -0,0 +1,126 @@
+"""
+Codificador mínimo de Mapbox Vector Tiles (MVT 2.1) sin dependencias externas
+"""
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+PropertyValue = Union[str, int, float, bool]
+
+# Tipos de geometría (vector_tile.proto)
+POINT, LINESTRING = 1, 2
+# Comandos de geometría
+MOVE_TO, LINE_TO = 1, 2
+# Tipos de cable de protobuf
+VARINT, FIXED64, LENGTH_DELIMITED = 0, 1, 2
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _varint(value: int) -> bytes:
+    """Entero sin signo en formato varint de protobuf"""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    """Codificación zigzag: enteros con signo pequeños -> varints cortos"""
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _packed_field(number: int, values: Sequence[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(value) for value in values))
+
+
+def _command(command_id: int, count: int) -> int:
+    return (command_id & 0x7) | (count << 3)
+
+
+class MVTLayer:
+    """Capa de un vector tile con sus features, claves y valores deduplicados
+
+    Las coordenadas son enteros en el espacio del tile (0..extent, con el
+    eje y hacia abajo); pueden salirse del rango para el buffer de recorte.
+    """
+
+    VERSION = 2
+
+    def __init__(self, name: str, extent: int = 4096):
+        self.name = name
+        self.extent = extent
+        self._features: List[bytes] = []
+        self._keys: Dict[str, int] = {}
+        self._values: Dict[Tuple[type, PropertyValue], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def add_point(self, x: int, y: int, properties: Dict[str, PropertyValue],
+                  feature_id: Optional[int] = None) -> None:
+        """Agrega un punto"""
+        geometry = [_command(MOVE_TO, 1), _zigzag(x), _zigzag(y)]
+        self._add_feature(POINT, geometry, properties, feature_id)
+
+    def add_line(self, coordinates: Sequence[Tuple[int, int]], properties: Dict[str, PropertyValue],
+                 feature_id: Optional[int] = None) -> None:
+        """Agrega una línea (al menos dos vértices)"""
+        (x, y), rest = coordinates[0], coordinates[1:]
+        geometry = [_command(MOVE_TO, 1), _zigzag(x), _zigzag(y), _command(LINE_TO, len(rest))]
+        for next_x, next_y in rest:
+            geometry += (_zigzag(next_x - x), _zigzag(next_y - y))
+            x, y = next_x, next_y
+        self._add_feature(LINESTRING, geometry, properties, feature_id)
+
+    def _add_feature(self, geometry_type: int, geometry: List[int],
+                     properties: Dict[str, PropertyValue], feature_id: Optional[int]) -> None:
+        tags = []
+        for key, value in properties.items():
+            tags.append(self._keys.setdefault(key, len(self._keys)))
+            # El tipo forma parte de la clave: 1 y True no son el mismo valor
+            tags.append(self._values.setdefault((type(value), value), len(self._values)))
+
+        feature = b""
+        if feature_id is not None:
+            feature += _field(1, VARINT) + _varint(feature_id)
+        if tags:
+            feature += _packed_field(2, tags)
+        feature += _field(3, VARINT) + _varint(geometry_type)
+        feature += _packed_field(4, geometry)
+        self._features.append(feature)
+
+    @staticmethod
+    def _encode_value(value: PropertyValue) -> bytes:
+        if isinstance(value, bool):
+            return _field(7, VARINT) + _varint(int(value))
+        if isinstance(value, int):
+            if value >= 0:
+                return _field(5, VARINT) + _varint(value)
+            return _field(6, VARINT) + _varint(_zigzag(value))
+        if isinstance(value, float):
+            return _field(3, FIXED64) + _DOUBLE.pack(value)
+        return _bytes_field(1, str(value).encode("utf-8"))
+
+    def encode(self) -> bytes:
+        """Serializa la capa (mensaje Layer de vector_tile.proto)"""
+        parts = [_field(15, VARINT) + _varint(self.VERSION), _bytes_field(1, self.name.encode("utf-8"))]
+        parts += [_bytes_field(2, feature) for feature in self._features]
+        parts += [_bytes_field(3, key.encode("utf-8")) for key in self._keys]
+        parts += [_bytes_field(4, self._encode_value(value)) for _, value in self._values]
+        parts.append(_field(5, VARINT) + _varint(self.extent))
+        return b"".join(parts)
+
+
+def encode_tile(layers: Sequence[MVTLayer]) -> bytes:
+    """Serializa un tile con las capas no vacías (mensaje Tile de vector_tile.proto)"""
+    return b"".join(_bytes_field(3, layer.encode()) for layer in layers if len(layer))
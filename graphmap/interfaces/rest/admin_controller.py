@@ -0,0 +1,54 @@
+"""
+Controlador para los endpoints de administración (recarga del dataset)
+"""
+import secrets
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from config import settings
+from graphmap.domain.services.reload_service import ReloadService
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Exige el header X-Admin-Token igual a ADMIN_TOKEN (sin ADMIN_TOKEN, los endpoints no existen)"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+# Crear un router para los endpoints de administración
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+# Instanciar servicio
+reload_service = ReloadService()
+
+
+@router.post("/reload")
+async def reload_dataset(wait: bool = False):
+    """
+    Endpoint que recarga el dataset sin reiniciar el servidor
+
+    La versión nueva (tabla, grafo y cachés) se construye en segundo plano
+    y se publica de una vez; mientras tanto los requests usan la anterior.
+    Responde 202 de inmediato, o 200 con el resultado si wait=true; 409 si
+    ya hay una recarga en curso.
+    """
+    started = await run_in_threadpool(reload_service.start, wait)
+    if not started:
+        raise HTTPException(status_code=409, detail="A dataset reload is already running")
+    return JSONResponse(status_code=200 if wait else 202, content=reload_service.status())
+
+
+@router.get("/reload")
+async def get_reload_status() -> Dict:
+    """
+    Endpoint que retorna el estado de la recarga, la versión publicada del
+    grafo y el resultado de la última recarga
+    """
+    return reload_service.status()
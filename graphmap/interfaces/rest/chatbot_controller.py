@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from graphmap.domain.services.chatbot_service import ChatbotService
+from graphmap.domain.services.compute_pool import ComputePoolSaturated
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,7 @@ async def chat_with_bot(request: ChatRequest):
     Endpoint para chatear con el bot sobre el grafo
     """
     try:
-        result = chatbot_service.chat(
+        result = await chatbot_service.chat(
             user_message=request.message,
             conversation_history=request.conversation_history
         )
@@ -56,6 +57,8 @@ async def chat_with_bot(request: ChatRequest):
             tool_used=result["tool_used"]
         )
 
+    except ComputePoolSaturated:
+        raise
     except RuntimeError:
         logger.exception("Chat processing failed")
         raise HTTPException(
@@ -1,10 +1,16 @@
 """
 Controlador para los endpoints relacionados con ciudades
 """
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.compute_pool import compute_pool
 from graphmap.domain.model.entities.city import City
+from graphmap.domain.model.entities.city_record import CityRecord
+from graphmap.infrastructure.http.static_payload import dumps_json
+from graphmap.infrastructure.http import wire_format as wire
+from graphmap.interfaces.rest.viewport_params import ViewportParams
 
 # Crear un router para los endpoints de ciudades
 router = APIRouter(
@@ -18,42 +24,146 @@ city_service = CityService()
 
 
 @router.get("/")
-async def get_all_cities():
+async def get_all_cities(request: Request, viewport: ViewportParams = Depends()):
     """
     Endpoint que retorna todas las ciudades
+
+    Sin parámetros sirve la respuesta precomprimida (gzip/brotli) con
+    ETag y Last-Modified; responde 304 si el cliente ya la tiene.
+    Con min_lat/min_lng/max_lat/max_lng solo devuelve las ciudades del
+    viewport; con zoom, solo las más pobladas de cada celda del mapa
+    (ordenadas por población).
+
+    Con `Accept: application/octet-stream` responde arrays tipados
+    little-endian (id uint32, lat/lng float32, nombres UTF-8) y con
+    `Accept: application/vnd.apache.arrow.stream` un stream Arrow IPC
+    (si pyarrow está instalado). El formato está descrito en
+    graphmap/infrastructure/http/wire_format.py.
     """
-    cities = city_service.load_cities_from_excel()
-    
+    wire_format = wire.negotiate(request.headers.get("accept", ""))
+    if viewport.is_full:
+        payload = await compute_pool.run(city_service.get_cities_payload, wire_format)
+        return payload.response(request)
+
+    if wire_format != wire.JSON:
+        body = await compute_pool.run(city_service.encode_cities_in_view, viewport.bbox, viewport.zoom, wire_format)
+        return Response(content=body, media_type=wire.MEDIA_TYPES[wire_format], headers={"Vary": "Accept"})
+
     # Datos automáticamente optimizados para el mapa
-    city_data = [
+    return await compute_pool.run(
+        lambda: city_service.to_map_data(city_service.cities_in_view(viewport.bbox, viewport.zoom))
+    )
+
+
+@router.get("/count")
+async def get_cities_count():
+    """
+    Endpoint que retorna el número total de ciudades
+    """
+    total = await compute_pool.run(city_service.get_cities_count)
+    return {"total_cities": total}
+
+
+@router.get("/autocomplete")
+async def autocomplete_cities(
+    q: str = Query(..., min_length=1, description="Prefijo del nombre de la ciudad"),
+    limit: int = Query(10, ge=1, le=100, description="Máximo de sugerencias"),
+    offset: int = Query(0, ge=0, description="Sugerencias a saltar")
+):
+    """
+    Endpoint que sugiere ciudades cuyo nombre empieza por el prefijo
+    """
+    cities = await compute_pool.run(city_service.autocomplete_cities, q, limit, offset)
+
+    # Datos mínimos para una lista de sugerencias
+    suggestions = [
         {
             "id": city.id,
             "city": city.city,
+            "admin_name": city.admin_name,
+            "country": city.country,
             "lat": city.lat,
             "lng": city.lng
         }
         for city in cities
     ]
 
+    return {"suggestions": suggestions}
+
+
+def _with_distance(city: CityRecord, distance_km: float) -> dict:
+    """Datos de una ciudad resultado de una consulta espacial"""
     return {
-        "cities": city_data,
-        "total": len(city_data)
+        "id": city.id,
+        "city": city.city,
+        "admin_name": city.admin_name,
+        "country": city.country,
+        "lat": city.lat,
+        "lng": city.lng,
+        "population": city.population,
+        "distance_km": round(distance_km, 3)
     }
 
 
-@router.get("/count")
-async def get_cities_count():
+@router.get("/nearest")
+async def get_nearest_cities(
+    lat: float = Query(..., ge=-90, le=90, description="Latitud en grados"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitud en grados"),
+    k: int = Query(1, ge=1, le=100, description="Número de ciudades")
+):
     """
-    Endpoint que retorna el número total de ciudades
+    Endpoint que retorna las k ciudades más cercanas a una coordenada (distancia Haversine)
     """
-    total = city_service.get_cities_count()
-    return {"total_cities": total}
+    nearest = await compute_pool.run(city_service.nearest_cities, lat, lng, k)
+    return {"cities": [_with_distance(city, distance) for city, distance in nearest]}
+
+
+@router.get("/within")
+async def get_cities_within(
+    lat: float = Query(..., ge=-90, le=90, description="Latitud en grados"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitud en grados"),
+    radius_km: float = Query(..., gt=0, le=20040, description="Radio en kilómetros"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de resultados (por defecto todos)"),
+    offset: int = Query(0, ge=0, description="Resultados a saltar")
+):
+    """
+    Endpoint que retorna las ciudades dentro de un radio, ordenadas por distancia
+    """
+    matches = await compute_pool.run(city_service.cities_within, lat, lng, radius_km)
+    end = None if limit is None else offset + limit
+    # Se serializa directamente: se evita el jsonable_encoder sobre miles de ciudades
+    content = dumps_json({
+        "cities": [_with_distance(city, distance) for city, distance in matches[offset:end]],
+        "total": len(matches)
+    })
+    return Response(content=content, media_type=wire.MEDIA_TYPES[wire.JSON])
 
 
 @router.get("/{query}", response_model=List[City])
-async def get_cities_name(query: str):
+async def get_cities_name(
+    request: Request,
+    query: str,
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de resultados (por defecto todos)"),
+    offset: int = Query(0, ge=0, description="Resultados a saltar"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo (compara el nombre completo)"),
+    max_distance: int = Query(2, ge=0, le=2, description="Distancia de edición máxima en modo fuzzy")
+):
     """
-    Endpoint que busca ciudades por nombre
+    Endpoint que busca ciudades por nombre (exactas, luego prefijo, luego subcadena)
+
+    Con `fuzzy=true` devuelve las ciudades cuyo nombre está a distancia de
+    edición <= `max_distance`, ordenadas por distancia y población.
+
+    Con `Accept: application/x-ndjson` la búsqueda corre en el pool de
+    cómputo y los resultados se envían en streaming, una ciudad por línea.
     """
-    results = city_service.search_cities(query)
-    return results  # Sin límite - devuelve todos los resultados encontrados
\ No newline at end of file
+    if wire.negotiate(request.headers.get("accept", ""), (wire.NDJSON,)) == wire.NDJSON:
+        results = await compute_pool.run(
+            city_service.get_search_results_json, query, limit, offset, fuzzy, max_distance
+        )
+        lines = (result.decode("utf-8") for result in results)
+        return StreamingResponse(wire.ndjson_chunks(lines), media_type=wire.MEDIA_TYPES[wire.NDJSON])
+
+    # JSON precalculado por ciudad: no se crea ni se revalida un modelo de pydantic por resultado
+    content = await compute_pool.run(city_service.encode_search_results, query, limit, offset, fuzzy, max_distance)
+    return Response(content=content, media_type=wire.MEDIA_TYPES[wire.JSON])
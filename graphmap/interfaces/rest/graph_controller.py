@@ -1,11 +1,17 @@
 """
 Controlador para los endpoints relacionados con el grafo de proximidad
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple
+from graphmap.domain.services.compute_pool import compute_pool
+from graphmap.domain.services.graph_analytics_service import CentralityMetric, GraphAnalyticsService
 from graphmap.domain.services.graph_service import GraphService
-from graphmap.domain.services.pathfinding_service import PathfindingService
-from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.pathfinding_service import RoutingEngine
+from graphmap.infrastructure.cache.dataset_snapshot import DatasetSnapshot
+from graphmap.infrastructure.http import wire_format as wire
+from graphmap.interfaces.rest.viewport_params import ViewportParams
 
 # Crear un router para los endpoints del grafo
 router = APIRouter(
@@ -16,29 +22,63 @@ router = APIRouter(
 
 # Instanciar servicios
 graph_service = GraphService()
-city_service = CityService()
+analytics_service = GraphAnalyticsService()
+
+
+class DistanceMatrixRequest(BaseModel):
+    """Modelo para solicitudes de distancias en lote"""
+    sources: List[int] = Field(..., min_length=1, description="IDs de las ciudades origen")
+    targets: List[int] = Field(..., min_length=1, description="IDs de las ciudades destino")
+
+
+class RoutesRequest(DistanceMatrixRequest):
+    """Modelo para solicitudes de rutas en lote"""
+    include_path: bool = Field(True, description="Si False se omiten los caminos (solo distancias)")
+
+
+def _edge_lines(sources, targets):
+    """Una línea JSON {"source", "target"} por arista, convirtiendo los arrays por bloques"""
+    for start in range(0, len(sources), wire.NDJSON_BATCH_SIZE):
+        block = slice(start, start + wire.NDJSON_BATCH_SIZE)
+        for source, target in zip(sources[block].tolist(), targets[block].tolist()):
+            yield f'{{"source":{source},"target":{target}}}'
 
 
 @router.get("/edges")
-async def get_graph_edges():
+async def get_graph_edges(request: Request, viewport: ViewportParams = Depends()):
     """
     Endpoint que retorna las conexiones del grafo
+
+    Sin parámetros sirve la respuesta precomprimida (gzip/brotli) con
+    ETag y Last-Modified; responde 304 si el cliente ya la tiene.
+    Con bbox y/o zoom solo devuelve las aristas cuyos dos extremos son
+    ciudades visibles (las mismas que /cities/ con esos parámetros).
+
+    Con `Accept: application/octet-stream` responde arrays tipados
+    little-endian (source/target uint32) y con
+    `Accept: application/vnd.apache.arrow.stream` un stream Arrow IPC
+    (si pyarrow está instalado). Con `Accept: application/x-ndjson` las
+    aristas se calculan en el pool de cómputo y se envían en streaming,
+    una por línea.
     """
-    edges = graph_service.get_graph_edges()
-    
+    wire_format = wire.negotiate(request.headers.get("accept", ""), wire.available_formats() + [wire.NDJSON])
+    if wire_format == wire.NDJSON:
+        sources, targets = await compute_pool.run(graph_service.get_graph_edge_ids, viewport.bbox, viewport.zoom)
+        return StreamingResponse(wire.ndjson_chunks(_edge_lines(sources, targets)),
+                                 media_type=wire.MEDIA_TYPES[wire.NDJSON])
+
+    if viewport.is_full:
+        payload = await compute_pool.run(graph_service.get_edges_payload, wire_format)
+        return payload.response(request)
+
+    if wire_format != wire.JSON:
+        body = await compute_pool.run(graph_service.encode_edges_in_view, viewport.bbox, viewport.zoom, wire_format)
+        return Response(content=body, media_type=wire.MEDIA_TYPES[wire_format], headers={"Vary": "Accept"})
+
     # Datos automáticamente optimizados para conexiones
-    optimized_edges = [
-        {
-            "source": edge["source"],
-            "target": edge["target"]
-        }
-        for edge in edges
-    ]
-    
-    return {
-        "edges": optimized_edges,
-        "total_edges": len(optimized_edges)
-    }
+    return await compute_pool.run(
+        lambda: graph_service.to_map_data(graph_service.get_graph_edges_in_view(viewport.bbox, viewport.zoom))
+    )
 
 
 @router.get("/summary")
@@ -46,32 +86,195 @@ async def get_graph_summary() -> Dict:
     """
     Endpoint que retorna el resumen del grafo (nodos y aristas)
     """
-    summary = graph_service.get_graph_summary()
+    summary = await compute_pool.run(graph_service.get_graph_summary)
     return summary
 
 
+def _resolve_endpoint(name: str, city_id: Optional[int], lat: Optional[float],
+                      lng: Optional[float], snapshot: DatasetSnapshot) -> Tuple[int, Optional[Dict]]:
+    """
+    Obtiene el ID de ciudad de un extremo de la ruta: dado directamente o
+    ajustando la coordenada a la ciudad del grafo más cercana
+
+    Returns:
+        Tupla (ID de ciudad, datos del ajuste o None si se usó el ID)
+    """
+    if city_id is not None:
+        return city_id, None
+    if lat is None or lng is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide either {name}_id or both {name}_lat and {name}_lng"
+        )
+
+    snapped = graph_service.snap_to_graph(lat, lng, snapshot)
+    if snapped is None:
+        raise HTTPException(status_code=404, detail="El grafo no tiene ciudades")
+    snapped_id, distance_km = snapped
+    return snapped_id, {"lat": lat, "lng": lng, "city_id": snapped_id, "distance_km": round(distance_km, 3)}
+
+
+def _shortest_path(start_id: Optional[int], goal_id: Optional[int], start_lat: Optional[float],
+                   start_lng: Optional[float], goal_lat: Optional[float], goal_lng: Optional[float],
+                   engine: RoutingEngine) -> Dict:
+    """Resuelve /graph/shortest-path (se ejecuta en el pool de cálculo)"""
+    # Una sola versión del grafo para ajustar, buscar y explicar un 404,
+    # aunque se publique otra (recarga) a mitad del request
+    snapshot = graph_service.get_snapshot()
+    start_id, start_snap = _resolve_endpoint("start", start_id, start_lat, start_lng, snapshot)
+    goal_id, goal_snap = _resolve_endpoint("goal", goal_id, goal_lat, goal_lng, snapshot)
+
+    # Ejecutar el motor seleccionado (con caché de rutas)
+    try:
+        result = graph_service.find_shortest_path(start_id, goal_id, engine, snapshot)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        # Motivo concreto (ciudad inexistente, sin aristas o en otra componente), en O(1)
+        reason = graph_service.get_unreachable_reason(start_id, goal_id, snapshot)
+        raise HTTPException(
+            status_code=404,
+            detail=reason or f"No se encontró camino entre ciudad {start_id} y ciudad {goal_id}"
+        )
+
+    if start_snap is None and goal_snap is None:
+        return result
+    # Copia: el resultado puede estar compartido con la caché de rutas
+    return {**result, "snapped": {"start": start_snap, "goal": goal_snap}}
+
+
 @router.get("/shortest-path")
 async def find_shortest_path(
-    start_id: int = Query(..., description="ID de la ciudad origen", ge=0),
-    goal_id: int = Query(..., description="ID de la ciudad destino", ge=0)
+    start_id: Optional[int] = Query(None, description="ID de la ciudad origen", ge=0),
+    goal_id: Optional[int] = Query(None, description="ID de la ciudad destino", ge=0),
+    start_lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitud de origen (si no se da start_id)"),
+    start_lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitud de origen (si no se da start_id)"),
+    goal_lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitud de destino (si no se da goal_id)"),
+    goal_lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitud de destino (si no se da goal_id)"),
+    engine: RoutingEngine = Query(
+        RoutingEngine.ASTAR,
+        description="Algoritmo: astar (Haversine), alt (landmarks + desigualdad triangular), "
+                    "ch (Contraction Hierarchies), bidijkstra (Dijkstra bidireccional) "
+                    "o biastar (A* bidireccional)"
+    )
 ) -> Dict:
     """
     Endpoint que encuentra el camino más corto entre dos ciudades usando A*
+
+    Cada extremo puede indicarse por ID o por coordenadas; las coordenadas
+    se ajustan a la ciudad del grafo más cercana y el ajuste se informa en `snapped`.
     """
-    # Construir grafo y cargar ciudades (con caché)
-    graph = graph_service.build_city_graph()
-    cities = city_service.load_cities_from_excel()
+    return await compute_pool.run(
+        _shortest_path, start_id, goal_id, start_lat, start_lng, goal_lat, goal_lng, engine
+    )
 
-    # Inicializar servicio de pathfinding
-    pathfinding = PathfindingService(graph, cities)
 
-    # Ejecutar A*
-    result = pathfinding.a_star(start_id, goal_id)
+@router.get("/route-cache/stats")
+async def get_route_cache_stats() -> Dict:
+    """
+    Endpoint que retorna los contadores de la caché de rutas (hits, misses, evictions)
+    """
+    return graph_service.get_route_cache_stats()
 
-    if result is None:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No se encontró camino entre ciudad {start_id} y ciudad {goal_id}, o las ciudades no existen en el grafo"
+
+@router.post("/distance-matrix")
+async def get_distance_matrix(request: DistanceMatrixRequest) -> JSONResponse:
+    """
+    Endpoint que calcula la matriz de distancias (km) entre listas de ciudades
+
+    `distances[i][j]` es la distancia de `sources[i]` a `targets[j]`, o null si no hay camino.
+    """
+    try:
+        # Cálculo intensivo: fuera del event loop
+        result = await compute_pool.run(
+            lambda: graph_service.get_distance_matrix_service().distance_matrix(request.sources, request.targets)
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Respuesta ya serializable: se evita el jsonable_encoder sobre S x T valores
+    return JSONResponse(result)
+
+
+@router.post("/routes")
+async def get_routes(request: RoutesRequest) -> JSONResponse:
+    """
+    Endpoint que calcula las rutas entre cada origen y cada destino
+
+    Cada ruta incluye la distancia (km, null si no hay camino) y, salvo
+    `include_path=false`, el camino como lista de IDs de ciudades.
+    """
+    try:
+        result = await compute_pool.run(
+            lambda: graph_service.get_distance_matrix_service().routes(
+                request.sources, request.targets, request.include_path
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(result)
+
+
+@router.get("/analytics/components")
+async def get_graph_components(
+    limit: int = Query(20, ge=1, le=1000, description="Número máximo de componentes listadas"),
+    max_city_ids: int = Query(20, ge=0, le=10000, description="Número máximo de IDs de ciudades por componente"),
+) -> JSONResponse:
+    """
+    Endpoint que retorna las componentes conexas del grafo, de mayor a menor
+
+    Las islas que deja el filtro de distancia máxima aparecen como
+    componentes chicas; las ciudades sin ninguna arista se listan en
+    `isolated_cities`.
+    """
+    result = await compute_pool.run(analytics_service.get_components, limit, max_city_ids)
+    return JSONResponse(result)
+
+
+@router.get("/analytics/degrees")
+async def get_graph_degrees(
+    top: int = Query(10, ge=0, le=1000, description="Número de ciudades de mayor grado a listar"),
+) -> JSONResponse:
+    """
+    Endpoint que retorna la distribución de grados (histograma, estadísticas
+    y ciudades con más conexiones)
+    """
+    result = await compute_pool.run(analytics_service.get_degree_distribution, top)
+    return JSONResponse(result)
+
 
-    return result
\ No newline at end of file
+@router.get("/analytics/distances/{city_id}")
+async def get_graph_distances(
+    city_id: int,
+    limit: Optional[int] = Query(None, ge=0, description="Número máximo de ciudades (las más cercanas)"),
+    max_km: Optional[float] = Query(None, ge=0, description="Distancia máxima por el grafo (km)"),
+) -> JSONResponse:
+    """
+    Endpoint que retorna la distancia por el grafo desde una ciudad a todas
+    las que puede alcanzar, de menor a mayor
+    """
+    try:
+        result = await compute_pool.run(analytics_service.get_distances_from, city_id, limit, max_km)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return JSONResponse(result)
+
+
+@router.get("/analytics/centrality")
+async def get_graph_centrality(
+    metric: CentralityMetric = Query(
+        CentralityMetric.BETWEENNESS,
+        description="closeness (exacta para los nodos muestreados) o "
+                    "betweenness (estimada para todos los nodos desde los muestreados)"
+    ),
+    samples: int = Query(64, ge=1, le=256, description="Número de nodos muestreados"),
+    top: int = Query(20, ge=1, le=1000, description="Número de ciudades a listar"),
+) -> JSONResponse:
+    """
+    Endpoint que retorna las ciudades más centrales según la métrica elegida
+
+    La muestra es determinista, así que el resultado se calcula una vez
+    por versión del grafo y tamaño de muestra.
+    """
+    result = await compute_pool.run(analytics_service.get_centrality, metric, samples, top)
+    return JSONResponse(result)
@@ -0,0 +1,44 @@
+"""
+Controlador para los endpoints de salud (liveness y readiness)
+"""
+from typing import Dict
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from graphmap.domain.services.compute_pool import compute_pool
+from graphmap.domain.services.warmup_service import WarmupService
+
+# Crear un router para los endpoints de salud
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+# Instanciar servicio
+warmup_service = WarmupService()
+
+
+@router.get("")
+async def health() -> Dict:
+    """
+    Endpoint de liveness: el proceso responde (no toca las cachés)
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Endpoint de readiness: 200 cuando ciudades, grafo y aristas están en
+    memoria; 503 mientras se cargan (incluye el progreso de la precarga)
+    """
+    readiness = warmup_service.readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+
+@router.get("/compute-pool")
+async def get_compute_pool_stats() -> Dict:
+    """
+    Endpoint que retorna la ocupación y los contadores del pool de cálculo
+    (tareas en curso, en cola, completadas y rechazadas con 429)
+    """
+    return compute_pool.stats()
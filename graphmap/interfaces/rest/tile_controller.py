@@ -0,0 +1,53 @@
+"""
+Controlador para los vector tiles (MVT) del mapa
+"""
+from typing import Dict, Optional
+from fastapi import APIRouter, Header, HTTPException, Response
+from graphmap.domain.services.compute_pool import compute_pool
+from graphmap.domain.services.tile_service import TileService
+
+# Crear un router para los endpoints de tiles
+router = APIRouter(
+    prefix="/tiles",
+    tags=["tiles"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Instanciar servicio
+tile_service = TileService()
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+TILE_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True si el ETag del cliente (If-None-Match) coincide con el actual"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+@router.get("/cache/stats")
+async def get_tile_cache_stats() -> Dict:
+    """
+    Endpoint que retorna los contadores de la caché de tiles
+    """
+    return tile_service.get_tile_cache_stats()
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+async def get_tile(z: int, x: int, y: int, if_none_match: Optional[str] = Header(None)):
+    """
+    Endpoint que retorna un vector tile (Mapbox Vector Tile) con las capas
+    `cities` y `edges`, en el esquema XYZ de Web Mercator
+    """
+    try:
+        content, etag = await compute_pool.run(tile_service.get_tile, z, x, y)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    headers = {"ETag": etag, "Cache-Control": TILE_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=MVT_MEDIA_TYPE, headers=headers)
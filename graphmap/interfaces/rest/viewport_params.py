@@ -0,0 +1,44 @@
+"""
+Parámetros de consulta comunes para endpoints filtrados por viewport
+"""
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from graphmap.domain.model.entities.viewport_index import BoundingBox
+
+
+class ViewportParams:
+    """Bounding box y zoom opcionales del mapa (dependencia de FastAPI)
+
+    Sin parámetros se devuelve el dataset completo. El bbox debe venir
+    completo (los cuatro valores); si min_lng > max_lng se interpreta que
+    cruza el antimeridiano.
+    """
+
+    def __init__(
+        self,
+        min_lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitud mínima del viewport"),
+        min_lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitud mínima del viewport"),
+        max_lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitud máxima del viewport"),
+        max_lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitud máxima del viewport"),
+        zoom: Optional[int] = Query(None, ge=0, le=22, description="Zoom del mapa (nivel de detalle)")
+    ):
+        corners = (min_lat, min_lng, max_lat, max_lng)
+        if all(value is None for value in corners):
+            self.bbox: Optional[BoundingBox] = None
+        elif any(value is None for value in corners):
+            raise HTTPException(
+                status_code=400,
+                detail="Provide all of min_lat, min_lng, max_lat and max_lng, or none of them"
+            )
+        elif min_lat > max_lat:
+            raise HTTPException(status_code=400, detail="min_lat must not be greater than max_lat")
+        else:
+            self.bbox = corners
+        self.zoom = zoom
+
+    @property
+    def is_full(self) -> bool:
+        """True si no se pidió ningún filtro (dataset completo)"""
+        return self.bbox is None and self.zoom is None
@@ -1,18 +1,39 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 import importlib
 import logging
 from config import settings
+from graphmap.domain.services.compute_pool import ComputePoolSaturated
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Precarga las cachés al arrancar (WARMUP_MODE) para que ningún request pague el arranque en frío"""
+    try:
+        from graphmap.domain.services.warmup_service import WarmupService
+        await run_in_threadpool(WarmupService().start, settings.WARMUP_MODE)
+    except Exception:
+        logger.exception("Failed to start cache warm-up")
+    try:
+        from graphmap.domain.services.reload_service import ReloadService
+        ReloadService().watch(settings.DATASET_WATCH_SECONDS)
+    except Exception:
+        logger.exception("Failed to start dataset watcher")
+    yield
+
+
 # Crear aplicación FastAPI con configuración centralizada
 app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
-    version=settings.API_VERSION
+    version=settings.API_VERSION,
+    lifespan=lifespan
 )
 
 # Configurar CORS Middleware (debe ir antes de otros middlewares)
@@ -28,6 +49,12 @@ app.add_middleware(
 #  Compresión automática (reduce 70-80% el tamaño)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+@app.exception_handler(ComputePoolSaturated)
+async def compute_pool_saturated(request: Request, exc: ComputePoolSaturated) -> JSONResponse:
+    """Backpressure: el pool de cálculo está lleno, el cliente debe reintentar"""
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
 def _include_router(module_path: str, attr: str = "router") -> None:
     try:
         module = importlib.import_module(module_path)
@@ -40,7 +67,10 @@ def _include_router(module_path: str, attr: str = "router") -> None:
 # Incluir routers de forma resiliente para evitar caídas globales en serverless
 _include_router("graphmap.interfaces.rest.city_controller")
 _include_router("graphmap.interfaces.rest.graph_controller")
+_include_router("graphmap.interfaces.rest.tile_controller")
 _include_router("graphmap.interfaces.rest.chatbot_controller")
+_include_router("graphmap.interfaces.rest.health_controller")
+_include_router("graphmap.interfaces.rest.admin_controller")
 
 @app.get("/")
 async def root():
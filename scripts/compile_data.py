@@ -0,0 +1,43 @@
+"""
+Paso de build: compila el Excel de ciudades y el grafo a artefactos binarios
+
+Uso (desde la raíz del repositorio):
+    python -m scripts.compile_data
+"""
+import time
+
+from graphmap.domain.services.city_service import CityService
+from graphmap.domain.services.graph_service import GraphService
+
+
+def main() -> None:
+    city_service = CityService()
+
+    start = time.perf_counter()
+    table = city_service.load_city_table()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Dataset {city_service.get_dataset_hash()[:16]}: {len(table)} ciudades ({elapsed_ms:.1f} ms)")
+
+    start = time.perf_counter()
+    graph = GraphService().build_city_graph()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Grafo (max {GraphService.MAX_DISTANCE_KM} km): "
+          f"{graph.num_nodes()} nodos, {graph.num_edges()} aristas ({elapsed_ms:.1f} ms)")
+
+    start = time.perf_counter()
+    landmarks = GraphService().get_landmarks()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if landmarks is not None:
+        print(f"Landmarks ALT: {len(landmarks)} ({elapsed_ms:.1f} ms)")
+
+    start = time.perf_counter()
+    hierarchy = GraphService().get_contraction_hierarchy()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if hierarchy is not None:
+        print(f"Contraction Hierarchies: {hierarchy.num_shortcuts()} atajos ({elapsed_ms:.1f} ms)")
+
+    print(f"Artefactos en {city_service.artifact_store.root}")
+
+
+if __name__ == "__main__":
+    main()
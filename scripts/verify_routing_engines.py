@@ -0,0 +1,83 @@
+"""
+Verificación cruzada: todos los motores de ruta contra A* con Haversine
+
+Para pares aleatorios de ciudades comprueba que cada motor disponible
+devuelva la misma distancia que `a_star` y un camino válido (aristas
+existentes en el grafo, de origen a destino). Termina con código 1 si
+encuentra alguna diferencia.
+
+Uso (desde la raíz del repositorio):
+    python -m scripts.verify_routing_engines [--pairs N] [--seed S]
+"""
+import argparse
+import random
+import sys
+from typing import Dict, List, Optional
+
+from graphmap.domain.services.graph_service import GraphService
+from graphmap.domain.services.pathfinding_service import PathfindingService, RoutingEngine
+
+
+def check(pathfinding: PathfindingService, start_id: int, goal_id: int,
+          result: Optional[Dict], expected: Optional[Dict]) -> List[str]:
+    """Compara un resultado con el de A*
+
+    Returns:
+        Lista de diferencias encontradas (vacía si coincide)
+    """
+    if (result is None) != (expected is None):
+        return [f"alcanzabilidad distinta (esperado {expected is not None})"]
+    if result is None:
+        return []
+
+    errors = []
+    if result["distance"] != expected["distance"]:
+        errors.append(f"distancia {result['distance']} != {expected['distance']}")
+
+    ids = [city["id"] for city in result["path"]]
+    if ids[0] != start_id or ids[-1] != goal_id:
+        errors.append("el camino no une origen y destino")
+    for u, v in zip(ids, ids[1:]):
+        if all(neighbor != v for neighbor, _ in pathfinding.graph.get_neighbors(u)):
+            errors.append(f"arista inexistente {u}-{v}")
+            break
+    return errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pathfinding = GraphService().get_pathfinding_service()
+
+    rng = random.Random(args.seed)
+    nodes = pathfinding.node_ids
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.pairs)]
+    reference = {pair: pathfinding.a_star(*pair) for pair in pairs}
+
+    failures = 0
+    for engine in RoutingEngine:
+        if engine == RoutingEngine.ASTAR:
+            continue
+        try:
+            pathfinding.find_path(*pairs[0], engine)
+        except ValueError:
+            print(f"{engine.value}: no disponible, se omite")
+            continue
+
+        engine_failures = 0
+        for pair in pairs:
+            errors = check(pathfinding, *pair, pathfinding.find_path(*pair, engine), reference[pair])
+            if errors:
+                engine_failures += 1
+                print(f"{engine.value} {pair[0]} -> {pair[1]}: {'; '.join(errors)}")
+        print(f"{engine.value}: {len(pairs) - engine_failures}/{len(pairs)} pares coinciden con astar")
+        failures += engine_failures
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())